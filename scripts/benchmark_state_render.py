@@ -0,0 +1,163 @@
+"""Micro-benchmark page renders with compiled state accessors vs a string walk.
+
+Every page that reads ``AppState`` through ``state_value`` renders a realistic
+controller state, first with the compiled accessors and then with the old
+per-call dotted-string walk patched in. ``--min-speedup`` turns the report
+into a gate that exits non-zero when compiled renders are not that much faster.
+
+Keep ``--rounds`` modest on Python 3.11: some PySide6 builds drop a reference to
+``None`` on every ``QSignalBlocker`` exit, and a few hundred full render passes
+are enough to exhaust it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import sys
+import tempfile
+import time
+from collections.abc import Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Any
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QSettings
+from PySide6.QtWidgets import QApplication
+
+from opencareyes.config.settings import Settings
+from opencareyes.controller import AppController
+from opencareyes.ui import (
+    automation_page,
+    blue_light_page,
+    break_overlay,
+    break_page,
+    break_prompt,
+    dimmer_page,
+    focus_page,
+    mini_countdown,
+    overview_page,
+    settings_page,
+)
+
+
+PAGE_TYPES = (
+    overview_page.OverviewPage,
+    break_page.BreakPage,
+    automation_page.AutomationPage,
+    blue_light_page.BlueLightPage,
+    dimmer_page.DimmerPage,
+    focus_page.FocusPage,
+    settings_page.SettingsPage,
+    mini_countdown.MiniCountdownWidget,
+    break_overlay.BreakOverlay,
+    break_prompt.BreakPrompt,
+)
+_PAGE_MODULES = tuple(sys.modules[page.__module__] for page in PAGE_TYPES)
+
+
+def walk_state_value(state: object, path: str, default: Any = None) -> Any:
+    """The per-call string walk that compiled accessors replaced."""
+
+    value: Any = state
+    for name in path.split("."):
+        if value is None:
+            break
+        value = value.get(name) if isinstance(value, Mapping) else getattr(value, name, None)
+    return default if value is None else value
+
+
+def walk_first_state_value(state: object, *paths: str, default: Any = None) -> Any:
+    for path in paths:
+        value = walk_state_value(state, path)
+        if value is not None:
+            return value
+    return default
+
+
+@contextmanager
+def string_walk() -> Iterator[None]:
+    """Patch the pages' state readers back to the string walk."""
+
+    replacements = {
+        "state_value": walk_state_value,
+        "first_state_value": walk_first_state_value,
+    }
+    saved = []
+    for module in _PAGE_MODULES:
+        for name, replacement in replacements.items():
+            if name in vars(module):
+                saved.append((module, name, vars(module)[name]))
+                setattr(module, name, replacement)
+    try:
+        yield
+    finally:
+        for module, name, original in saved:
+            setattr(module, name, original)
+
+
+def render_seconds(
+    pages: Sequence[Any], states: Sequence[object], rounds: int, repeat: int
+) -> float:
+    """Best wall time of ``repeat`` runs of ``rounds`` render passes."""
+
+    best = math.inf
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for index in range(rounds):
+            state = states[index % len(states)]
+            for page in pages:
+                page.render(state)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(rounds: int = 20, repeat: int = 1) -> tuple[float, float]:
+    """Return ``(compiled, walked)`` seconds for ``rounds`` render passes."""
+
+    QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as folder:
+        store = QSettings(str(Path(folder) / "settings.ini"), QSettings.IniFormat)
+        controller = AppController(Settings(store))
+        pages = [page_type(controller) for page_type in PAGE_TYPES]
+        state = controller.state
+        # Alternate two states so pages that skip unchanged slices still work.
+        states = (
+            state,
+            replace(state, breaks=replace(state.breaks, remaining=state.breaks.remaining + 1)),
+        )
+        try:
+            render_seconds(pages, states, 1, 1)
+            compiled = render_seconds(pages, states, rounds, repeat)
+            with string_walk():
+                walked = render_seconds(pages, states, rounds, repeat)
+        finally:
+            for page in pages:
+                page.close()
+                page.deleteLater()
+    return compiled, walked
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--min-speedup", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    compiled, walked = run(max(1, args.rounds), max(1, args.repeat))
+    speedup = walked / compiled if compiled else math.inf
+    per_pass = 1000.0 / max(1, args.rounds)
+    print(f"pages rendered per pass: {len(PAGE_TYPES)}")
+    print(f"compiled accessors: {compiled * per_pass:.3f} ms per pass")
+    print(f"string walk:        {walked * per_pass:.3f} ms per pass")
+    print(f"speedup:            {speedup:.2f}x")
+    return 0 if speedup >= args.min_speedup else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
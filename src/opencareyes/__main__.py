@@ -5,6 +5,7 @@ from __future__ import annotations
 import logging
 import os
 import sys
+from collections.abc import Mapping
 from pathlib import Path
 
 from PySide6.QtCore import (
@@ -13,6 +14,7 @@ from PySide6.QtCore import (
 )
 
 from opencareyes.app import OpenCareEyesApp
+from opencareyes.application.break_history import BreakHistory
 from opencareyes.application.companion_coordinator import CompanionCoordinator
 from opencareyes.application.companion_runtime import CompanionRuntime
 from opencareyes.application.context_coordinator import ContextCoordinator
@@ -26,15 +28,20 @@ from opencareyes.application.system_metrics import SystemMetricsService
 from opencareyes.application.utility_timer import UtilityTimerService
 from opencareyes.application.weather_service import WeatherService
 from opencareyes.application.window_avoidance import WindowAvoidanceService
+from opencareyes.config.presets import PRESETS
 from opencareyes.config.settings import PreferencesRepository
 from opencareyes.constants import PETS_DIR
 from opencareyes.controller import AppController
+from opencareyes.core.blue_light_filter import BlueLightFilter
 from opencareyes.core.break_reminder import BreakReminder
 from opencareyes.core.display_worker import QueuedBlueLightFilter
 from opencareyes.core.focus_mode import FocusMode
+from opencareyes.core.monitor_manager import MonitorManager
 from opencareyes.core.scheduler import Scheduler
 from opencareyes.core.screen_dimmer import ScreenDimmer
+from opencareyes.core.solar_calendar import SolarCalendar
 from opencareyes.diagnostics import configure_logging
+from opencareyes.domain.activity import ActivityAccumulator
 from opencareyes.platform.context_sensor import ContextSensor
 from opencareyes.platform.hotkeys import HotkeyManager
 from opencareyes.platform.recycle_bin import RecycleBinService
@@ -51,6 +58,7 @@ from opencareyes.ui.pet_bubble import PetBubble
 from opencareyes.ui.pet_surface import PetSurface
 from opencareyes.ui.quick_tools import QuickToolsWindow
 from opencareyes.ui.tray_icon import TrayIcon
+from opencareyes.ui.widgets import watch_break_ticks
 
 
 log = logging.getLogger(__name__)
@@ -113,12 +121,13 @@ def main() -> None:
     # process cannot append to the file while the primary process owns it.
     configure_logging()
 
-    settings = PreferencesRepository()
     local_data = Path(QStandardPaths.writableLocation(QStandardPaths.AppLocalDataLocation))
+    settings = PreferencesRepository(write_ahead_log=local_data / "settings.wal")
     weather_service = WeatherService()
     holiday_service = HolidayService()
     utility_timer = UtilityTimerService()
     note_repository = NoteRepository(local_data / "notes.json")
+    break_history = BreakHistory(local_data / "break_history.sqlite3", app)
     system_metrics = SystemMetricsService()
     recycle_bin = RecycleBinService()
     pet_registry = PetPackRegistry(PETS_DIR)
@@ -131,7 +140,7 @@ def main() -> None:
         pet_assets.preload_manifest(companion.manifest)
         preferences = settings.pet_preferences
         selected_preferences = (
-            preferences.get(companion.state.pet_id, {}) if isinstance(preferences, dict) else {}
+            preferences.get(companion.state.pet_id, {}) if isinstance(preferences, Mapping) else {}
         )
         for slot, item_id in selected_preferences.items():
             companion.set_manual_accessory(str(slot), str(item_id))
@@ -139,13 +148,35 @@ def main() -> None:
         log.error("The selected bundled pet pack could not be loaded: %s", pet_load_error)
     event_hub = WindowsEventHub.shared()
     event_hub.install(app)
-    blue_filter = QueuedBlueLightFilter(auto_watch_screens=False)
+    # One topology cache shared by the Gamma worker and window sampling.
+    monitor_manager = MonitorManager()
+    gamma_backend = BlueLightFilter(
+        monitor_manager,
+        connect_screen_events=False,
+        baseline_path=local_data / "gamma_baselines.json",
+    )
+    # Build the preset ramps before the worker starts so mode switches only look them up.
+    gamma_backend.ramp_table.warm(
+        temperatures=[settings.color_temperature, *(preset["temp"] for preset in PRESETS.values())]
+    )
+    blue_filter = QueuedBlueLightFilter(gamma_backend, auto_watch_screens=False)
+    if gamma_backend.recovery_pending:
+        # A previous run exited with Gamma still tinted; undo it on the worker.
+        blue_filter.request_refresh()
     dimmer = ScreenDimmer(watch_screen_events=False)
-    break_reminder = BreakReminder()
+    break_reminder = BreakReminder(
+        tick_on_demand=True,
+        activity=ActivityAccumulator(),
+        checkpoint_path=local_data / "break_checkpoint.json",
+    )
     focus_mode = FocusMode(watch_screen_events=False)
-    scheduler = Scheduler(settings=settings)
+    scheduler = Scheduler(
+        settings=settings,
+        solar_calendar=SolarCalendar(local_data / "solar_calendar.json"),
+    )
     hotkeys = HotkeyManager(event_hub=event_hub)
     context_sensor = ContextSensor(event_hub=event_hub)
+    context_sensor.snapshot_changed.connect(break_reminder.observe_context)
     effect_coordinator = EffectCoordinator(
         settings,
         blue_filter=blue_filter,
@@ -174,6 +205,8 @@ def main() -> None:
         utility_timer=utility_timer,
         note_repository=note_repository,
         system_metrics=system_metrics,
+        break_history=break_history,
+        coalesce_state_updates=True,
     )
     chime_service = HourlyChimeService(app)
     dimmer.operation_failed.connect(controller.operation_failed)
@@ -197,6 +230,7 @@ def main() -> None:
     controller.quick_tool_requested.connect(route_quick_tool)
     pet_surface = PetSurface(pet_assets)
     pet_bubble = PetBubble()
+    watch_break_ticks(controller, pet_bubble, "pet_bubble")
     companion_runtime = CompanionRuntime(
         controller,
         companion,
@@ -224,7 +258,8 @@ def main() -> None:
     )
 
     physical_geometry = Win32WindowGeometryBackend(
-        ignored_hwnds=companion_runtime.own_window_handles
+        ignored_hwnds=companion_runtime.own_window_handles,
+        monitor_manager=monitor_manager,
     )
     logical_geometry = QtLogicalWindowGeometryBackend(physical_geometry)
     window_avoidance = WindowAvoidanceService(
@@ -262,6 +297,7 @@ def main() -> None:
         )
 
     def refresh_display_topology(*_args) -> None:
+        monitor_manager.invalidate()
         blue_filter.refresh_screens()
         dimmer.refresh_screens()
         focus_mode.refresh_screens()
@@ -276,6 +312,16 @@ def main() -> None:
     event_hub.session_locked.connect(refresh_after_session_change)
     event_hub.system_suspended.connect(refresh_after_session_change)
 
+    def flush_settings_before_suspend(suspended: bool) -> None:
+        if not suspended:
+            return
+        try:
+            settings.flush()
+        except Exception:
+            log.exception("Settings could not be flushed before suspend")
+
+    event_hub.system_suspended.connect(flush_settings_before_suspend)
+
     def apply_state_theme(state) -> None:
         app.apply_theme(state.general.theme)
         app.apply_motion_mode(state.general.motion_mode)
@@ -330,6 +376,9 @@ def main() -> None:
         # Remove runtime effects through the same boundary used while running,
         # without overwriting the user's saved preferences.
         effect_coordinator.reconcile(effect_coordinator.intent_from_settings(global_pause=True))
+        break_reminder.flush_checkpoint()
+        if not break_history.shutdown():
+            log.warning("Break history writer did not stop before the shutdown timeout")
         scheduler.stop()
         hotkeys.unregister_all()
         event_hub.shutdown(app)
@@ -0,0 +1,276 @@
+'''Append-only break event log with columnar per-day rollups.'''
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+from array import array
+from bisect import bisect_left
+from collections.abc import Callable
+from datetime import date, datetime
+from pathlib import Path
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal, Slot
+
+from opencareyes.state import BreakSummaryState
+
+log = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+EVENTS = ('started', 'completed', 'skipped', 'snoozed', 'suppressed')
+_COUNTERS = (*EVENTS, 'rest_seconds')
+
+_SCHEMA = (
+    f'PRAGMA user_version = {SCHEMA_VERSION}',
+    '''CREATE TABLE IF NOT EXISTS events (
+        at REAL NOT NULL,
+        day INTEGER NOT NULL,
+        event TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        reason TEXT NOT NULL,
+        rest_seconds INTEGER NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS daily (
+        day INTEGER PRIMARY KEY,
+        started INTEGER NOT NULL DEFAULT 0,
+        completed INTEGER NOT NULL DEFAULT 0,
+        skipped INTEGER NOT NULL DEFAULT 0,
+        snoozed INTEGER NOT NULL DEFAULT 0,
+        suppressed INTEGER NOT NULL DEFAULT 0,
+        rest_seconds INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID''',
+)
+_UPSERT_DAY = (
+    f'INSERT INTO daily (day, {", ".join(_COUNTERS)}) '
+    f'VALUES (?, {", ".join("?" for _ in _COUNTERS)}) '
+    'ON CONFLICT(day) DO UPDATE SET '
+    + ', '.join(f'{name} = {name} + excluded.{name}' for name in _COUNTERS)
+)
+
+_Event = tuple[float, int, str, str, str, int]
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    connection = sqlite3.connect(path, timeout=5.0)
+    for statement in _SCHEMA:
+        connection.execute(statement)
+    return connection
+
+
+class _WriteSignals(QObject):
+    finished = Signal(int, bool)
+
+
+class _WriteTask(QRunnable):
+    '''Append one batch of events and their day deltas in a transaction.'''
+
+    def __init__(self, path: Path, batch: int, events: list[_Event]):
+        super().__init__()
+        self.path = path
+        self.batch = batch
+        self.events = events
+        self.signals = _WriteSignals()
+
+    @Slot()
+    def run(self) -> None:
+        deltas: dict[int, list[int]] = {}
+        for _at, day, event, _kind, _reason, rest_seconds in self.events:
+            row = deltas.setdefault(day, [0] * len(_COUNTERS))
+            row[EVENTS.index(event)] += 1
+            row[-1] += rest_seconds
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = _connect(self.path)
+            try:
+                with connection:
+                    connection.executemany(
+                        'INSERT INTO events VALUES (?, ?, ?, ?, ?, ?)',
+                        self.events,
+                    )
+                    connection.executemany(
+                        _UPSERT_DAY,
+                        [(day, *row) for day, row in deltas.items()],
+                    )
+            finally:
+                connection.close()
+        except (OSError, sqlite3.Error):
+            log.exception('Break history batch could not be written')
+            self.signals.finished.emit(self.batch, False)
+            return
+        self.signals.finished.emit(self.batch, True)
+
+
+class BreakHistory(QObject):
+    '''Record break outcomes and answer day-window summaries in O(days).
+
+    Per-day counters live in memory as parallel columns sorted by date
+    ordinal and are updated as events are recorded. Raw events and day
+    deltas are appended to SQLite in batches on a worker thread; startup
+    only reads the ``daily`` table.
+    '''
+
+    changed = Signal()
+
+    FLUSH_INTERVAL_MS = 5000
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        parent: QObject | None = None,
+        *,
+        now: Callable[[], datetime] | None = None,
+        thread_pool: QThreadPool | None = None,
+    ) -> None:
+        super().__init__(parent)
+        self._path = Path(path)
+        self._now = now or (lambda: datetime.now().astimezone())
+        self._days = array('l')
+        self._columns = {name: array('q') for name in _COUNTERS}
+        self._pending: list[_Event] = []
+        self._batch = 0
+        self._revision = 0
+        self._tasks: dict[int, _WriteTask] = {}
+        if thread_pool is None:
+            thread_pool = QThreadPool(self)
+            thread_pool.setMaxThreadCount(1)
+        self._pool = thread_pool
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self.flush)
+        self._load()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    @property
+    def day_count(self) -> int:
+        return len(self._days)
+
+    @property
+    def revision(self) -> int:
+        '''Counter bumped by every recorded event.'''
+
+        return self._revision
+
+    def record(
+        self,
+        event: str,
+        kind: str = '',
+        reason: str = '',
+        rest_seconds: int = 0,
+    ) -> None:
+        '''Count ``event`` for today and queue it for the next batch write.'''
+
+        if event not in EVENTS:
+            raise ValueError(f'未知休息记录类型：{event}')
+        at = self._now()
+        day = at.date().toordinal()
+        rest_seconds = max(0, int(rest_seconds))
+        index = self._day_index(day)
+        self._columns[event][index] += 1
+        self._columns['rest_seconds'][index] += rest_seconds
+        self._revision += 1
+        self._pending.append(
+            (at.timestamp(), day, event, str(kind), str(reason), rest_seconds)
+        )
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+        self.changed.emit()
+
+    def summary(self, days: int = 7, today: date | None = None) -> BreakSummaryState:
+        '''Totals for the ``days`` calendar days ending with ``today``.'''
+
+        days = max(1, int(days))
+        end = (today or self._now().date()).toordinal()
+        first = bisect_left(self._days, end - days + 1)
+        last = bisect_left(self._days, end + 1)
+        totals = {
+            name: sum(column[first:last])
+            for name, column in self._columns.items()
+        }
+        return BreakSummaryState(days=days, **totals)
+
+    def daily(
+        self,
+        days: int = 7,
+        today: date | None = None,
+    ) -> tuple[tuple[date, dict[str, int]], ...]:
+        '''Per-day counters for days with recorded events, oldest first.'''
+
+        end = (today or self._now().date()).toordinal()
+        first = bisect_left(self._days, end - max(1, int(days)) + 1)
+        last = bisect_left(self._days, end + 1)
+        return tuple(
+            (
+                date.fromordinal(self._days[index]),
+                {name: column[index] for name, column in self._columns.items()},
+            )
+            for index in range(first, last)
+        )
+
+    def flush(self) -> bool:
+        '''Hand queued events to the writer thread; False if none were queued.'''
+
+        self._flush_timer.stop()
+        if not self._pending:
+            return False
+        events, self._pending = self._pending, []
+        self._batch += 1
+        task = _WriteTask(self._path, self._batch, events)
+        task.signals.finished.connect(self._on_written)
+        self._tasks[self._batch] = task
+        self._pool.start(task)
+        return True
+
+    def shutdown(self, timeout_ms: int = 2000) -> bool:
+        self.flush()
+        return bool(self._pool.waitForDone(max(0, int(timeout_ms))))
+
+    def _day_index(self, day: int) -> int:
+        if self._days and self._days[-1] == day:
+            return len(self._days) - 1
+        index = bisect_left(self._days, day)
+        if index < len(self._days) and self._days[index] == day:
+            return index
+        self._days.insert(index, day)
+        for column in self._columns.values():
+            column.insert(index, 0)
+        return index
+
+    def _load(self) -> None:
+        if not self._path.exists():
+            return
+        try:
+            connection = _connect(self._path)
+            try:
+                rows = connection.execute(
+                    f'SELECT day, {", ".join(_COUNTERS)} FROM daily ORDER BY day'
+                ).fetchall()
+            finally:
+                connection.close()
+        except sqlite3.Error:
+            log.warning('Break history could not be read', exc_info=True)
+            return
+        for day, *values in rows:
+            self._days.append(int(day))
+            for name, value in zip(_COUNTERS, values):
+                self._columns[name].append(int(value))
+
+    @Slot(int, bool)
+    def _on_written(self, batch: int, ok: bool) -> None:
+        task = self._tasks.pop(batch, None)
+        if ok or task is None:
+            return
+        # The columns already count these events; keep them queued ahead of
+        # newer ones so a later flush persists them in order.
+        self._pending[:0] = task.events
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
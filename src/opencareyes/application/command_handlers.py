@@ -3,11 +3,19 @@
 from __future__ import annotations
 
 import time
+from collections.abc import Mapping
+from contextlib import nullcontext
 from dataclasses import replace
 from datetime import datetime, timedelta
 from typing import TYPE_CHECKING, Callable
 
-from ..constants import DIM_MAX, DIM_MIN, TEMP_MAX, TEMP_MIN
+from ..constants import (
+    DIM_MAX,
+    DIM_MIN,
+    SCHEDULE_TRANSITION_MS,
+    TEMP_MAX,
+    TEMP_MIN,
+)
 from ..domain.runtime import DisplayPreview
 from ..state import WeatherState
 
@@ -25,6 +33,8 @@ _SCHEDULE_SETTING_KEYS = (
     "automation/night_profile",
     "automation/sunrise_offset",
     "automation/sunset_offset",
+    "automation/ramp_minutes",
+    "automation/stages_json",
     "location/latitude",
     "location/longitude",
     "location/configured",
@@ -32,6 +42,22 @@ _SCHEDULE_SETTING_KEYS = (
 )
 
 
+def _valid_schedule_stage(stage: object) -> bool:
+    from opencareyes.config.presets import PRESETS
+    from opencareyes.core.scheduler import ScheduleTime
+
+    if not isinstance(stage, Mapping) or stage.get("profile") not in PRESETS:
+        return False
+    try:
+        for key in ("start", "end"):
+            point = ScheduleTime.parse(str(stage.get(key, "")))
+            if point.anchor != "clock" and not -120 <= point.minutes <= 120:
+                return False
+    except ValueError:
+        return False
+    return True
+
+
 class DisplayCommands:
     """Implement display and global-pause commands behind ``AppController``."""
 
@@ -142,6 +168,39 @@ class DisplayCommands:
             mark_manual_override=mark_manual_override,
         )
 
+    def set_monitor_target(
+        self,
+        monitor: str,
+        *,
+        temperature: int | None = None,
+        dim_level: int | None = None,
+    ) -> bool:
+        """Override color temperature and dim level for one monitor.
+
+        ``None`` lets that value follow the shared setting; clearing both
+        removes the override.
+        """
+
+        controller = self._controller
+
+        def operation() -> None:
+            targets = dict(controller._settings.monitor_targets)
+            key = str(monitor).strip().casefold()
+            if temperature is None and dim_level is None:
+                targets.pop(key, None)
+            else:
+                targets[key] = (
+                    None
+                    if temperature is None
+                    else max(TEMP_MIN, min(TEMP_MAX, int(temperature))),
+                    None
+                    if dim_level is None
+                    else max(DIM_MIN, min(DIM_MAX, int(dim_level))),
+                )
+            controller._settings.monitor_targets = targets
+
+        return controller._run("monitor_target", operation)
+
     def recheck_display_capabilities(self) -> bool:
         """Request a non-blocking display capability refresh."""
 
@@ -590,6 +649,8 @@ class AutomationCommands:
         night_profile: str | None = None,
         sunrise_offset: int | None = None,
         sunset_offset: int | None = None,
+        ramp_minutes: int | None = None,
+        stages=None,
     ) -> bool:
         controller = self._controller
         enabled = bool(enabled)
@@ -681,6 +742,22 @@ class AutomationCommands:
                     "日出和日落偏移必须在 -120 到 120 分钟之间。",
                 )
                 return False
+        if ramp_minutes is not None and not 0 <= int(ramp_minutes) <= 180:
+            controller.operation_failed.emit(
+                "schedule_ramp",
+                "渐变时长必须在 0 到 180 分钟之间。",
+            )
+            return False
+        selected_stages = None if stages is None else tuple(stages)
+        if selected_stages is not None and (
+            len(selected_stages) > 8
+            or not all(_valid_schedule_stage(stage) for stage in selected_stages)
+        ):
+            controller.operation_failed.emit(
+                "schedule_stages",
+                "晚间阶段需要有效的开始时间、结束时间和显示方案，最多 8 个。",
+            )
+            return False
 
         def operation() -> None:
             controller._require_service(controller._scheduler, "scheduler")
@@ -711,6 +788,16 @@ class AutomationCommands:
                 "sunset_offset",
             ):
                 controller._settings.sunset_offset = int(sunset_offset)
+            if ramp_minutes is not None and hasattr(
+                controller._settings,
+                "schedule_ramp_minutes",
+            ):
+                controller._settings.schedule_ramp_minutes = int(ramp_minutes)
+            if selected_stages is not None and hasattr(
+                controller._settings,
+                "schedule_stages",
+            ):
+                controller._settings.schedule_stages = selected_stages
             controller._settings.filter_schedule_enabled = enabled
             if enabled:
                 controller._scheduler.start(defer_apply=True)
@@ -820,15 +907,41 @@ class AutomationCommands:
             if enabled
             else getattr(controller._settings, "schedule_day_profile", "office")
         )
-        controller.apply_display_profile(profile, mark_manual_override=False)
+        with self._scheduled_transition():
+            controller.apply_display_profile(profile, mark_manual_override=False)
 
     def on_scheduled_profile_requested(self, profile: str) -> None:
         controller = self._controller
         controller._clear_next_schedule_pause()
-        controller.apply_display_profile(
-            str(profile),
-            mark_manual_override=False,
+        with self._scheduled_transition():
+            controller.apply_display_profile(
+                str(profile),
+                mark_manual_override=False,
+            )
+
+    def on_scheduled_ramp_requested(self, step) -> None:
+        """Ease toward the next profile without persisting the values."""
+
+        controller = self._controller
+        if controller._in_transaction:
+            return
+        controller._preview_display(
+            "schedule_ramp",
+            DisplayPreview(
+                color_temperature=int(step.color_temperature),
+                dim_level=int(step.dim_level),
+            ),
+        )
+
+    def _scheduled_transition(self):
+        transition = getattr(
+            self._controller.effect_coordinator,
+            "display_transition",
+            None,
         )
+        if not callable(transition):
+            return nullcontext()
+        return transition(SCHEDULE_TRANSITION_MS)
 
     def clear_next_schedule_pause(self) -> None:
         controller = self._controller
@@ -1047,9 +1160,9 @@ class CompanionToolCommands:
                 if result is False:
                     raise RuntimeError("Pet pack could not be loaded")
             preferences = getattr(controller._settings, "pet_preferences", {})
-            selected = preferences.get(value, {}) if isinstance(preferences, dict) else {}
+            selected = preferences.get(value, {}) if isinstance(preferences, Mapping) else {}
             accessory_setter = getattr(controller._companion, "set_manual_accessory", None)
-            if callable(accessory_setter) and isinstance(selected, dict):
+            if callable(accessory_setter) and isinstance(selected, Mapping):
                 for slot, item_id in selected.items():
                     accessory_setter(str(slot), str(item_id))
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+from collections.abc import Mapping
 
 from PySide6.QtCore import QObject, QTimer, Signal
 
@@ -290,11 +291,11 @@ class ContextCoordinator(QObject):
             try:
                 result.append(
                     AppRule(
-                        app_id=rule["app_id"] if isinstance(rule, dict) else rule.app_id,
-                        breaks=rule["breaks"] if isinstance(rule, dict) else rule.breaks,
-                        focus=rule["focus"] if isinstance(rule, dict) else rule.focus,
-                        filter=rule["filter"] if isinstance(rule, dict) else rule.filter,
-                        dimmer=rule["dimmer"] if isinstance(rule, dict) else rule.dimmer,
+                        app_id=rule["app_id"] if isinstance(rule, Mapping) else rule.app_id,
+                        breaks=rule["breaks"] if isinstance(rule, Mapping) else rule.breaks,
+                        focus=rule["focus"] if isinstance(rule, Mapping) else rule.focus,
+                        filter=rule["filter"] if isinstance(rule, Mapping) else rule.filter,
+                        dimmer=rule["dimmer"] if isinstance(rule, Mapping) else rule.dimmer,
                     )
                 )
             except (KeyError, TypeError, ValueError):
@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import logging
 import time
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
+
 from PySide6.QtCore import QObject, Signal
 
 from opencareyes.domain.context import FeatureSuppression, SuppressionDecision
@@ -66,6 +69,11 @@ class EffectCoordinator(QObject):
         self._focus_mode = focus_mode
         self._auto_paused_breaks = False
         self._natural_rest_pending = False
+        self._transition_ms = 0
+        # Per-monitor targets last handed to the services, so unchanged maps
+        # never reach the native layer again.
+        self._output_temperatures: dict[str, int] = {}
+        self._screen_levels: dict[str, int] = {}
         self._intent = self.intent_from_settings()
         self._last_apply_succeeded = True
         self._state = self._build_state(self._intent)
@@ -148,6 +156,7 @@ class EffectCoordinator(QObject):
         previous_intent = self._intent
         pending_requests: list[object] = []
         try:
+            self._sync_monitor_targets()
             request = self._reconcile_filter(
                 intent,
                 previous_intent,
@@ -210,6 +219,17 @@ class EffectCoordinator(QObject):
         )
         return self._last_result
 
+    @contextmanager
+    def display_transition(self, duration_ms: int) -> Iterator[None]:
+        """Fade color temperature commits reconciled inside this block."""
+
+        previous = self._transition_ms
+        self._transition_ms = max(0, int(duration_ms))
+        try:
+            yield
+        finally:
+            self._transition_ms = previous
+
     def apply(self, decision: SuppressionDecision) -> EffectivePolicyState:
         """Compatibility wrapper for v0.3 callers."""
 
@@ -222,6 +242,42 @@ class EffectCoordinator(QObject):
 
         return self._publish_state()
 
+    def _sync_monitor_targets(self) -> None:
+        """Hand changed per-monitor Kelvin and dim targets to the services."""
+
+        raw = getattr(self._settings, "monitor_targets", None)
+        targets = raw if isinstance(raw, Mapping) else {}
+        temperatures = {
+            str(key): int(target[0])
+            for key, target in targets.items()
+            if target[0] is not None
+        }
+        levels = {
+            str(key): int(target[1])
+            for key, target in targets.items()
+            if target[1] is not None
+        }
+        if temperatures != self._output_temperatures:
+            service = self._blue_filter
+            request = getattr(service, "request_output_temperatures", None)
+            setter = getattr(service, "set_output_temperatures", None)
+            try:
+                if callable(request):
+                    request(temperatures)
+                elif callable(setter) and setter(temperatures) is False:
+                    raise RuntimeError("显示器色温目标未能应用")
+            except Exception as exc:
+                raise _TransitionError("filter", str(exc)) from exc
+            self._output_temperatures = temperatures
+        if levels != self._screen_levels:
+            setter = getattr(self._dimmer, "set_screen_levels", None)
+            try:
+                if callable(setter) and setter(levels) is False:
+                    raise RuntimeError("显示器调暗目标未能应用")
+            except Exception as exc:
+                raise _TransitionError("dimmer", str(exc)) from exc
+            self._screen_levels = levels
+
     def _reconcile_filter(
         self,
         intent: RuntimeIntent,
@@ -245,6 +301,8 @@ class EffectCoordinator(QObject):
         request_enable = getattr(service, "request_enable", None)
         request_temperature = getattr(service, "request_temperature", None)
         preview_temperature = getattr(service, "preview_temperature", None)
+        request_transition = getattr(service, "request_transition", None)
+        transition_ms = self._transition_ms
 
         def enable():
             if callable(request_enable):
@@ -261,6 +319,17 @@ class EffectCoordinator(QObject):
                     temperature,
                     revision=display_revision,
                 )
+            if (
+                transition_ms > 0
+                and display_purpose == "commit"
+                and callable(request_transition)
+            ):
+                return request_transition(
+                    temperature,
+                    transition_ms,
+                    revision=display_revision,
+                    purpose=display_purpose,
+                )
             if callable(request_temperature):
                 return request_temperature(
                     temperature,
@@ -0,0 +1,68 @@
+'''Coalesce AppState publication to at most once per event-loop turn.'''
+
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from PySide6.QtCore import QObject, QTimer
+
+
+class RenderScheduler:
+    '''Mark state dirty and publish it once when control returns to Qt.
+
+    A user command and the service callbacks it triggers may each refresh
+    the state within one event-loop iteration; only the last snapshot is
+    published, from a zero-interval single-shot timer. A forced refresh
+    anywhere in the turn makes the coalesced publish forced. With
+    ``deferred`` false every mark publishes immediately, and :meth:`flush`
+    publishes synchronously in either mode.
+    '''
+
+    def __init__(
+        self,
+        publish: Callable[[bool], object],
+        *,
+        deferred: bool = True,
+        parent: QObject | None = None,
+    ) -> None:
+        self._publish = publish
+        self._deferred = bool(deferred)
+        self._parent = parent
+        self._timer: QTimer | None = None
+        self._dirty = False
+        self._force = False
+
+    @property
+    def deferred(self) -> bool:
+        return self._deferred
+
+    @property
+    def pending(self) -> bool:
+        return self._dirty
+
+    def mark_dirty(self, *, force: bool = False) -> None:
+        self._dirty = True
+        self._force = self._force or force
+        if not self._deferred:
+            self.flush()
+            return
+        if self._timer is None:
+            self._timer = QTimer(self._parent)
+            self._timer.setSingleShot(True)
+            self._timer.setInterval(0)
+            self._timer.timeout.connect(self.flush)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def flush(self) -> bool:
+        '''Publish a pending state now; False when nothing was marked.'''
+
+        if self._timer is not None:
+            self._timer.stop()
+        if not self._dirty:
+            return False
+        force = self._force
+        self._dirty = False
+        self._force = False
+        self._publish(force)
+        return True
@@ -0,0 +1,83 @@
+'''Structural differences between consecutive AppState snapshots.'''
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from dataclasses import fields, is_dataclass
+
+ROOT = ''
+
+_MISSING = object()
+_FIELD_NAMES: dict[type, tuple[str, ...]] = {}
+
+
+class StateChanges(frozenset):
+    '''Dotted paths of values that differ; the empty path means everything.'''
+
+    __slots__ = ()
+
+    def touched(self, *paths: str) -> bool:
+        '''Whether any of ``paths`` lies on, above or below a changed path.'''
+
+        for changed in self:
+            if changed == ROOT:
+                return True
+            for path in paths:
+                if (
+                    changed == path
+                    or changed.startswith(path + '.')
+                    or path.startswith(changed + '.')
+                ):
+                    return True
+        return False
+
+
+EVERYTHING = StateChanges((ROOT,))
+UNCHANGED = StateChanges()
+
+
+def diff_states(previous: object | None, current: object) -> StateChanges:
+    '''Return the leaf paths that differ between two snapshots.
+
+    Dataclasses and mappings are walked field by field; anything else is a
+    leaf compared with ``!=``. Identical objects are skipped without being
+    compared, so memoized slices cost one ``is`` check. Without a previous
+    snapshot the result is :data:`EVERYTHING`.
+    '''
+
+    if previous is None:
+        return EVERYTHING
+    if previous is current:
+        return UNCHANGED
+    changes: list[str] = []
+    _collect(previous, current, ROOT, changes)
+    return StateChanges(changes)
+
+
+def _collect(old: object, new: object, path: str, changes: list[str]) -> None:
+    if old is new:
+        return
+    kind = type(old)
+    if kind is type(new) and is_dataclass(kind):
+        names = _FIELD_NAMES.get(kind)
+        if names is None:
+            names = _FIELD_NAMES[kind] = tuple(item.name for item in fields(kind))
+        for name in names:
+            _collect(
+                getattr(old, name),
+                getattr(new, name),
+                f'{path}.{name}' if path else name,
+                changes,
+            )
+        return
+    if isinstance(old, Mapping) and isinstance(new, Mapping):
+        for key in dict.fromkeys((*old, *new)):
+            _collect(
+                old.get(key, _MISSING),
+                new.get(key, _MISSING),
+                f'{path}.{key}' if path else str(key),
+                changes,
+            )
+        return
+    if old != new:
+        changes.append(path)
@@ -2,14 +2,16 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from dataclasses import replace
-from datetime import datetime
+from datetime import date, datetime
 
 from opencareyes.state import (
     AppRuleState,
     AppState,
     AutomationState,
     BreakCadenceState,
+    BreakHistoryState,
     BreakPromptState,
     BreakState,
     CapabilitiesState,
@@ -35,7 +37,7 @@ from opencareyes.state import (
 
 
 def _rule_value(rule, key: str, default=False):
-    if isinstance(rule, dict):
+    if isinstance(rule, Mapping):
         return rule.get(key, default)
     return getattr(rule, key, default)
 
@@ -53,6 +55,7 @@ class StateProjector:
         focus_mode=None,
         scheduler=None,
         hotkeys=None,
+        break_history=None,
     ):
         self._settings = settings
         self._blue_filter = blue_filter
@@ -61,6 +64,9 @@ class StateProjector:
         self._focus_mode = focus_mode
         self._scheduler = scheduler
         self._hotkeys = hotkeys
+        self._break_history = break_history
+        self._slices: dict[str, tuple[object, object]] = {}
+        self._previous: AppState | None = None
 
     def build(
         self,
@@ -78,31 +84,57 @@ class StateProjector:
         display_transaction_phase: str = "idle",
         display_request_id: int | None = None,
     ) -> AppState:
+        """Return the current snapshot, reusing every slice whose inputs held.
+
+        Each slice is keyed on the versions it reads: the settings
+        ``generation``, the reminder fields it shows, service flags, or the
+        identity of a state object handed in by the controller. When no key
+        moved, the previous :class:`AppState` itself is returned, so callers
+        can skip comparison with an ``is`` check.
+        """
+
         settings = self._settings
         reminder = self._break_reminder
         scheduler = self._scheduler
-        pause_active = (
-            global_pause_override.active
-            if global_pause_override is not None
-            else self._is_globally_paused()
-        )
-        until = settings.global_pause_until
-        until_datetime = (
-            datetime.fromtimestamp(until).astimezone() if until is not None else None
-        )
-        rules = tuple(
-            AppRuleState(
-                app_id=str(_rule_value(rule, "app_id", "")),
-                breaks=bool(_rule_value(rule, "breaks", True)),
-                focus=bool(_rule_value(rule, "focus", True)),
-                filter=bool(_rule_value(rule, "filter", False)),
-                dimmer=bool(_rule_value(rule, "dimmer", False)),
+        generation = getattr(settings, "generation", None)
+        memo = self._memoized
+
+        def keyed(*parts):
+            # Settings without a generation counter cannot prove that a
+            # preference-backed slice is still current.
+            return None if generation is None else (generation, *parts)
+
+        if global_pause_override is not None:
+            global_pause = memo(
+                "global_pause",
+                ("given", global_pause_override),
+                lambda: global_pause_override,
+            )
+        else:
+            pause_active = self._is_globally_paused()
+            global_pause = memo(
+                "global_pause",
+                keyed(pause_active),
+                lambda: self._global_pause_state(pause_active),
             )
-            for rule in getattr(settings, "app_rules", ())
-            if str(_rule_value(rule, "app_id", ""))
-        )
         if effective_policy is None:
-            effective_policy = self._default_effective_policy()
+            effective_policy = memo(
+                "effective_policy",
+                keyed(
+                    getattr(self._blue_filter, "enabled", None),
+                    getattr(self._dimmer, "enabled", None),
+                    getattr(reminder, "enabled", None),
+                    getattr(reminder, "paused", None),
+                    getattr(self._focus_mode, "enabled", None),
+                ),
+                self._default_effective_policy,
+            )
+        else:
+            effective_policy = memo(
+                "effective_policy",
+                ("given", effective_policy),
+                lambda: effective_policy,
+            )
         transaction_phase = str(display_transaction_phase or "idle")
         if transaction_phase not in {
             "idle",
@@ -111,196 +143,370 @@ class StateProjector:
             "completed",
         }:
             transaction_phase = "idle"
-        base_display_health = self._display_health()
-        display_health = replace(
-            base_display_health,
-            pending=(
-                base_display_health.pending
-                or transaction_phase in {"applying", "compensating"}
+        display_health = memo(
+            "display_health",
+            (self._display_health_key(), transaction_phase, display_request_id),
+            lambda: self._display_health_state(
+                transaction_phase,
+                display_request_id,
             ),
-            transaction_phase=transaction_phase,
-            request_id=display_request_id,
         )
+        context = context or ContextState()
+        history = self._break_history
+        history_revision = getattr(history, "revision", None)
 
-        return AppState(
-            display=(
-                display_override
+        slices = {
+            "display": (
+                memo("display", ("given", display_override), lambda: display_override)
                 if display_override is not None
-                else DisplayState(
-                    filter_enabled=settings.filter_enabled,
-                    color_temperature=settings.color_temperature,
-                    dimmer_enabled=settings.dimmer_enabled,
-                    dim_level=settings.dim_level,
-                    preset=settings.current_preset,
-                )
+                else memo("display", keyed(), self._display_state)
             ),
-            breaks=BreakState(
-                enabled=settings.break_enabled,
-                phase=getattr(reminder, "phase", "stopped"),
-                mode=settings.break_mode,
-                work_duration=settings.work_duration,
-                break_duration=settings.break_duration,
-                remaining=getattr(reminder, "remaining", 0),
-                total=getattr(reminder, "total", 0),
-                paused=getattr(reminder, "paused", False),
-                force_break=settings.force_break,
-                countdown_display=settings.break_countdown_display,
-                reminder_style=str(
-                    getattr(settings, "break_reminder_style", "progressive")
-                ),
-                rest_scene=str(getattr(settings, 'break_rest_scene', 'gaze')),
-            ),
-            focus=FocusState(
-                enabled=settings.focus_enabled,
-                dim_level=settings.focus_dim_level,
-                session_ends_at=focus_session_ends_at,
-            ),
-            automation=AutomationState(
-                enabled=settings.filter_schedule_enabled,
-                mode=settings.schedule_mode,
-                next_event=getattr(scheduler, "next_event", None),
-                next_event_at=getattr(scheduler, "next_event_at", None),
-                manual_override=getattr(scheduler, "manual_override", False),
-                on_time=settings.schedule_on_time,
-                off_time=settings.schedule_off_time,
-                days=settings.schedule_days,
-                day_profile=str(
-                    getattr(settings, "schedule_day_profile", "office")
+            "breaks": memo(
+                "breaks",
+                keyed(
+                    getattr(reminder, "phase", "stopped"),
+                    getattr(reminder, "remaining", 0),
+                    getattr(reminder, "total", 0),
+                    getattr(reminder, "paused", False),
                 ),
-                night_profile=str(
-                    getattr(settings, "schedule_night_profile", "night")
-                ),
-                sunrise_offset=int(getattr(settings, "sunrise_offset", 0)),
-                sunset_offset=int(getattr(settings, "sunset_offset", 0)),
-                smart_pause=SmartPausePreferencesState(
-                    enabled=bool(getattr(settings, "smart_pause_enabled", True)),
-                    fullscreen_enabled=bool(
-                        getattr(settings, "fullscreen_pause_enabled", True)
-                    ),
-                    natural_rest_enabled=bool(
-                        getattr(settings, "natural_rest_enabled", True)
-                    ),
-                    app_rules=rules,
+                self._break_state,
+            ),
+            "focus": memo(
+                "focus",
+                keyed(focus_session_ends_at),
+                lambda: FocusState(
+                    enabled=settings.focus_enabled,
+                    dim_level=settings.focus_dim_level,
+                    session_ends_at=focus_session_ends_at,
                 ),
             ),
-            global_pause=(
-                global_pause_override
-                if global_pause_override is not None
-                else GlobalPauseState(
-                    active=pause_active,
-                    mode=(
-                        settings.global_pause_mode
-                        if pause_active
-                        else "none"
-                    ),
-                    until=until_datetime if pause_active else None,
-                )
+            "automation": memo(
+                "automation",
+                keyed(
+                    getattr(scheduler, "next_event", None),
+                    getattr(scheduler, "next_event_at", None),
+                    getattr(scheduler, "manual_override", False),
+                ),
+                self._automation_state,
             ),
-            capabilities=CapabilitiesState(
-                filter_available=self._blue_filter is not None,
-                dimmer_available=self._dimmer is not None,
-                breaks_available=self._break_reminder is not None,
-                focus_available=self._focus_mode is not None,
-                automation_available=self._scheduler is not None,
-                hotkeys_available=(
+            "global_pause": global_pause,
+            "capabilities": memo(
+                "capabilities",
+                (
                     self._hotkeys is not None
-                    and bool(getattr(self._hotkeys, "available", False))
+                    and bool(getattr(self._hotkeys, "available", False)),
                 ),
+                self._capabilities_state,
             ),
-            general=GeneralState(
-                theme=settings.theme,
-                autostart=settings.autostart,
-                onboarding_completed=settings.onboarding_completed,
-                location_configured=settings.location_configured,
-                city=settings.city,
-                latitude=settings.latitude if settings.location_configured else None,
-                longitude=(
-                    settings.longitude if settings.location_configured else None
-                ),
-                motion_mode=str(getattr(settings, "motion_mode", "system")),
-                settings_read_only=bool(
-                    getattr(settings, "read_only", False)
-                ),
-                pet_x=getattr(settings, "pet_x", None),
-                pet_y=getattr(settings, "pet_y", None),
-                hotkeys=HotkeyState(
-                    filter=settings.hotkey_filter,
-                    breaks=settings.hotkey_break,
-                    dimmer=settings.hotkey_dimmer,
-                    focus=settings.hotkey_focus,
-                ),
+            "general": memo(
+                "general",
+                keyed(bool(getattr(settings, "read_only", False))),
+                self._general_state,
             ),
-            context=context or ContextState(),
-            effective_policy=effective_policy,
-            display_health=display_health,
-            break_cadence=BreakCadenceState(
-                mode=str(getattr(settings, "cadence_mode", settings.break_mode)),
-                short_interval=int(
-                    getattr(settings, "cadence_short_interval", settings.work_duration)
-                ),
-                short_duration=int(
-                    getattr(settings, "cadence_short_duration", settings.break_duration)
-                ),
-                long_enabled=bool(
-                    getattr(settings, "cadence_long_enabled", False)
-                ),
-                long_interval=int(
-                    getattr(settings, "cadence_long_interval", 60 * 60)
-                ),
-                long_duration=int(
-                    getattr(settings, "cadence_long_duration", 5 * 60)
-                ),
-                short_remaining=int(
-                    getattr(reminder, "short_remaining", getattr(reminder, "remaining", 0))
+            "context": memo("context", ("given", context), lambda: context),
+            "effective_policy": effective_policy,
+            "display_health": display_health,
+            "break_cadence": memo(
+                "break_cadence",
+                keyed(
+                    getattr(
+                        reminder,
+                        "short_remaining",
+                        getattr(reminder, "remaining", 0),
+                    ),
+                    getattr(reminder, "long_remaining", 0),
                 ),
-                long_remaining=int(getattr(reminder, "long_remaining", 0)),
+                self._break_cadence_state,
             ),
-            break_prompt=BreakPromptState(
-                kind=str(
+            "break_prompt": memo(
+                "break_prompt",
+                (
                     getattr(
                         reminder,
                         "current_break_kind",
                         getattr(reminder, "due_kind", "none"),
-                    )
-                    or "none"
+                    ),
+                    getattr(reminder, "prompt_stage", "none"),
+                    getattr(reminder, "snoozed_until", None),
                 ),
-                stage=str(getattr(reminder, "prompt_stage", "none") or "none"),
-                snoozed_until=(
-                    getattr(reminder, "snoozed_until", None)
-                    if isinstance(getattr(reminder, "snoozed_until", None), datetime)
-                    else None
+                self._break_prompt_state,
+            ),
+            "break_history": memo(
+                "break_history",
+                (
+                    None
+                    if history_revision is None
+                    else (history_revision, date.today())
                 ),
+                self._break_history_state,
+            ),
+            "update": memo(
+                "update",
+                ("given", update),
+                lambda: update or UpdateState(),
             ),
-            update=update or UpdateState(),
-            pet_catalog=pet_catalog or self._default_pet_catalog(),
-            companion=companion or self._default_companion_state(context),
-            weather=weather or WeatherState(
-                status=(
-                    'idle'
-                    if bool(getattr(settings, 'weather_enabled', False))
-                    else 'disabled'
+            "pet_catalog": (
+                memo("pet_catalog", ("given", pet_catalog), lambda: pet_catalog)
+                if pet_catalog is not None
+                else memo("pet_catalog", keyed(), self._default_pet_catalog)
+            ),
+            "companion": (
+                memo("companion", ("given", companion), lambda: companion)
+                if companion is not None
+                else memo(
+                    "companion",
+                    keyed(context),
+                    lambda: self._default_companion_state(context),
                 )
             ),
-            quick_tools=quick_tools or QuickToolsState(
-                hourly_chime_enabled=bool(
-                    getattr(settings, 'hourly_chime_enabled', False)
-                ),
-                quiet_hours_start=str(
-                    getattr(settings, 'quiet_hours_start', '23:00')
-                ),
-                quiet_hours_end=str(
-                    getattr(settings, 'quiet_hours_end', '07:00')
+            "weather": (
+                memo("weather", ("given", weather), lambda: weather)
+                if weather is not None
+                else memo("weather", keyed(), self._default_weather_state)
+            ),
+            "quick_tools": (
+                memo("quick_tools", ("given", quick_tools), lambda: quick_tools)
+                if quick_tools is not None
+                else memo("quick_tools", keyed(), self._default_quick_tools)
+            ),
+        }
+        previous = self._previous
+        if previous is not None and all(
+            getattr(previous, name) is value for name, value in slices.items()
+        ):
+            return previous
+        self._previous = AppState(**slices)
+        return self._previous
+
+    def _memoized(self, name: str, key, factory):
+        """Return slice ``name`` for ``key``, building it only on a new key.
+
+        A ``None`` key always rebuilds. A rebuilt slice equal to the cached
+        one is discarded in favour of the cached object, so identity keeps
+        meaning "unchanged" downstream.
+        """
+
+        cached = self._slices.get(name)
+        if cached is not None and key is not None and cached[0] == key:
+            return cached[1]
+        value = factory()
+        if cached is not None and cached[1] == value:
+            value = cached[1]
+        self._slices[name] = (key, value)
+        return value
+
+    def _display_state(self) -> DisplayState:
+        settings = self._settings
+        return DisplayState(
+            filter_enabled=settings.filter_enabled,
+            color_temperature=settings.color_temperature,
+            dimmer_enabled=settings.dimmer_enabled,
+            dim_level=settings.dim_level,
+            preset=settings.current_preset,
+        )
+
+    def _break_state(self) -> BreakState:
+        settings = self._settings
+        reminder = self._break_reminder
+        return BreakState(
+            enabled=settings.break_enabled,
+            phase=getattr(reminder, "phase", "stopped"),
+            mode=settings.break_mode,
+            work_duration=settings.work_duration,
+            break_duration=settings.break_duration,
+            remaining=getattr(reminder, "remaining", 0),
+            total=getattr(reminder, "total", 0),
+            paused=getattr(reminder, "paused", False),
+            force_break=settings.force_break,
+            countdown_display=settings.break_countdown_display,
+            reminder_style=str(
+                getattr(settings, "break_reminder_style", "progressive")
+            ),
+            rest_scene=str(getattr(settings, 'break_rest_scene', 'gaze')),
+        )
+
+    def _automation_state(self) -> AutomationState:
+        settings = self._settings
+        scheduler = self._scheduler
+        rules = tuple(
+            AppRuleState(
+                app_id=str(_rule_value(rule, "app_id", "")),
+                breaks=bool(_rule_value(rule, "breaks", True)),
+                focus=bool(_rule_value(rule, "focus", True)),
+                filter=bool(_rule_value(rule, "filter", False)),
+                dimmer=bool(_rule_value(rule, "dimmer", False)),
+            )
+            for rule in getattr(settings, "app_rules", ())
+            if str(_rule_value(rule, "app_id", ""))
+        )
+        return AutomationState(
+            enabled=settings.filter_schedule_enabled,
+            mode=settings.schedule_mode,
+            next_event=getattr(scheduler, "next_event", None),
+            next_event_at=getattr(scheduler, "next_event_at", None),
+            manual_override=getattr(scheduler, "manual_override", False),
+            on_time=settings.schedule_on_time,
+            off_time=settings.schedule_off_time,
+            days=settings.schedule_days,
+            day_profile=str(
+                getattr(settings, "schedule_day_profile", "office")
+            ),
+            night_profile=str(
+                getattr(settings, "schedule_night_profile", "night")
+            ),
+            sunrise_offset=int(getattr(settings, "sunrise_offset", 0)),
+            sunset_offset=int(getattr(settings, "sunset_offset", 0)),
+            ramp_minutes=int(getattr(settings, "schedule_ramp_minutes", 0)),
+            smart_pause=SmartPausePreferencesState(
+                enabled=bool(getattr(settings, "smart_pause_enabled", True)),
+                fullscreen_enabled=bool(
+                    getattr(settings, "fullscreen_pause_enabled", True)
                 ),
-                quick_actions=tuple(
-                    getattr(
-                        settings,
-                        'quick_actions',
-                        ('rest', 'timer', 'notes', 'system'),
-                    )
+                natural_rest_enabled=bool(
+                    getattr(settings, "natural_rest_enabled", True)
                 ),
+                app_rules=rules,
+            ),
+        )
+
+    def _global_pause_state(self, active: bool) -> GlobalPauseState:
+        settings = self._settings
+        until = settings.global_pause_until
+        return GlobalPauseState(
+            active=active,
+            mode=settings.global_pause_mode if active else "none",
+            until=(
+                datetime.fromtimestamp(until).astimezone()
+                if active and until is not None
+                else None
             ),
         )
 
+    def _capabilities_state(self) -> CapabilitiesState:
+        return CapabilitiesState(
+            filter_available=self._blue_filter is not None,
+            dimmer_available=self._dimmer is not None,
+            breaks_available=self._break_reminder is not None,
+            focus_available=self._focus_mode is not None,
+            automation_available=self._scheduler is not None,
+            hotkeys_available=(
+                self._hotkeys is not None
+                and bool(getattr(self._hotkeys, "available", False))
+            ),
+        )
+
+    def _general_state(self) -> GeneralState:
+        settings = self._settings
+        return GeneralState(
+            theme=settings.theme,
+            autostart=settings.autostart,
+            onboarding_completed=settings.onboarding_completed,
+            location_configured=settings.location_configured,
+            city=settings.city,
+            latitude=settings.latitude if settings.location_configured else None,
+            longitude=(
+                settings.longitude if settings.location_configured else None
+            ),
+            motion_mode=str(getattr(settings, "motion_mode", "system")),
+            settings_read_only=bool(
+                getattr(settings, "read_only", False)
+            ),
+            pet_x=getattr(settings, "pet_x", None),
+            pet_y=getattr(settings, "pet_y", None),
+            hotkeys=HotkeyState(
+                filter=settings.hotkey_filter,
+                breaks=settings.hotkey_break,
+                dimmer=settings.hotkey_dimmer,
+                focus=settings.hotkey_focus,
+            ),
+        )
+
+    def _break_cadence_state(self) -> BreakCadenceState:
+        settings = self._settings
+        reminder = self._break_reminder
+        return BreakCadenceState(
+            mode=str(getattr(settings, "cadence_mode", settings.break_mode)),
+            short_interval=int(
+                getattr(settings, "cadence_short_interval", settings.work_duration)
+            ),
+            short_duration=int(
+                getattr(settings, "cadence_short_duration", settings.break_duration)
+            ),
+            long_enabled=bool(
+                getattr(settings, "cadence_long_enabled", False)
+            ),
+            long_interval=int(
+                getattr(settings, "cadence_long_interval", 60 * 60)
+            ),
+            long_duration=int(
+                getattr(settings, "cadence_long_duration", 5 * 60)
+            ),
+            short_remaining=int(
+                getattr(reminder, "short_remaining", getattr(reminder, "remaining", 0))
+            ),
+            long_remaining=int(getattr(reminder, "long_remaining", 0)),
+        )
+
+    def _break_prompt_state(self) -> BreakPromptState:
+        reminder = self._break_reminder
+        return BreakPromptState(
+            kind=str(
+                getattr(
+                    reminder,
+                    "current_break_kind",
+                    getattr(reminder, "due_kind", "none"),
+                )
+                or "none"
+            ),
+            stage=str(getattr(reminder, "prompt_stage", "none") or "none"),
+            snoozed_until=(
+                getattr(reminder, "snoozed_until", None)
+                if isinstance(getattr(reminder, "snoozed_until", None), datetime)
+                else None
+            ),
+        )
+
+    def _default_weather_state(self) -> WeatherState:
+        return WeatherState(
+            status=(
+                'idle'
+                if bool(getattr(self._settings, 'weather_enabled', False))
+                else 'disabled'
+            )
+        )
+
+    def _default_quick_tools(self) -> QuickToolsState:
+        settings = self._settings
+        return QuickToolsState(
+            hourly_chime_enabled=bool(
+                getattr(settings, 'hourly_chime_enabled', False)
+            ),
+            quiet_hours_start=str(
+                getattr(settings, 'quiet_hours_start', '23:00')
+            ),
+            quiet_hours_end=str(
+                getattr(settings, 'quiet_hours_end', '07:00')
+            ),
+            quick_actions=tuple(
+                getattr(
+                    settings,
+                    'quick_actions',
+                    ('rest', 'timer', 'notes', 'system'),
+                )
+            ),
+        )
+
+    def _break_history_state(self) -> BreakHistoryState:
+        history = self._break_history
+        summary = getattr(history, "summary", None)
+        if not callable(summary):
+            return BreakHistoryState()
+        return BreakHistoryState(
+            available=True,
+            last_7_days=summary(7),
+            last_30_days=summary(30),
+        )
+
     def _default_pet_catalog(self) -> PetCatalogState:
         pet_id = str(getattr(self._settings, 'active_pet_id', 'snow_ferret'))
         return PetCatalogState(
@@ -320,7 +526,7 @@ class StateProjector:
         settings = self._settings
         pet_id = str(getattr(settings, 'active_pet_id', 'snow_ferret'))
         preferences = getattr(settings, 'pet_preferences', {})
-        slots = preferences.get(pet_id, {}) if isinstance(preferences, dict) else {}
+        slots = preferences.get(pet_id, {}) if isinstance(preferences, Mapping) else {}
         appearance = PetAppearanceState(
             headwear=str(slots.get('headwear', '')),
             neckwear=str(slots.get('neckwear', '')),
@@ -360,6 +566,33 @@ class StateProjector:
             ),
         )
 
+    def _display_health_key(self) -> tuple[object, ...]:
+        service = self._blue_filter
+        if service is None:
+            return ()
+        return (
+            getattr(service, "hdr_active", False),
+            getattr(service, "commit_pending", getattr(service, "pending", False)),
+            getattr(service, "capability_verified", False),
+            getattr(service, "last_error_code", ""),
+        )
+
+    def _display_health_state(
+        self,
+        transaction_phase: str,
+        request_id: int | None,
+    ) -> DisplayHealthState:
+        health = self._display_health()
+        return replace(
+            health,
+            pending=(
+                health.pending
+                or transaction_phase in {"applying", "compensating"}
+            ),
+            transaction_phase=transaction_phase,
+            request_id=request_id,
+        )
+
     def _display_health(self) -> DisplayHealthState:
         service = self._blue_filter
         if service is None:
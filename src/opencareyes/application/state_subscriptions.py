@@ -0,0 +1,155 @@
+'''Deliver AppState changes only to views whose slices changed.'''
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from dataclasses import fields
+
+from opencareyes.state import AppState
+
+log = logging.getLogger(__name__)
+
+SLICES = frozenset(item.name for item in fields(AppState))
+
+
+def slices_changed(
+    previous: AppState | None,
+    current: AppState,
+    slices: tuple[str, ...],
+) -> bool:
+    '''Whether any named top-level slice differs; identity short-circuits.'''
+
+    if previous is None or not slices:
+        return previous is not current
+    for name in slices:
+        old = getattr(previous, name)
+        new = getattr(current, name)
+        if old is not new and old != new:
+            return True
+    return False
+
+
+class StateSubscription:
+    '''One view's interest in a fixed set of top-level AppState slices.
+
+    ``is_active`` reports whether the view can be seen; while it returns
+    false, changes are remembered and delivered once by :meth:`resume`.
+    '''
+
+    __slots__ = (
+        '_registry',
+        'slices',
+        '_callback',
+        '_is_active',
+        '_delivered',
+        '_deferred',
+    )
+
+    def __init__(
+        self,
+        registry: StateSubscriptions,
+        slices: tuple[str, ...],
+        callback: Callable[[AppState], object],
+        is_active: Callable[[], bool] | None,
+        delivered: AppState | None,
+    ) -> None:
+        self._registry = registry
+        self.slices = slices
+        self._callback = callback
+        self._is_active = is_active
+        self._delivered = delivered
+        self._deferred = False
+
+    @property
+    def deferred(self) -> bool:
+        return self._deferred
+
+    def offer(self, state: AppState, *, force: bool = False) -> bool:
+        '''Deliver ``state`` if a watched slice changed; True when delivered.'''
+
+        if not force and not slices_changed(self._delivered, state, self.slices):
+            return False
+        if self._is_active is not None and not self._is_active():
+            self._deferred = True
+            return False
+        self._deliver(state)
+        return True
+
+    def resume(self) -> bool:
+        '''Deliver the latest state to a view that was hidden when it changed.'''
+
+        state = self._registry.state
+        if not self._deferred or state is None:
+            return False
+        self._deliver(state)
+        return True
+
+    def cancel(self) -> None:
+        self._registry.unsubscribe(self)
+
+    def _deliver(self, state: AppState) -> None:
+        self._deferred = False
+        self._delivered = state
+        try:
+            self._callback(state)
+        except Exception:
+            log.exception('State subscriber failed for %s', ', '.join(self.slices))
+
+
+class StateSubscriptions:
+    '''Registry that fans a published AppState out by slice.'''
+
+    def __init__(self) -> None:
+        self._subscriptions: list[StateSubscription] = []
+        self._state: AppState | None = None
+
+    @property
+    def state(self) -> AppState | None:
+        return self._state
+
+    def __len__(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(
+        self,
+        slices: Iterable[str],
+        callback: Callable[[AppState], object],
+        *,
+        is_active: Callable[[], bool] | None = None,
+        state: AppState | None = None,
+    ) -> StateSubscription:
+        '''Watch ``slices``; ``state`` is what the view has already rendered.
+
+        An empty ``slices`` watches the whole state.
+        '''
+
+        names = tuple(dict.fromkeys(str(name) for name in slices))
+        unknown = set(names) - SLICES
+        if unknown:
+            raise ValueError(f'Unknown AppState slices: {", ".join(sorted(unknown))}')
+        subscription = StateSubscription(
+            self,
+            names,
+            callback,
+            is_active,
+            state if state is not None else self._state,
+        )
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: StateSubscription) -> None:
+        try:
+            self._subscriptions.remove(subscription)
+        except ValueError:
+            pass
+
+    def publish(self, state: AppState, *, force: bool = False) -> int:
+        '''Offer ``state`` to every subscriber; return how many rendered.'''
+
+        self._state = state
+        delivered = 0
+        for subscription in tuple(self._subscriptions):
+            if subscription.offer(state, force=force):
+                delivered += 1
+        return delivered
@@ -76,6 +76,7 @@ class DefaultPreferences:
     schedule_night_profile: str = "night"
     sunrise_offset: int = 0
     sunset_offset: int = 0
+    schedule_ramp_minutes: int = 0
     hotkey_filter: str = HOTKEY_TOGGLE_FILTER
     hotkey_break: str = HOTKEY_TOGGLE_BREAK
     hotkey_dimmer: str = HOTKEY_TOGGLE_DIMMER
@@ -6,16 +6,25 @@ import json
 import logging
 import os
 import re
-from collections.abc import Iterable, Iterator, Mapping
+from collections.abc import Callable, Iterable, Iterator, Mapping
 from contextlib import contextmanager
 from enum import Enum
+from types import MappingProxyType
 from typing import Any, TypedDict
 
-from PySide6.QtCore import QSettings
+from PySide6.QtCore import QFileSystemWatcher, QSettings, QTimer
 
 from opencareyes.config.defaults import DEFAULT_PREFERENCES, LEGACY_V2_PREFERENCES
 from opencareyes.config.presets import PRESETS
-from opencareyes.constants import APP_NAME, ORG_NAME
+from opencareyes.config.settings_wal import SettingsWriteAheadLog
+from opencareyes.constants import (
+    APP_NAME,
+    DIM_MAX,
+    DIM_MIN,
+    ORG_NAME,
+    TEMP_MAX,
+    TEMP_MIN,
+)
 
 
 SCHEMA_VERSION = 6
@@ -25,15 +34,21 @@ logger = logging.getLogger(__name__)
 _PENDING_SETTINGS_KEY = "meta/pending_settings"
 _PENDING_SNAPSHOT_KEY = "meta/pending_settings_snapshot"
 _PENDING_OPERATION_KEY = "meta/pending_settings_operation"
+_PENDING_JOURNAL_KEY = "meta/pending_settings_journal"
 _RECOVERY_KEYS = {
     _PENDING_SETTINGS_KEY,
     _PENDING_SNAPSHOT_KEY,
     _PENDING_OPERATION_KEY,
+    _PENDING_JOURNAL_KEY,
 }
 
 _PET_ID_PATTERN = re.compile(r'^[a-z0-9_]{1,64}$')
 _ITEM_ID_PATTERN = re.compile(r'^[a-z0-9_.-]{1,64}$')
 _CLOCK_PATTERN = re.compile(r'^(?:[01]\d|2[0-3]):[0-5]\d$')
+_SCHEDULE_POINT_PATTERN = re.compile(
+    r'^(?:(?:[01]\d|2[0-3]):[0-5]\d|(?:sunrise|sunset)(?:[+-]\d{1,3})?)$'
+)
+_SCHEDULE_STAGE_LIMIT = 8
 _PET_ANCHOR_EDGES = {'bottom_right', 'bottom_left', 'top_right', 'top_left', 'free'}
 _PET_ACCESSORY_SLOTS = {
     'headwear',
@@ -45,6 +60,18 @@ _PET_ACCESSORY_SLOTS = {
 }
 _REST_SCENES = {'gaze', 'snow_breathing', 'stretch', 'sleep'}
 _QUICK_ACTIONS = {'rest', 'timer', 'notes', 'system', 'wardrobe', 'more'}
+_MONITOR_TARGET_LIMIT = 16
+# Properties that report wrapper state rather than decoded store values.
+_UNCACHED_PROPERTIES = {
+    "schema_version",
+    "stored_schema_version",
+    "read_only",
+    "in_transaction",
+    "flush_pending",
+    "generation",
+}
+
+MonitorTarget = tuple[int | None, int | None]
 
 
 class SettingsReadOnlyError(RuntimeError):
@@ -56,7 +83,7 @@ class SettingsMigrationError(RuntimeError):
 
 
 class SettingsTransactionError(RuntimeError):
-    """Raised when a preference transaction cannot be rolled back cleanly."""
+    """Raised when a preference transaction cannot be committed or rolled back cleanly."""
 
 
 class AppRule(TypedDict):
@@ -72,6 +99,12 @@ class AppPropRule(TypedDict):
     prop_id: str
 
 
+class ScheduleStage(TypedDict):
+    start: str
+    end: str
+    profile: str
+
+
 _APP_RULE_FLAGS = ("breaks", "focus", "filter", "dimmer")
 
 
@@ -128,6 +161,16 @@ def _sync_store_checked(store: Any) -> None:
         raise OSError(f"Settings backend sync failed: {status}")
 
 
+def _store_contains(store: Any, key: str) -> bool:
+    contains = getattr(store, "contains", None)
+    if callable(contains):
+        return bool(contains(key))
+    try:
+        return key in tuple(store.allKeys() or ())
+    except (AttributeError, TypeError):
+        return store.value(key, None) is not None
+
+
 def _restore_store(store: Any, snapshot: Mapping[str, object]) -> None:
     store.clear()
     for key, value in snapshot.items():
@@ -189,9 +232,47 @@ def _persist_pending_snapshot(
     _sync_store_checked(store)
 
 
-def _clear_pending_snapshot(store: Any) -> None:
+def _remove_recovery_keys(store: Any) -> None:
     for key in _RECOVERY_KEYS:
         _remove_store_key(store, key)
+
+
+def _clear_pending_snapshot(store: Any) -> None:
+    _remove_recovery_keys(store)
+    _sync_store_checked(store)
+
+
+_WriteSet = dict[str, tuple[bool, object]]
+
+
+def _encode_write_set(write_set: Mapping[str, tuple[bool, object]]) -> str:
+    return _encode_snapshot(
+        {key: [present, prior] for key, (present, prior) in write_set.items()}
+    )
+
+
+def _decode_write_set(value: object) -> _WriteSet:
+    decoded = _decode_snapshot(value)
+    write_set: _WriteSet = {}
+    for key, entry in decoded.items():
+        if not isinstance(entry, list) or len(entry) != 2:
+            raise ValueError("Pending settings journal is invalid")
+        write_set[key] = (bool(entry[0]), entry[1])
+    return write_set
+
+
+def _put_back_write_set(store: Any, write_set: Mapping[str, tuple[bool, object]]) -> None:
+    for key, (present, prior) in write_set.items():
+        if present:
+            store.setValue(key, prior)
+        else:
+            _remove_store_key(store, key)
+
+
+def _undo_write_set(store: Any, write_set: Mapping[str, tuple[bool, object]]) -> None:
+    """Put back the prior value of every touched key and drop the journal."""
+    _put_back_write_set(store, write_set)
+    _remove_recovery_keys(store)
     _sync_store_checked(store)
 
 
@@ -214,6 +295,31 @@ def _validated_offset(value: object) -> int:
     return offset
 
 
+def _validated_ramp_minutes(value: object) -> int:
+    minutes = int(value)
+    if not 0 <= minutes <= 180:
+        raise ValueError("Schedule ramp minutes must be between 0 and 180")
+    return minutes
+
+
+def _validated_schedule_point(value: object) -> str:
+    point = str(value).strip().lower()
+    if not _SCHEDULE_POINT_PATTERN.fullmatch(point):
+        raise ValueError(f"Invalid schedule stage time: {value}")
+    anchor = point.rstrip('+-0123456789')
+    if anchor != point and anchor in {'sunrise', 'sunset'}:
+        _validated_offset(point[len(anchor):])
+    return point
+
+
+def _validated_schedule_stage(stage: Mapping[str, object]) -> ScheduleStage:
+    return ScheduleStage(
+        start=_validated_schedule_point(stage.get('start', '')),
+        end=_validated_schedule_point(stage.get('end', '')),
+        profile=_validated_profile(stage.get('profile', '')),
+    )
+
+
 def _validated_pet_id(value: object) -> str:
     pet_id = str(value).strip().lower()
     if not _PET_ID_PATTERN.fullmatch(pet_id):
@@ -240,6 +346,25 @@ def _validated_app_id(value: object) -> str:
     return app_id
 
 
+def _validated_monitor_key(value: object) -> str:
+    key = str(value).strip().casefold()
+    if not key or len(key) > 256 or any(ord(char) < 32 for char in key):
+        raise ValueError('monitor key must be a non-empty display identity')
+    return key
+
+
+def _validated_monitor_target(value: object) -> MonitorTarget:
+    if not isinstance(value, (list, tuple)) or len(value) != 2:
+        raise ValueError('monitor targets must be [temperature, dim_level] pairs')
+    temperature, dim_level = value
+    return (
+        None
+        if temperature is None
+        else max(TEMP_MIN, min(TEMP_MAX, int(temperature))),
+        None if dim_level is None else max(DIM_MIN, min(DIM_MAX, int(dim_level))),
+    )
+
+
 def _validated_app_prop_rule(rule: Mapping[str, object]) -> AppPropRule:
     return AppPropRule(
         app_id=_validated_app_id(rule.get('app_id', '')),
@@ -247,6 +372,165 @@ def _validated_app_prop_rule(rule: Mapping[str, object]) -> AppPropRule:
     )
 
 
+def _frozen(value: object) -> object:
+    if isinstance(value, dict):
+        return MappingProxyType({key: _frozen(item) for key, item in value.items()})
+    if type(value) is list or type(value) is tuple:
+        return tuple(_frozen(item) for item in value)
+    return value
+
+
+_REMOVED = object()
+
+
+class _SettingsStore:
+    """Store proxy that tracks decode reads and can hold writes in memory.
+
+    Keys read while a property is being decoded are reported to every set
+    in ``readers``. Once :meth:`buffer_writes` is called, writes land in an
+    overlay that reads consult first, and the backend only sees them when
+    :meth:`sync` applies the overlay right before syncing.
+    """
+
+    __slots__ = ("_store", "_readers", "_overlay")
+
+    def __init__(self, store: Any, readers: list[set[str]]):
+        self._store = store
+        self._readers = readers
+        self._overlay: dict[str, object] | None = None
+
+    def buffer_writes(self) -> None:
+        if self._overlay is None:
+            self._overlay = {}
+
+    @property
+    def pending(self) -> bool:
+        """Whether buffered writes have not been applied to the backend."""
+        return bool(self._overlay)
+
+    def value(self, key: str, *args, **kwargs):
+        for keys in self._readers:
+            keys.add(key)
+        overlay = self._overlay
+        if not overlay or key not in overlay:
+            return self._store.value(key, *args, **kwargs)
+        value = overlay[key]
+        if value is _REMOVED:
+            return args[0] if args else kwargs.get("defaultValue", kwargs.get("default"))
+        value_type = kwargs.get("type")
+        if value_type is not None and value is not None and not isinstance(value, value_type):
+            return value_type(value)
+        return value
+
+    def setValue(self, key: str, value: object) -> None:
+        if self._overlay is None:
+            self._store.setValue(key, value)
+        else:
+            self._overlay[key] = value
+
+    def remove(self, key: str) -> None:
+        if self._overlay is None:
+            _remove_store_key(self._store, key)
+        else:
+            self._overlay[key] = _REMOVED
+
+    def contains(self, key: str) -> bool:
+        overlay = self._overlay
+        if overlay and key in overlay:
+            return overlay[key] is not _REMOVED
+        return _store_contains(self._store, key)
+
+    def allKeys(self) -> list[str]:
+        keys = list(self._store.allKeys() or ())
+        overlay = self._overlay
+        if not overlay:
+            return keys
+        present = set(keys)
+        keys = [key for key in keys if overlay.get(key) is not _REMOVED]
+        keys.extend(
+            key for key, value in overlay.items()
+            if value is not _REMOVED and key not in present
+        )
+        return keys
+
+    def clear(self) -> None:
+        if self._overlay:
+            self._overlay.clear()
+        self._store.clear()
+
+    def sync(self) -> None:
+        overlay = self._overlay
+        if overlay:
+            for key, value in overlay.items():
+                if value is _REMOVED:
+                    _remove_store_key(self._store, key)
+                else:
+                    self._store.setValue(key, value)
+            overlay.clear()
+        sync = getattr(self._store, "sync", None)
+        if callable(sync):
+            sync()
+
+    def __getattr__(self, name: str):
+        return getattr(self._store, name)
+
+
+def _cached_getter(name: str, getter: Callable[[Any], object]):
+    def cached(self):
+        try:
+            value = self._decoded[name]
+        except KeyError:
+            pass
+        else:
+            # An alias decoded inside another getter inherits its keys.
+            for keys in self._readers:
+                keys.update(self._dependencies[name])
+            return value
+        keys: set[str] = set()
+        self._readers.append(keys)
+        try:
+            value = _frozen(getter(self))
+        finally:
+            self._readers.pop()
+        for outer in self._readers:
+            outer.update(keys)
+        self._decoded[name] = value
+        self._dependencies[name] = keys
+        for key in keys:
+            self._dependents.setdefault(key, set()).add(name)
+        return value
+
+    cached.__name__ = getter.__name__
+    cached.__doc__ = getter.__doc__
+    return cached
+
+
+def _cache_decoded_properties(cls):
+    """Memoize every store-backed property getter of ``cls``.
+
+    Entries are keyed by the getter name so aliases share one slot and are
+    frozen at decode time, so reads hand out the cached object itself. The
+    store keys each getter read are recorded; a write drops only the
+    entries that depend on the written key.
+    """
+
+    for name, attribute in list(vars(cls).items()):
+        if not isinstance(attribute, property) or name in _UNCACHED_PROPERTIES:
+            continue
+        getter = attribute.fget
+        setattr(
+            cls,
+            name,
+            property(
+                _cached_getter(getter.__name__, getter),
+                attribute.fset,
+                attribute.fdel,
+                attribute.__doc__,
+            ),
+        )
+    return cls
+
+
 class SettingsMigrator:
     """Apply ordered settings migrations with snapshot-based rollback."""
 
@@ -325,10 +609,14 @@ class SettingsMigrator:
         )
         logger.warning("Recovering interrupted settings %s", operation)
         try:
-            snapshot = _decode_snapshot(
-                self._store.value(_PENDING_SNAPSHOT_KEY, None)
-            )
-            _restore_store_checked(self._store, snapshot)
+            journal = self._store.value(_PENDING_JOURNAL_KEY, None)
+            if journal is not None:
+                _undo_write_set(self._store, _decode_write_set(journal))
+            else:
+                snapshot = _decode_snapshot(
+                    self._store.value(_PENDING_SNAPSHOT_KEY, None)
+                )
+                _restore_store_checked(self._store, snapshot)
         except Exception:
             logger.exception(
                 "Interrupted settings recovery could not be persisted; "
@@ -485,31 +773,75 @@ class SettingsMigrator:
         _restore_store_checked(self._store, snapshot)
 
 
+@_cache_decoded_properties
 class Settings:
     """Thin wrapper around :class:`QSettings` with typed accessors.
 
     ``store`` is injectable for tests and for portable-build backends.  The
     no-argument constructor remains fully compatible with v0.1.1.
+
+    Decoded property values are cached in memory after the first read, so
+    hot paths do not re-parse JSON or re-validate on every refresh. All
+    writes in this class pass through :meth:`_set_value`,
+    :meth:`restore_snapshot` or :meth:`reset`, which drop the cache; an INI
+    backend selected by ``OPENCAREYES_SETTINGS_PATH`` is also watched for
+    edits made by other processes.
+
+    With ``write_ahead_log`` set, writes are held in memory and every
+    commit is appended to that file; the backend only receives the held
+    writes, and one sync, at most once per ``flush_delay_ms``.
+    :meth:`sync_checked` and :meth:`flush` force the flush. Without it
+    every commit syncs immediately.
     """
 
-    def __init__(self, store: QSettings | None = None):
-        if store is not None:
-            self._s = store
-        else:
+    FLUSH_DELAY_MS = 500
+    FLUSH_RETRY_MS = 5000
+
+    def __init__(
+        self,
+        store: QSettings | None = None,
+        *,
+        write_ahead_log: str | os.PathLike[str] | None = None,
+        flush_delay_ms: int = FLUSH_DELAY_MS,
+    ):
+        self._decoded: dict[str, object] = {}
+        self._dependencies: dict[str, set[str]] = {}
+        self._dependents: dict[str, set[str]] = {}
+        self._readers: list[set[str]] = []
+        self._generation = 0
+        self._write_set: _WriteSet | None = None
+        self._write_set_failed = False
+        self._watcher: QFileSystemWatcher | None = None
+        self._wal = (
+            SettingsWriteAheadLog(write_ahead_log)
+            if write_ahead_log is not None
+            else None
+        )
+        self._flush_delay_ms = max(0, int(flush_delay_ms))
+        self._flush_timer: QTimer | None = None
+        if store is None:
             settings_path = os.environ.get("OPENCAREYES_SETTINGS_PATH")
-            self._s = (
+            store = (
                 QSettings(settings_path, QSettings.IniFormat)
                 if settings_path
                 else QSettings(ORG_NAME, APP_NAME)
             )
+            if settings_path:
+                self._watch_backend_file(settings_path)
+        self._s = _SettingsStore(store, self._readers)
         self._stored_schema_version, self._read_only = SettingsMigrator(
             self._s
         ).migrate()
+        # Migration writes straight to the store; start from a clean cache.
+        self._invalidate_decoded()
         self._read_only_reason = (
             "future_schema"
             if self._stored_schema_version > SCHEMA_VERSION
             else "recovery"
         )
+        if self._wal is not None and not self._read_only:
+            self._s.buffer_writes()
+            self._replay_write_ahead_log()
 
     @property
     def schema_version(self) -> int:
@@ -527,7 +859,132 @@ class Settings:
     def _set_value(self, key: str, value: object) -> None:
         if self._read_only:
             self._raise_read_only("update settings")
+        if self._write_set is None and self._wal is not None:
+            # A held write is only acknowledged once its commit is logged.
+            with self.transaction():
+                self._set_value(key, value)
+            return
+        self._record_prior(key)
         self._s.setValue(key, value)
+        self._invalidate_key(key)
+
+    def _remove_value(self, key: str) -> None:
+        if self._read_only:
+            self._raise_read_only("update settings")
+        if self._write_set is None and self._wal is not None:
+            with self.transaction():
+                self._remove_value(key)
+            return
+        self._record_prior(key)
+        _remove_store_key(self._s, key)
+        self._invalidate_key(key)
+
+    def _record_prior(self, key: str) -> None:
+        write_set = self._write_set
+        if write_set is None or key in write_set or key in _RECOVERY_KEYS:
+            return
+        present = _store_contains(self._s, key)
+        write_set[key] = (present, self._s.value(key, None) if present else None)
+        if self._wal is not None:
+            # Held writes never reach the backend before their commit is
+            # logged, so there is nothing on disk to undo.
+            return
+        # The undo record is written ahead of the value it protects, so an
+        # interrupted flush can always be rolled back on the next start.
+        self._s.setValue(_PENDING_JOURNAL_KEY, _encode_write_set(write_set))
+        if len(write_set) == 1:
+            self._s.setValue(_PENDING_OPERATION_KEY, "transaction")
+            self._s.setValue(_PENDING_SETTINGS_KEY, True)
+            # Registry and INI syncs are not atomic, so the marker must
+            # reach disk before any user key can. Later journal updates
+            # are set ahead of their keys and travel in the same sync.
+            _sync_store_checked(self._s)
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped whenever any stored value may have changed."""
+        return self._generation
+
+    def invalidate_cache(self) -> None:
+        """Forget decoded values, e.g. after the backend changed externally."""
+        self._invalidate_decoded()
+
+    def _invalidate_decoded(self) -> None:
+        self._decoded.clear()
+        self._dependencies.clear()
+        self._dependents.clear()
+        self._generation += 1
+
+    def _invalidate_key(self, key: str) -> None:
+        for name in self._dependents.pop(key, ()):
+            self._decoded.pop(name, None)
+            for dependency in self._dependencies.pop(name, ()):
+                if dependency != key:
+                    self._dependents.get(dependency, set()).discard(name)
+        self._generation += 1
+
+    def _watch_backend_file(self, path: str) -> None:
+        self._watcher = QFileSystemWatcher()
+        if os.path.exists(path):
+            self._watcher.addPath(path)
+        self._watcher.fileChanged.connect(self._on_backend_file_changed)
+
+    def _on_backend_file_changed(self, path: str) -> None:
+        try:
+            # QSettings only re-reads a changed INI file on sync().
+            self._s.sync()
+        except Exception:
+            logger.warning("Settings file reload failed", exc_info=True)
+        self._invalidate_decoded()
+        watcher = self._watcher
+        # Atomic replacement drops the watch; re-arm it on the new file.
+        if watcher is not None and path not in watcher.files() and os.path.exists(path):
+            watcher.addPath(path)
+
+    def _replay_write_ahead_log(self) -> None:
+        # Runs after recovery has undone any uncommitted journal, so the
+        # logged commits are re-applied on top of their own prior values.
+        replayed = 0
+        for values, removed in self._wal.records():
+            for key, value in values.items():
+                if key not in _RECOVERY_KEYS:
+                    self._s.setValue(key, value)
+            for key in removed:
+                if key not in _RECOVERY_KEYS:
+                    _remove_store_key(self._s, key)
+            replayed += 1
+        if replayed:
+            try:
+                _sync_store_checked(self._s)
+            except OSError:
+                logger.exception(
+                    "Replayed settings could not be synced; keeping the log"
+                )
+                return
+            logger.info("Replayed %d logged settings commit(s)", replayed)
+        self._wal.clear()
+
+    def _schedule_flush(self, delay_ms: int | None = None) -> None:
+        if self._flush_timer is None:
+            self._flush_timer = QTimer()
+            self._flush_timer.setSingleShot(True)
+            self._flush_timer.timeout.connect(self._flush_deferred)
+        if delay_ms is not None:
+            self._flush_timer.start(delay_ms)
+        elif not self._flush_timer.isActive():
+            # Coalesce: later commits ride along with the pending flush.
+            self._flush_timer.start(self._flush_delay_ms)
+
+    def _flush_deferred(self) -> None:
+        if self._read_only:
+            return
+        try:
+            self.flush()
+        except Exception:
+            logger.warning(
+                "Deferred settings flush failed; retrying", exc_info=True
+            )
+            self._schedule_flush(self.FLUSH_RETRY_MS)
 
     def _raise_read_only(self, action: str) -> None:
         if self._read_only_reason == "future_schema":
@@ -687,6 +1144,57 @@ class Settings:
     def sunset_offset(self, value: int) -> None:
         self._set_value("automation/sunset_offset", _validated_offset(value))
 
+    @property
+    def schedule_ramp_minutes(self) -> int:
+        """Minutes before a night boundary spent easing toward its profile."""
+        value = self._s.value(
+            "automation/ramp_minutes",
+            DEFAULT_PREFERENCES.schedule_ramp_minutes,
+            type=int,
+        )
+        try:
+            return _validated_ramp_minutes(value)
+        except (TypeError, ValueError):
+            return DEFAULT_PREFERENCES.schedule_ramp_minutes
+
+    @schedule_ramp_minutes.setter
+    def schedule_ramp_minutes(self, value: int) -> None:
+        self._set_value("automation/ramp_minutes", _validated_ramp_minutes(value))
+
+    @property
+    def schedule_stages(self) -> tuple[Mapping[str, str], ...]:
+        """Extra evening stages layered over the night profile, later ones winning."""
+        raw = self._s.value("automation/stages_json", "[]")
+        try:
+            decoded = json.loads(raw) if isinstance(raw, str) else raw
+        except (TypeError, ValueError):
+            return ()
+        if not isinstance(decoded, list):
+            return ()
+        result: list[ScheduleStage] = []
+        for item in decoded:
+            if not isinstance(item, Mapping):
+                continue
+            try:
+                result.append(_validated_schedule_stage(item))
+            except (TypeError, ValueError):
+                continue
+            if len(result) == _SCHEDULE_STAGE_LIMIT:
+                break
+        return tuple(result)
+
+    @schedule_stages.setter
+    def schedule_stages(self, value: Iterable[Mapping[str, object]]) -> None:
+        stages = tuple(_validated_schedule_stage(stage) for stage in value)
+        if len(stages) > _SCHEDULE_STAGE_LIMIT:
+            raise ValueError(
+                f'At most {_SCHEDULE_STAGE_LIMIT} schedule stages may be stored'
+            )
+        self._set_value(
+            "automation/stages_json",
+            json.dumps(stages, ensure_ascii=True, separators=(',', ':')),
+        )
+
     # ---- Screen dimmer ----
     @property
     def dimmer_enabled(self) -> bool:
@@ -708,6 +1216,53 @@ class Settings:
     def dim_level(self, value: int) -> None:
         self._set_value("dimmer/level", int(value))
 
+    # ---- Per-monitor display targets ----
+    @property
+    def monitor_targets(self) -> Mapping[str, MonitorTarget]:
+        """Per-output ``(temperature, dim_level)`` overrides.
+
+        Keys are casefolded GDI device names or display target identities;
+        ``None`` means the output follows the shared value. Stored compactly
+        as ``{"key": [kelvin|null, dim|null]}``.
+        """
+        raw = self._s.value('display/monitor_targets_json', '{}')
+        try:
+            decoded = json.loads(raw) if isinstance(raw, str) else raw
+        except (TypeError, ValueError):
+            return {}
+        if not isinstance(decoded, Mapping):
+            return {}
+        result: dict[str, MonitorTarget] = {}
+        for raw_key, raw_target in tuple(decoded.items())[:_MONITOR_TARGET_LIMIT]:
+            try:
+                key = _validated_monitor_key(raw_key)
+                target = _validated_monitor_target(raw_target)
+            except (TypeError, ValueError):
+                continue
+            if target != (None, None):
+                result[key] = target
+        return result
+
+    @monitor_targets.setter
+    def monitor_targets(self, value: Mapping[str, Iterable[int | None]]) -> None:
+        normalized: dict[str, MonitorTarget] = {}
+        for raw_key, raw_target in value.items():
+            target = _validated_monitor_target(tuple(raw_target))
+            if target != (None, None):
+                normalized[_validated_monitor_key(raw_key)] = target
+        if len(normalized) > _MONITOR_TARGET_LIMIT:
+            raise ValueError(
+                f'At most {_MONITOR_TARGET_LIMIT} monitor targets may be stored'
+            )
+        self._set_value(
+            'display/monitor_targets_json',
+            json.dumps(
+                {key: list(target) for key, target in normalized.items()},
+                ensure_ascii=True,
+                separators=(',', ':'),
+            ),
+        )
+
     # ---- Break reminder ----
     @property
     def break_enabled(self) -> bool:
@@ -987,7 +1542,7 @@ class Settings:
         self._set_value("context/natural_rest_enabled", bool(value))
 
     @property
-    def app_rules(self) -> tuple[AppRule, ...]:
+    def app_rules(self) -> tuple[Mapping[str, Any], ...]:
         raw_value = self._s.value("context/app_rules_json", "[]")
         if isinstance(raw_value, str):
             try:
@@ -1353,7 +1908,7 @@ class Settings:
         )
 
     @property
-    def pet_preferences(self) -> dict[str, dict[str, str]]:
+    def pet_preferences(self) -> Mapping[str, Mapping[str, str]]:
         raw = self._s.value('companion/pet_preferences_json', '{}')
         try:
             decoded = json.loads(raw) if isinstance(raw, str) else raw
@@ -1403,7 +1958,7 @@ class Settings:
         )
 
     @property
-    def app_prop_rules(self) -> tuple[AppPropRule, ...]:
+    def app_prop_rules(self) -> tuple[Mapping[str, str], ...]:
         raw = self._s.value('companion/app_prop_rules_json', '[]')
         try:
             decoded = json.loads(raw) if isinstance(raw, str) else raw
@@ -1561,16 +2116,146 @@ class Settings:
         return _settings_snapshot(self._s)
 
     def restore_snapshot(self, snapshot: Mapping[str, object]) -> None:
-        """Restore and persist a snapshot, checking the backend result."""
+        """Restore and persist a snapshot, checking the backend result.
+
+        Only keys whose value differs from ``snapshot`` are written.
+        """
         if self._read_only:
             self._raise_read_only("restore settings")
-        _restore_store_checked(self._s, snapshot)
+        try:
+            current = self.snapshot()
+            self.set_values(
+                {
+                    key: value
+                    for key, value in snapshot.items()
+                    if key not in current or current[key] != value
+                },
+                remove=(key for key in current if key not in snapshot),
+            )
+            self.sync_checked()
+        finally:
+            self._invalidate_decoded()
+
+    def set_values(
+        self,
+        values: Mapping[str, object],
+        *,
+        remove: Iterable[str] = (),
+    ) -> None:
+        """Write raw ``values`` and delete ``remove`` without syncing."""
+        for key, value in values.items():
+            if key not in _RECOVERY_KEYS:
+                self._set_value(key, value)
+        for key in tuple(remove):
+            if key not in _RECOVERY_KEYS:
+                self._remove_value(key)
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._write_set is not None
+
+    def begin_changes(self) -> bool:
+        """Start recording a write set; False when one is already open.
+
+        Every key written until :meth:`commit_changes` or
+        :meth:`rollback_changes` has its prior value journaled once.
+        """
+        if self._read_only:
+            self._raise_read_only("update settings")
+        if self._write_set is not None:
+            return False
+        self._write_set = {}
+        self._write_set_failed = False
+        return True
+
+    def fail_changes(self) -> None:
+        """Mark the open write set failed so committing it raises instead.
+
+        Used by commands that joined an outer write set: the owner's commit
+        then fails and every touched key is rolled back together.
+        """
+        if self._write_set is not None:
+            self._write_set_failed = True
+
+    def commit_changes(self) -> None:
+        """Persist the open write set with a single backend sync.
+
+        With a write-ahead log the set is appended to the log instead, and
+        its held writes reach the backend with the next deferred flush. On
+        failure the write set stays open for :meth:`rollback_changes`.
+        """
+        write_set = self._write_set
+        if write_set is None:
+            self.sync_checked()
+            return
+        if self._write_set_failed:
+            raise SettingsTransactionError(
+                "A change inside this settings transaction failed"
+            )
+        if self._wal is None:
+            if write_set:
+                _remove_recovery_keys(self._s)
+            self.sync_checked()
+            self._write_set = None
+            return
+        if write_set:
+            values: dict[str, object] = {}
+            removed: list[str] = []
+            for key in write_set:
+                if _store_contains(self._s, key):
+                    values[key] = self._s.value(key, None)
+                else:
+                    removed.append(key)
+            # The log line is the commit point.
+            self._wal.append(values, removed)
+            self._schedule_flush()
+        self._write_set = None
+
+    def rollback_changes(self) -> None:
+        """Restore only the keys touched since :meth:`begin_changes`."""
+        write_set, self._write_set = self._write_set, None
+        self._write_set_failed = False
+        if not write_set:
+            return
+        try:
+            if self._wal is not None:
+                # Only the in-memory overlay saw these writes.
+                _put_back_write_set(self._s, write_set)
+            else:
+                _undo_write_set(self._s, write_set)
+        except Exception as rollback_error:
+            self._read_only = True
+            self._read_only_reason = "recovery"
+            logger.exception(
+                "Settings transaction rollback could not be persisted; "
+                "switching to read-only"
+            )
+            raise SettingsTransactionError(
+                "Settings transaction failed and rollback could not be persisted"
+            ) from rollback_error
+        finally:
+            self._invalidate_decoded()
 
     def sync_checked(self) -> None:
         """Persist pending writes and raise when QSettings reports an error."""
         if self._read_only:
             self._raise_read_only("sync settings")
+        if self._flush_timer is not None:
+            self._flush_timer.stop()
         _sync_store_checked(self._s)
+        if self._wal is not None:
+            self._wal.clear()
+
+    @property
+    def flush_pending(self) -> bool:
+        return self._wal is not None and (self._wal.pending or self._s.pending)
+
+    def flush(self) -> bool:
+        """Write held commits to the backend now; False if none were pending."""
+        if not self.flush_pending:
+            return False
+        self.sync_checked()
+        return True
 
     def sync(self) -> None:
         """Compatibility spelling for checked persistence."""
@@ -1578,28 +2263,18 @@ class Settings:
 
     @contextmanager
     def transaction(self) -> Iterator[Settings]:
-        """Commit preference writes atomically or restore the prior snapshot."""
-        if self._read_only:
-            self._raise_read_only("update settings")
-        snapshot = self.snapshot()
+        """Commit preference writes atomically or restore the touched keys.
+
+        A transaction opened inside another one joins the outer write set.
+        """
+        if not self.begin_changes():
+            yield self
+            return
         try:
-            _persist_pending_snapshot(self._s, snapshot, "transaction")
             yield self
-            self.sync_checked()
-            _clear_pending_snapshot(self._s)
+            self.commit_changes()
         except Exception:
-            try:
-                self.restore_snapshot(snapshot)
-            except Exception as rollback_error:
-                self._read_only = True
-                self._read_only_reason = "recovery"
-                logger.exception(
-                    "Settings transaction rollback could not be persisted; "
-                    "switching to read-only"
-                )
-                raise SettingsTransactionError(
-                    "Settings transaction failed and rollback could not be persisted"
-                ) from rollback_error
+            self.rollback_changes()
             raise
 
     def reset(self) -> None:
@@ -1607,7 +2282,7 @@ class Settings:
         if self._read_only:
             self._raise_read_only("reset settings")
         with self.transaction():
-            self._s.clear()
+            self.set_values({}, remove=self.snapshot())
             self._set_value("meta/schema_version", SCHEMA_VERSION)
 
 
@@ -0,0 +1,89 @@
+"""Append-only log of committed settings writes awaiting a backend flush."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+from collections.abc import Iterable, Iterator, Mapping
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+
+
+class SettingsWriteAheadLog:
+    """Durable record of settings commits that QSettings has not synced yet.
+
+    Each committed write set is appended as one JSON line holding the new
+    values and removed keys. Lines are flushed to the OS before the commit
+    returns, so a process crash between the commit and the next backend
+    sync loses nothing; the log is replayed on the next start and truncated
+    after every successful sync. A torn final line is ignored on replay.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]):
+        self._path = Path(path)
+        self._records = 0
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    @property
+    def pending(self) -> bool:
+        """Whether commits were appended since the last :meth:`clear`."""
+        return self._records > 0
+
+    def append(
+        self,
+        values: Mapping[str, object],
+        removed: Iterable[str] = (),
+    ) -> None:
+        """Append one committed write set; raises ``OSError`` on failure."""
+        try:
+            line = json.dumps(
+                {
+                    "v": SCHEMA_VERSION,
+                    "set": dict(values),
+                    "remove": sorted(removed),
+                },
+                ensure_ascii=True,
+                separators=(",", ":"),
+            )
+        except (TypeError, ValueError) as exc:
+            raise ValueError("Settings change contains an unsupported value") from exc
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with self._path.open("a", encoding="utf-8", newline="\n") as handle:
+            handle.write(line + "\n")
+            handle.flush()
+        self._records += 1
+
+    def records(self) -> Iterator[tuple[dict[str, object], tuple[str, ...]]]:
+        """Yield ``(values, removed)`` for every intact record, oldest first."""
+        try:
+            text = self._path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            return
+        except (OSError, UnicodeDecodeError):
+            logger.warning("Settings write-ahead log could not be read", exc_info=True)
+            return
+        for line in text.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                logger.warning("Ignoring a torn settings write-ahead record")
+                continue
+            if not isinstance(record, dict) or record.get("v") != SCHEMA_VERSION:
+                continue
+            values = record.get("set")
+            removed = record.get("remove")
+            if not isinstance(values, dict) or not isinstance(removed, list):
+                continue
+            yield values, tuple(str(key) for key in removed)
+
+    def clear(self) -> None:
+        """Drop the log once its records are durable in the backend."""
+        self._path.unlink(missing_ok=True)
+        self._records = 0
@@ -49,6 +49,9 @@ TEMP_MIN = 1000
 TEMP_MAX = 6500
 TEMP_DEFAULT = 6500
 
+# Fade between scheduled day/night profiles on the Gamma worker
+SCHEDULE_TRANSITION_MS = 20_000
+
 # Dimmer range (0 = no dim, 200 = max dim)
 DIM_MIN = 0
 DIM_MAX = 200
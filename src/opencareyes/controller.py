@@ -25,7 +25,17 @@ from .application.command_handlers import (
 )
 
 from opencareyes.application.effect_coordinator import EffectCoordinator
+from opencareyes.application.render_scheduler import RenderScheduler
+from opencareyes.application.state_diff import (
+    EVERYTHING,
+    StateChanges,
+    diff_states,
+)
 from opencareyes.application.state_projector import StateProjector
+from opencareyes.application.state_subscriptions import (
+    StateSubscription,
+    StateSubscriptions,
+)
 from opencareyes.application.update_checker import UpdateChecker
 from opencareyes.constants import (
     DIM_MAX,
@@ -138,6 +148,13 @@ def _user_failure_message(code: str) -> str:
     return "当前操作未能完成，请重试。"
 
 
+# Rollback token for commands whose settings writes the repository journals.
+_SETTINGS_WRITE_SET = object()
+# Token for commands nested in an already open write set, which owns the
+# commit, the sync and the rollback.
+_SETTINGS_JOINED = object()
+
+
 @dataclass(frozen=True, slots=True)
 class _OwnedSettingsSnapshot:
     keys: tuple[str, ...]
@@ -182,6 +199,8 @@ class AppController(QObject):
     """Own all feature mutations and publish immutable snapshots."""
 
     state_changed = Signal(object)
+    # (AppState, StateChanges): the published snapshot and its changed paths.
+    state_changes = Signal(object, object)
     companion_presentation_changed = Signal(object)
     break_tick = Signal(int, int)
     utility_timer_tick = Signal(int)
@@ -207,6 +226,8 @@ class AppController(QObject):
         utility_timer=None,
         note_repository=None,
         system_metrics=None,
+        break_history=None,
+        coalesce_state_updates: bool = False,
         parent: QObject | None = None,
     ):
         super().__init__(parent)
@@ -238,6 +259,7 @@ class AppController(QObject):
         self._utility_timer = utility_timer
         self._note_repository = note_repository
         self._system_metrics = system_metrics
+        self._break_history = break_history
         self._display_commands = DisplayCommands(self)
         self._break_focus_commands = BreakFocusCommands(self)
         self._automation_commands = AutomationCommands(self)
@@ -270,6 +292,7 @@ class AppController(QObject):
             focus_mode=focus_mode,
             scheduler=scheduler,
             hotkeys=hotkeys,
+            break_history=break_history,
         )
 
         self._pause_timer = QTimer(self)
@@ -293,6 +316,12 @@ class AppController(QObject):
                     "休息时间", "看看远处，让眼睛放松一下。"
                 )
             )
+            history_event = getattr(self._break_reminder, "history_event", None)
+            if history_event is not None:
+                history_event.connect(self._on_break_history_event)
+
+        if self._break_history is not None:
+            self._break_history.changed.connect(self.refresh_state)
 
         if self._scheduler is not None:
             set_profile_callback = getattr(
@@ -304,6 +333,11 @@ class AppController(QObject):
                 self._scheduler.set_state_callback(
                     self._on_scheduled_filter_state_requested
                 )
+            set_ramp_callback = getattr(
+                self._scheduler, "set_ramp_callback", None
+            )
+            if callable(set_ramp_callback):
+                set_ramp_callback(self._on_scheduled_ramp_requested)
             self._scheduler.next_event_changed.connect(self.refresh_state)
             self._scheduler.running_changed.connect(self.refresh_state)
             self._scheduler.manual_override_changed.connect(self.refresh_state)
@@ -379,12 +413,46 @@ class AppController(QObject):
                 )
 
         self._state = self._build_state()
+        self._state_subscriptions = StateSubscriptions()
+        self._last_changes: StateChanges = EVERYTHING
+        self._published_state = self._state
+        self._render_scheduler = RenderScheduler(
+            self._publish_state,
+            deferred=coalesce_state_updates,
+            parent=self,
+        )
         self._companion_presentation = self._build_companion_presentation()
 
     @property
     def state(self) -> AppState:
         return self._state
 
+    @property
+    def last_changes(self) -> StateChanges:
+        """Dotted paths that differed in the most recent published state."""
+        return self._last_changes
+
+    def subscribe_state(
+        self,
+        slices,
+        callback,
+        *,
+        is_active=None,
+    ) -> StateSubscription:
+        """Call ``callback`` only when one of the top-level ``slices`` changes.
+
+        The subscriber is assumed to have rendered the current state already.
+        While ``is_active`` returns false, delivery waits for
+        :meth:`StateSubscription.resume`.
+        """
+
+        return self._state_subscriptions.subscribe(
+            slices,
+            callback,
+            is_active=is_active,
+            state=self._state,
+        )
+
     @property
     def companion_presentation(self) -> CompanionPresentationSnapshot:
         return self._companion_presentation
@@ -404,6 +472,10 @@ class AppController(QObject):
         success = True
         try:
             self._apply_break_configuration_from_settings()
+            # Resume cadence progress saved before the last exit or crash.
+            load_checkpoint = getattr(self._break_reminder, "load_checkpoint", None)
+            if callable(load_checkpoint):
+                load_checkpoint()
             if self._focus_mode is not None:
                 self._focus_mode.set_dim_level(self._settings.focus_dim_level)
         except Exception as exc:
@@ -437,15 +509,38 @@ class AppController(QObject):
         return success
 
     def refresh_state(self, *_args, force: bool = False) -> AppState:
+        """Rebuild the snapshot; publication may wait for the event loop.
+
+        :attr:`state` is current as soon as this returns. With
+        ``coalesce_state_updates`` the signals fire once per event-loop
+        turn; :meth:`flush_state` publishes synchronously.
+        """
+
         if self._in_transaction and not force:
             return self._state
-        new_state = self._build_state()
-        if force or new_state != self._state:
-            self._state = new_state
-            self.state_changed.emit(new_state)
+        self._state = self._build_state()
+        if force or self._state is not self._published_state:
+            self._render_scheduler.mark_dirty(force=force)
         self.refresh_companion_presentation()
         return self._state
 
+    def flush_state(self) -> bool:
+        """Publish a pending snapshot now; False when none was pending."""
+        return self._render_scheduler.flush()
+
+    def _publish_state(self, force: bool) -> None:
+        state = self._state
+        changes = (
+            EVERYTHING if force else diff_states(self._published_state, state)
+        )
+        if not changes:
+            return
+        self._published_state = state
+        self._last_changes = changes
+        self.state_changed.emit(state)
+        self.state_changes.emit(state, changes)
+        self._state_subscriptions.publish(state, force=force)
+
     def refresh_companion_presentation(
         self,
         *_args,
@@ -566,6 +661,19 @@ class AppController(QObject):
     def set_dim_level(self, level: int, persist: bool = True) -> bool:
         return self._display_commands.set_dim_level(level, persist)
 
+    def set_monitor_target(
+        self,
+        monitor: str,
+        *,
+        temperature: int | None = None,
+        dim_level: int | None = None,
+    ) -> bool:
+        return self._display_commands.set_monitor_target(
+            monitor,
+            temperature=temperature,
+            dim_level=dim_level,
+        )
+
     def set_focus_dim_level(self, level: int) -> bool:
         return self._break_focus_commands.set_focus_dim_level(level)
 
@@ -609,6 +717,13 @@ class AppController(QObject):
     def set_break_countdown_display(self, mode: str) -> bool:
         return self._break_focus_commands.set_break_countdown_display(mode)
 
+    def set_break_tick_watcher(self, owner: str, watching: bool) -> None:
+        """Request per-second ``break_tick`` updates while ``owner`` is visible."""
+
+        set_watcher = getattr(self._break_reminder, "set_tick_watcher", None)
+        if callable(set_watcher):
+            set_watcher(owner, watching)
+
     def pause_break(self) -> bool:
         return self._break_focus_commands.pause_break()
 
@@ -649,6 +764,8 @@ class AppController(QObject):
         night_profile: str | None = None,
         sunrise_offset: int | None = None,
         sunset_offset: int | None = None,
+        ramp_minutes: int | None = None,
+        stages=None,
     ) -> bool:
         return self._automation_commands.set_schedule(
             enabled,
@@ -663,6 +780,8 @@ class AppController(QObject):
             night_profile=night_profile,
             sunrise_offset=sunrise_offset,
             sunset_offset=sunset_offset,
+            ramp_minutes=ramp_minutes,
+            stages=stages,
         )
 
     def undo_break_snooze(self) -> bool:
@@ -956,6 +1075,9 @@ class AppController(QObject):
     def _on_scheduled_profile_requested(self, profile: str) -> None:
         self._automation_commands.on_scheduled_profile_requested(profile)
 
+    def _on_scheduled_ramp_requested(self, step) -> None:
+        self._automation_commands.on_scheduled_ramp_requested(step)
+
     def _clear_next_schedule_pause(self) -> None:
         self._automation_commands.clear_next_schedule_pause()
 
@@ -1750,7 +1872,9 @@ class AppController(QObject):
         rollback: Callable[[], object] | None = None,
         persist_settings: bool = True,
     ) -> bool:
-        snapshot = self._snapshot_settings() if persist_settings else None
+        snapshot = self._begin_settings_changes() if persist_settings else None
+        joined = snapshot is _SETTINGS_JOINED
+        outer_transaction = self._in_transaction
         self._in_transaction = True
         try:
             operation()
@@ -1759,9 +1883,30 @@ class AppController(QObject):
                 if not result.succeeded:
                     raise RuntimeError(self._reconcile_error_message(result))
             if persist_settings:
-                self._sync_settings_checked()
+                self._commit_settings_changes(snapshot)
         except Exception as exc:
             rollback_errors: list[str] = []
+            if joined:
+                # The enclosing write set owns the touched keys: mark it failed
+                # so its commit rolls them all back, and undo only runtime
+                # side effects here.
+                fail_changes = getattr(self._settings, "fail_changes", None)
+                if callable(fail_changes):
+                    fail_changes()
+                if rollback is not None:
+                    try:
+                        rollback()
+                    except Exception as rollback_exc:
+                        rollback_errors.append(str(rollback_exc))
+                self._in_transaction = outer_transaction
+                self._fail(code, exc)
+                if rollback_errors:
+                    self._fail(
+                        f"{code}_rollback",
+                        "设置或效果回滚不完整：" + "; ".join(rollback_errors),
+                    )
+                self.refresh_state()
+                return False
             if persist_settings:
                 try:
                     self._restore_settings_snapshot(snapshot)
@@ -1796,7 +1941,7 @@ class AppController(QObject):
             # optimistically toggled themselves are restored in this event loop.
             self.refresh_state(force=True)
             return False
-        self._in_transaction = False
+        self._in_transaction = outer_transaction if joined else False
         self.refresh_state()
         return True
 
@@ -1957,6 +2102,25 @@ class AppController(QObject):
             for failure in result.failures
         ) or "运行时效果未能应用"
 
+    def _begin_settings_changes(self):
+        """Open a write-set journal, or take a full snapshot as a fallback.
+
+        Inside an already open write set the command joins it instead.
+        """
+
+        begin = getattr(self._settings, "begin_changes", None)
+        if callable(begin) and not getattr(self._settings, "read_only", False):
+            return _SETTINGS_WRITE_SET if begin() else _SETTINGS_JOINED
+        return self._snapshot_settings()
+
+    def _commit_settings_changes(self, snapshot) -> None:
+        if snapshot is _SETTINGS_JOINED:
+            return
+        if snapshot is _SETTINGS_WRITE_SET:
+            self._settings.commit_changes()
+            return
+        self._sync_settings_checked()
+
     def _snapshot_settings(self):
         snapshot = getattr(self._settings, "snapshot", None)
         if callable(snapshot):
@@ -1994,6 +2158,18 @@ class AppController(QObject):
         self,
         snapshot: dict[str, object],
     ) -> bool:
+        set_values = getattr(self._settings, "set_values", None)
+        if callable(set_values):
+            current = self._snapshot_settings() or {}
+            set_values(
+                {
+                    key: value
+                    for key, value in snapshot.items()
+                    if key not in current or current[key] != value
+                },
+                remove=[key for key in current if key not in snapshot],
+            )
+            return True
         store = getattr(self._settings, "_s", None)
         if store is None:
             return False
@@ -2016,6 +2192,9 @@ class AppController(QObject):
     def _restore_settings_snapshot(self, snapshot) -> None:
         if snapshot is None:
             return
+        if snapshot is _SETTINGS_WRITE_SET:
+            self._settings.rollback_changes()
+            return
         if isinstance(snapshot, _OwnedSettingsSnapshot):
             current = self._snapshot_settings() or {}
             snapshot = self._merge_owned_settings(current, snapshot)
@@ -2112,10 +2291,39 @@ class AppController(QObject):
         self,
         policy: EffectivePolicyState,
     ) -> None:
+        previous = self._effective_policy
         self._effective_policy = policy
+        reasons = policy.breaks.suppressed_by
+        if (
+            reasons
+            and policy.breaks.desired_enabled
+            and not (previous is not None and previous.breaks.suppressed_by)
+        ):
+            self._record_break_history("suppressed", reason=",".join(reasons))
         if not self._in_transaction:
             self.refresh_state()
 
+    @Slot(str, str, int)
+    def _on_break_history_event(
+        self,
+        event: str,
+        kind: str,
+        rest_seconds: int,
+    ) -> None:
+        self._record_break_history(event, kind, rest_seconds=rest_seconds)
+
+    def _record_break_history(
+        self,
+        event: str,
+        kind: str = "",
+        *,
+        reason: str = "",
+        rest_seconds: int = 0,
+    ) -> None:
+        record = getattr(self._break_history, "record", None)
+        if callable(record):
+            record(event, kind, reason, rest_seconds)
+
     @Slot(object)
     def _on_context_reconcile_completed(self, result) -> None:
         if isinstance(result, ReconcileResult):
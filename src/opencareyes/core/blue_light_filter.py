@@ -2,13 +2,24 @@
 
 import ctypes
 import logging
-from collections.abc import Callable
-
-from opencareyes.core.color_temp import kelvin_to_rgb
+import os
+import time
+from collections.abc import Callable, Mapping
+
+from opencareyes.core.color_temp import (
+    GammaRamp,
+    GammaRampTable,
+    build_gamma_ramp,
+)
 from opencareyes.core.display_capabilities import (
     AdvancedColorStatus,
     probe_advanced_color,
 )
+from opencareyes.core.gamma_baselines import (
+    GammaBaselines,
+    load_baselines,
+    save_baselines,
+)
 from opencareyes.core.monitor_manager import MonitorManager
 from opencareyes.platform.win32_api import (
     CreateDCW,
@@ -20,12 +31,63 @@ from opencareyes.platform.win32_api import (
 
 log = logging.getLogger(__name__)
 
-# Gamma ramp: 256 entries per channel (R, G, B) = 768 total unsigned shorts
-_RAMP_SIZE = 256
-_GammaArray = ctypes.c_ushort * (_RAMP_SIZE * 3)
+_GammaArray = GammaRamp
 _OutputIdentity = tuple[str, tuple[str, ...]]
 
 
+class DisplayOutputPool:
+    """Resolved display identities and open DCs kept between Gamma operations.
+
+    The pool is owned by the thread that performs Gamma work. Handles stay
+    open until ``invalidate`` runs after a display topology change, a native
+    failure or shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._outputs: tuple[tuple[_OutputIdentity, str], ...] | None = None
+        self._dcs: dict[_OutputIdentity, int] = {}
+        self._generation = 0
+
+    @property
+    def outputs(self) -> tuple[tuple[_OutputIdentity, str], ...] | None:
+        return self._outputs
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def open_count(self) -> int:
+        return len(self._dcs)
+
+    def store_outputs(self, outputs) -> None:
+        self._outputs = tuple(outputs)
+
+    def open(self, identity: _OutputIdentity, name: str):
+        """Return a cached DC for ``identity``, creating it on first use."""
+
+        dc = self._dcs.get(identity)
+        if dc:
+            return dc
+        dc = CreateDCW("DISPLAY", name, None, None)
+        if dc:
+            self._dcs[identity] = dc
+        return dc
+
+    def invalidate(self) -> None:
+        """Release every pooled DC and forget resolved identities."""
+
+        dcs = tuple(self._dcs.values())
+        self._dcs.clear()
+        self._outputs = None
+        self._generation += 1
+        for dc in dcs:
+            try:
+                DeleteDC(dc)
+            except Exception:
+                log.exception("Failed to release pooled display DC")
+
+
 class BlueLightFilter:
     """Adjusts screen color temperature by manipulating the display gamma ramp."""
 
@@ -36,13 +98,33 @@ class BlueLightFilter:
         identity_resolver: Callable[[str], tuple[str, ...]] | None = None,
         *,
         connect_screen_events: bool = True,
+        ramp_table: GammaRampTable | None = None,
+        verify_interval: float = 30.0,
+        clock: Callable[[], float] | None = None,
+        baseline_path: str | os.PathLike[str] | None = None,
     ):
         self._monitor_manager = monitor_manager or MonitorManager()
         self._hdr_probe = hdr_probe or probe_advanced_color
         self._identity_resolver = (
             identity_resolver or get_display_source_identity
         )
-        self._original_ramps: dict[_OutputIdentity, _GammaArray] = {}
+        self._ramp_table = ramp_table or GammaRampTable()
+        self._original_ramps = GammaBaselines()
+        # Baselines persisted by a previous run that never restored them.
+        self._baseline_path = baseline_path
+        self._recovered = (
+            load_baselines(baseline_path)
+            if baseline_path is not None
+            else GammaBaselines()
+        )
+        self._persisted: dict[_OutputIdentity, bytes] = dict(self._recovered)
+        # Last ramp read back from each output and when it was verified.
+        self._verified_ramps: dict[_OutputIdentity, tuple[bytes, float]] = {}
+        self._verify_interval = max(0.0, float(verify_interval))
+        self._clock = clock or time.monotonic
+        self._output_pool: DisplayOutputPool | None = None
+        # Per-output Kelvin keyed by casefolded source name or target identity.
+        self._output_temperatures: dict[str, int] = {}
         self._current_temp: int = 6500
         self._enabled: bool = False
         self._capability = AdvancedColorStatus()
@@ -77,7 +159,7 @@ class BlueLightFilter:
                     self._last_error_message = (
                         "无法读取原始显示色彩，未应用色温。"
                     )
-                self._original_ramps.clear()
+                self._set_baselines(GammaBaselines())
                 return False
         applied = self._apply_temperature_after_probe(temperature)
         self._enabled = applied
@@ -105,19 +187,77 @@ class BlueLightFilter:
         log.info("Blue light filter disabled")
         return restored or self._last_error_code == "hdr_active"
 
-    def set_temperature(self, kelvin: int) -> bool:
-        """Apply a color temperature to all monitors."""
+    def set_temperature(self, kelvin: int, *, force_verify: bool = False) -> bool:
+        """Apply a color temperature to all monitors.
+
+        Outputs whose last verified ramp already matches are skipped until
+        the verification interval elapses; the HDR probe still runs first.
+        ``force_verify`` rewrites and reads back every output regardless.
+        """
         if self.probe_capability().active:
             self._suppress_for_hdr()
             return False
-        return self._apply_temperature_after_probe(kelvin)
+        if not force_verify and self._outputs_hold(kelvin):
+            self._current_temp = kelvin
+            return True
+        return self._apply_temperature_after_probe(
+            kelvin,
+            force_verify=force_verify,
+        )
+
+    def set_output_temperatures(
+        self,
+        targets: Mapping[str, int],
+        *,
+        apply: bool = True,
+    ) -> bool:
+        """Pin individual outputs to their own color temperature.
+
+        Keys match an output's GDI source name or any of its display target
+        identities, case-insensitively; other outputs follow the shared
+        temperature. With ``apply`` the active filter is rewritten at once,
+        touching only outputs whose ramp actually changes.
+        """
+        normalized = {
+            str(key).strip().casefold(): self._ramp_table.quantize(int(kelvin))
+            for key, kelvin in targets.items()
+            if str(key).strip()
+        }
+        if normalized == self._output_temperatures:
+            return True
+        self._output_temperatures = normalized
+        if not apply or not self._enabled:
+            return True
+        return self.set_temperature(self._current_temp)
+
+    def invalidate_verification(self) -> None:
+        """Forget verified ramps so the next apply writes every output."""
 
-    def _apply_temperature_after_probe(self, kelvin: int) -> bool:
+        self._verified_ramps.clear()
+
+    def attach_output_pool(self, pool: DisplayOutputPool | None) -> None:
+        """Reuse resolved outputs and open DCs between operations.
+
+        Only attach a pool when every call into this filter happens on the
+        same thread, as with the serialized Gamma worker.
+        """
+
+        if self._output_pool is not None and self._output_pool is not pool:
+            self._output_pool.invalidate()
+        self._output_pool = pool
+
+    def _apply_temperature_after_probe(
+        self,
+        kelvin: int,
+        *,
+        force_verify: bool = False,
+    ) -> bool:
         """Write Gamma after the caller has performed one fresh HDR probe."""
 
-        r, g, b = kelvin_to_rgb(kelvin)
-        ramp = self._build_gamma_ramp(r, g, b)
-        applied = self._apply_ramp(ramp)
+        applied = self._apply_ramp(
+            self._ramp_table.ramp(kelvin),
+            force_verify=force_verify,
+        )
         if applied:
             self._current_temp = kelvin
             self._last_error_code = ""
@@ -140,7 +280,9 @@ class BlueLightFilter:
 
     def refresh_screens(self, *_) -> bool:
         """Capture newly attached displays and reapply the active filter."""
-        self._monitor_manager.refresh()
+        self._monitor_manager.invalidate()
+        self.invalidate_verification()
+        self._invalidate_outputs()
         capability = self.probe_capability()
         if capability.active:
             self._suppress_for_hdr()
@@ -149,6 +291,8 @@ class BlueLightFilter:
             self._last_error_code = ""
             self._last_error_message = ""
         if not self._enabled:
+            if self._recovered:
+                return self._recover_persisted_ramps()
             return True
         if not self._capture_original_ramps(overwrite=False):
             restored = self._restore_original_ramps()
@@ -170,7 +314,8 @@ class BlueLightFilter:
 
         self._enabled = False
         self._current_temp = 6500
-        self._original_ramps.clear()
+        self._set_baselines(GammaBaselines())
+        self._verified_ramps.clear()
         self._last_error_code = "hdr_active"
         self._last_error_message = "HDR 已开启，色温调节已安全暂停。"
 
@@ -215,40 +360,47 @@ class BlueLightFilter:
     def last_error_message(self) -> str:
         return self._last_error_message
 
+    @property
+    def recovery_pending(self) -> bool:
+        """Whether a previous run left unrestored original ramps on disk."""
+        return bool(self._recovered)
+
+    @property
+    def ramp_table(self) -> GammaRampTable:
+        return self._ramp_table
+
+    @property
+    def output_temperatures(self) -> dict[str, int]:
+        return dict(self._output_temperatures)
+
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
     @staticmethod
     def _build_gamma_ramp(r: float, g: float, b: float) -> _GammaArray:
         """Build a 768-entry gamma ramp array from RGB multipliers."""
-        ramp = _GammaArray()
-        for i in range(_RAMP_SIZE):
-            ramp[i] = min(65535, int(i * r * 257))
-            ramp[i + _RAMP_SIZE] = min(65535, int(i * g * 257))
-            ramp[i + _RAMP_SIZE * 2] = min(65535, int(i * b * 257))
-        return ramp
+        return build_gamma_ramp(r, g, b)
 
     def _capture_original_ramps(self, overwrite: bool = True) -> bool:
         """Capture each display's gamma ramp before changing it."""
         entries = self._open_display_dcs()
         if not entries:
             return False
-        updated = dict(self._original_ramps)
+        updated = self._original_ramps.copy()
         success = True
         for identity, dc, release_kind in entries:
             try:
-                matched = self._matching_baseline(identity, updated)
-                if not overwrite and matched is not None:
-                    if matched != identity:
-                        updated[identity] = updated.pop(matched)
+                if not overwrite and updated.migrate(identity):
+                    continue
+                # After a crash the output still shows the old tint, so the
+                # persisted ramp is the trustworthy original.
+                recovered = self._recovered.match(identity)
+                if recovered is not None:
+                    updated[identity] = self._recovered[recovered]
                     continue
                 ramp = _GammaArray()
                 if GetDeviceGammaRamp(dc, ctypes.byref(ramp)):
-                    source = identity[0]
-                    for previous in tuple(updated):
-                        if previous[0] == source:
-                            updated.pop(previous)
-                    updated[identity] = ramp
+                    updated[identity] = bytes(ramp)
                 else:
                     log.warning(
                         "GetDeviceGammaRamp failed for %s",
@@ -258,26 +410,27 @@ class BlueLightFilter:
             finally:
                 self._release_dc(dc, release_kind)
         if success:
-            self._original_ramps = updated
+            self._recovered = GammaBaselines()
+            self._set_baselines(updated)
+        else:
+            self._invalidate_outputs()
         return success
 
     def _restore_original_ramps(self) -> bool:
         """Restore original ramps for all displays that are still attached."""
+        self._verified_ramps.clear()
         entries = self._open_display_dcs()
         if not entries:
             return False
-        migrated = dict(self._original_ramps)
+        migrated = self._original_ramps.copy()
         for identity, _dc, _release_kind in entries:
-            matched = self._matching_baseline(identity, migrated)
-            if matched is None:
+            if not migrated.migrate(identity):
                 self._release_entries(entries)
                 self._last_error_code = "gamma_baseline_unavailable"
                 self._last_error_message = (
                     "显示器连接已变化且缺少可信原始色彩快照，未执行色温操作。"
                 )
                 return False
-            if matched != identity:
-                migrated[identity] = migrated.pop(matched)
         if self.probe_capability().active:
             self._release_entries(entries)
             self._suppress_for_hdr()
@@ -286,7 +439,7 @@ class BlueLightFilter:
         success = True
         for identity, dc, release_kind in entries:
             try:
-                ramp = migrated[identity]
+                ramp = migrated.ramp(identity)
                 if not SetDeviceGammaRamp(dc, ctypes.byref(ramp)):
                     log.warning(
                         "SetDeviceGammaRamp restore failed for %s",
@@ -296,40 +449,60 @@ class BlueLightFilter:
             finally:
                 self._release_dc(dc, release_kind)
         if success:
-            self._original_ramps.clear()
+            self._set_baselines(GammaBaselines())
         else:
-            self._original_ramps = migrated
+            self._set_baselines(migrated)
+            self._invalidate_outputs()
         return success
 
-    def _apply_ramp(self, ramp: _GammaArray) -> bool:
+    def _apply_ramp(
+        self,
+        ramp: _GammaArray,
+        *,
+        force_verify: bool = False,
+    ) -> bool:
         """Apply a gamma ramp to every attached display."""
-        entries = self._open_display_dcs()
-        if not entries:
+        resolved = self._resolve_outputs()
+        if not resolved:
             return False
 
-        migrated = dict(self._original_ramps)
-        for identity, _dc, _release_kind in entries:
-            matched = self._matching_baseline(identity, migrated)
-            if matched is None:
-                for _unused, dc, release_kind in entries:
-                    self._release_dc(dc, release_kind)
+        migrated = self._original_ramps.copy()
+        for identity, _name in resolved:
+            if not migrated.migrate(identity):
                 self._last_error_code = "gamma_baseline_unavailable"
                 self._last_error_message = (
                     "显示器连接已变化且缺少可信原始色彩快照，未执行色温操作。"
                 )
                 return False
-            if matched != identity:
-                migrated[identity] = migrated.pop(matched)
-        self._original_ramps = migrated
+        self._set_baselines(migrated)
+
+        now = self._clock()
+        shared = (ramp, bytes(ramp))
+        targets = {
+            identity: self._output_ramp(identity, shared)
+            for identity, _name in resolved
+        }
+        pending = [
+            output
+            for output in resolved
+            if force_verify
+            or not self._ramp_verified(output[0], targets[output[0]][1], now)
+        ]
+        if not pending:
+            return True
         if self.probe_capability().active:
-            self._release_entries(entries)
             self._suppress_for_hdr()
             return False
+        entries = self._open_outputs(pending)
+        if not entries:
+            return False
 
         success = True
         for identity, dc, release_kind in entries:
+            self._verified_ramps.pop(identity, None)
+            output_ramp, expected = targets[identity]
             try:
-                if not SetDeviceGammaRamp(dc, ctypes.byref(ramp)):
+                if not SetDeviceGammaRamp(dc, ctypes.byref(output_ramp)):
                     log.warning(
                         "SetDeviceGammaRamp failed for %s",
                         identity[0],
@@ -344,20 +517,129 @@ class BlueLightFilter:
                     )
                     success = False
                     continue
-                if bytes(readback) != bytes(ramp):
+                if bytes(readback) != expected:
                     log.warning(
                         "Gamma ramp verification mismatch for %s",
                         identity[0],
                     )
                     success = False
+                    continue
+                self._verified_ramps[identity] = (expected, now)
             finally:
                 self._release_dc(dc, release_kind)
 
-        if not success and not self._restore_original_ramps():
-            if self._last_error_code != "hdr_active":
-                self._set_rollback_failed()
+        if not success:
+            self._invalidate_outputs()
+            if not self._restore_original_ramps():
+                if self._last_error_code != "hdr_active":
+                    self._set_rollback_failed()
         return success
 
+    def _output_ramp(
+        self,
+        identity: _OutputIdentity,
+        shared: tuple[_GammaArray, bytes],
+    ) -> tuple[_GammaArray, bytes]:
+        """Return the ramp and its bytes that ``identity`` should hold."""
+
+        overrides = self._output_temperatures
+        if overrides:
+            for key in (identity[0], *identity[1]):
+                kelvin = overrides.get(key)
+                if kelvin is not None:
+                    ramp = self._ramp_table.ramp(kelvin)
+                    return ramp, bytes(ramp)
+        return shared
+
+    def _outputs_hold(self, kelvin: int) -> bool:
+        """Whether every output's ledger entry still vouches for ``kelvin``."""
+
+        if not self._verified_ramps:
+            return False
+        resolved = self._resolve_outputs()
+        if not resolved:
+            return False
+        ramp = self._ramp_table.ramp(kelvin)
+        shared = (ramp, bytes(ramp))
+        now = self._clock()
+        return all(
+            self._ramp_verified(
+                identity,
+                self._output_ramp(identity, shared)[1],
+                now,
+            )
+            for identity, _name in resolved
+        )
+
+    def _ramp_verified(
+        self,
+        identity: _OutputIdentity,
+        expected: bytes,
+        now: float,
+    ) -> bool:
+        entry = self._verified_ramps.get(identity)
+        return (
+            entry is not None
+            and entry[0] == expected
+            and now - entry[1] < self._verify_interval
+        )
+
+    def _recover_persisted_ramps(self) -> bool:
+        """Write back originals a crashed run left tinted on attached outputs."""
+
+        entries = self._open_display_dcs()
+        if not entries:
+            return False
+        pending = self._recovered.copy()
+        success = True
+        for identity, dc, release_kind in entries:
+            try:
+                matched = pending.match(identity)
+                if matched is None:
+                    continue
+                ramp = pending.ramp(matched)
+                if SetDeviceGammaRamp(dc, ctypes.byref(ramp)):
+                    del pending[matched]
+                else:
+                    log.warning(
+                        "SetDeviceGammaRamp recovery failed for %s",
+                        identity[0],
+                    )
+                    success = False
+            finally:
+                self._release_dc(dc, release_kind)
+        if success:
+            # Outputs not attached now have no tint left to undo from here.
+            self._recovered = GammaBaselines()
+            self._last_error_code = ""
+            self._last_error_message = ""
+            log.info("Restored Gamma ramps left by a previous session")
+        else:
+            self._recovered = pending
+            self._invalidate_outputs()
+            self._set_rollback_failed()
+        self._persist_baselines()
+        return success
+
+    def _set_baselines(self, baselines: GammaBaselines) -> None:
+        self._original_ramps = baselines
+        self._persist_baselines()
+
+    def _persist_baselines(self) -> None:
+        """Keep the on-disk baselines equal to what a crash would leave tinted."""
+
+        if self._baseline_path is None:
+            return
+        current = self._original_ramps or self._recovered
+        if dict(current) == self._persisted:
+            return
+        try:
+            save_baselines(self._baseline_path, current)
+        except OSError:
+            log.exception("Failed to persist original Gamma ramps")
+            return
+        self._persisted = dict(current)
+
     def _set_rollback_failed(self) -> None:
         """Expose an incomplete rollback while retaining its retry baseline."""
 
@@ -369,6 +651,17 @@ class BlueLightFilter:
     def _open_display_dcs(self):
         """Open every display only after all stable identities are known."""
 
+        resolved = self._resolve_outputs()
+        if not resolved:
+            return []
+        return self._open_outputs(resolved)
+
+    def _resolve_outputs(self) -> list[tuple[_OutputIdentity, str]]:
+        """Resolve a stable identity for every attached display source."""
+
+        pool = self._output_pool
+        if pool is not None and pool.outputs is not None:
+            return list(pool.outputs)
         try:
             monitors = self._monitor_manager.get_monitors()
         except Exception:
@@ -406,37 +699,34 @@ class BlueLightFilter:
             log.exception("Failed to resolve stable display identities")
             self._set_identity_unavailable()
             return []
+        if pool is not None:
+            pool.store_outputs(resolved)
+        return resolved
 
+    def _open_outputs(self, resolved: list[tuple[_OutputIdentity, str]]):
+        """Open a DC for each resolved output, or none if any open fails."""
+
+        pool = self._output_pool
         entries = []
         for identity, name in resolved:
-            dc = CreateDCW("DISPLAY", name, None, None)
+            if pool is not None:
+                dc = pool.open(identity, name)
+                release_kind = "pooled"
+            else:
+                dc = CreateDCW("DISPLAY", name, None, None)
+                release_kind = "delete"
             if not dc:
-                for _identity, opened, release_kind in entries:
-                    self._release_dc(opened, release_kind)
+                for _identity, opened, opened_kind in entries:
+                    self._release_dc(opened, opened_kind)
+                self._invalidate_outputs()
                 self._last_error_code = "gamma_open_failed"
                 self._last_error_message = (
                     "无法打开全部活动显示输出，未执行屏幕色温操作。"
                 )
                 return []
-            entries.append((identity, dc, "delete"))
+            entries.append((identity, dc, release_kind))
         return entries
 
-    @staticmethod
-    def _matching_baseline(
-        identity: _OutputIdentity,
-        baselines: dict[_OutputIdentity, _GammaArray],
-    ) -> _OutputIdentity | None:
-        if identity in baselines:
-            return identity
-        source, target_ids = identity
-        targets = set(target_ids)
-        matches = [
-            previous
-            for previous in baselines
-            if previous[0] == source and targets.intersection(previous[1])
-        ]
-        return matches[0] if len(matches) == 1 else None
-
     def _set_identity_unavailable(self) -> None:
         self._last_error_code = "display_identity_unavailable"
         self._last_error_message = (
@@ -447,7 +737,12 @@ class BlueLightFilter:
         for _identity, dc, release_kind in entries:
             self._release_dc(dc, release_kind)
 
+    def _invalidate_outputs(self) -> None:
+        if self._output_pool is not None:
+            self._output_pool.invalidate()
+
     @staticmethod
     def _release_dc(dc, release_kind: str):
-        del release_kind
+        if release_kind == "pooled":
+            return
         DeleteDC(dc)
@@ -0,0 +1,132 @@
+"""Small persisted record of break cadence progress across restarts."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+log = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+_PHASES = frozenset(("working", "prompting", "snoozed", "resting"))
+_KINDS = frozenset(("", "short", "long"))
+
+
+@dataclass(frozen=True, slots=True)
+class BreakCheckpoint:
+    """Cadence progress captured at ``saved_at`` (wall) / ``saved_monotonic``.
+
+    ``deadline_remaining`` is the rest or snooze time left in the resting and
+    snoozed phases. The cadence fields identify the configuration the
+    progress belongs to, so a changed cadence starts fresh.
+    """
+
+    phase: str
+    kind: str
+    short_remaining: float
+    long_remaining: float
+    deadline_remaining: float
+    short_interval: int
+    long_enabled: bool
+    long_interval: int
+    saved_at: float
+    saved_monotonic: float
+
+    def __post_init__(self) -> None:
+        if self.phase not in _PHASES:
+            raise ValueError(f"Unsupported break checkpoint phase: {self.phase}")
+        if self.kind not in _KINDS:
+            raise ValueError(f"Unsupported break checkpoint kind: {self.kind}")
+        for name in ("short_remaining", "long_remaining", "deadline_remaining"):
+            value = float(getattr(self, name))
+            if value < 0:
+                raise ValueError(f"{name} cannot be negative")
+            object.__setattr__(self, name, value)
+
+    @property
+    def progress(self) -> tuple[object, ...]:
+        """Whole-second progress, used to skip writes that change nothing."""
+
+        return (
+            self.phase,
+            self.kind,
+            round(self.short_remaining),
+            round(self.long_remaining),
+            round(self.deadline_remaining),
+            self.short_interval,
+            self.long_enabled,
+            self.long_interval,
+        )
+
+    def offline_seconds(self, wall_now: float, monotonic_now: float) -> float:
+        """Time elapsed since the checkpoint, including sleep and reboots.
+
+        Wall time is authoritative because the monotonic clock restarts with
+        the machine and may exclude sleep. Monotonic time is only used when the
+        wall clock was set back since the checkpoint was written.
+        """
+
+        wall = wall_now - self.saved_at
+        if wall >= 0:
+            return wall
+        return max(0.0, monotonic_now - self.saved_monotonic)
+
+
+def load_checkpoint(path: str | os.PathLike[str]) -> BreakCheckpoint | None:
+    """Read a persisted checkpoint; a missing or damaged file yields none."""
+
+    path = Path(path)
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        log.warning("Break checkpoint could not be read", exc_info=True)
+        return None
+    if not isinstance(raw, dict) or raw.get("schema_version") != SCHEMA_VERSION:
+        return None
+    try:
+        return BreakCheckpoint(
+            phase=str(raw["phase"]),
+            kind=str(raw["kind"]),
+            short_remaining=float(raw["short_remaining"]),
+            long_remaining=float(raw["long_remaining"]),
+            deadline_remaining=float(raw["deadline_remaining"]),
+            short_interval=int(raw["short_interval"]),
+            long_enabled=bool(raw["long_enabled"]),
+            long_interval=int(raw["long_interval"]),
+            saved_at=float(raw["saved_at"]),
+            saved_monotonic=float(raw["saved_monotonic"]),
+        )
+    except (KeyError, TypeError, ValueError):
+        log.warning("Ignoring a damaged break checkpoint")
+        return None
+
+
+def save_checkpoint(
+    path: str | os.PathLike[str],
+    checkpoint: BreakCheckpoint | None,
+) -> None:
+    """Atomically persist ``checkpoint``; ``None`` removes the file."""
+
+    path = Path(path)
+    if checkpoint is None:
+        path.unlink(missing_ok=True)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"schema_version": SCHEMA_VERSION, **asdict(checkpoint)}
+    fd, temporary_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    temporary = Path(temporary_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+        os.replace(temporary, path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+        raise
@@ -4,12 +4,21 @@ from __future__ import annotations
 
 import logging
 import math
+import os
 import time
 from collections.abc import Callable
 from datetime import datetime, timedelta
+from pathlib import Path
 
 from PySide6.QtCore import QObject, Qt, QTimer, Signal
 
+from opencareyes.core.break_checkpoint import (
+    BreakCheckpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from opencareyes.domain.activity import ActivityAccumulator
+
 log = logging.getLogger(__name__)
 
 # (short interval, short duration, long enabled, long interval, long duration)
@@ -29,6 +38,19 @@ class BreakReminder(QObject):
     and snooze deadlines all use a monotonic clock, so event-loop stalls do not
     introduce drift. ``work_duration``/``break_duration`` and the legacy
     signals remain available for v0.3 integrations.
+
+    With ``tick_on_demand`` the timer only wakes at the next semantic
+    boundary (due, prompt escalation, snooze or rest end) and emits
+    per-second ticks while a countdown surface registered through
+    :meth:`set_tick_watcher` is visible.
+
+    With an ``activity`` accumulator fed by :meth:`observe_context`, working
+    time is the input-credited screen time instead of wall time; while no
+    samples arrive the cadence falls back to wall time.
+
+    With ``checkpoint_path`` cadence progress is written at most every
+    ``CHECKPOINT_INTERVAL_SECONDS`` and restored by the next :meth:`start`
+    after :meth:`load_checkpoint`, so restarts keep accumulated work.
     """
 
     break_started = Signal()
@@ -37,17 +59,30 @@ class BreakReminder(QObject):
     prompt_changed = Signal(str, str)  # (kind, none | gentle | prominent)
     tick = Signal(int, int)  # legacy/current surface: (remaining, total)
     cadence_tick = Signal(int, int)  # (short_remaining, long_remaining)
+    # (started | completed | skipped | snoozed, kind, rested seconds)
+    history_event = Signal(str, str, int)
     state_changed = Signal()
 
     PROMPT_ESCALATION_SECONDS = 60
+    CHECKPOINT_INTERVAL_SECONDS = 60
 
     def __init__(
         self,
         parent: QObject | None = None,
         clock: Callable[[], float] | None = None,
+        *,
+        tick_on_demand: bool = False,
+        activity: ActivityAccumulator | None = None,
+        checkpoint_path: str | os.PathLike[str] | None = None,
+        wall_clock: Callable[[], float] | None = None,
     ):
         super().__init__(parent)
         self._clock = clock or time.monotonic
+        self._wall_clock = wall_clock or time.time
+        self._tick_on_demand = bool(tick_on_demand)
+        self._tick_watchers: set[str] = set()
+        self._activity = activity
+        self._active_mark = 0.0
 
         self._mode = "pomodoro"
         self._short_interval = 25 * 60
@@ -88,6 +123,19 @@ class BreakReminder(QObject):
         self._timer.timeout.connect(self._on_tick)
         self._tick_timer = self._timer
 
+        self._checkpoint_path = (
+            Path(checkpoint_path) if checkpoint_path is not None else None
+        )
+        self._pending_checkpoint: BreakCheckpoint | None = None
+        self._written_progress: tuple[object, ...] | None = None
+        self._checkpoint_timer = QTimer(self)
+        self._checkpoint_timer.setSingleShot(True)
+        self._checkpoint_timer.setTimerType(Qt.VeryCoarseTimer)
+        self._checkpoint_timer.setInterval(self.CHECKPOINT_INTERVAL_SECONDS * 1000)
+        self._checkpoint_timer.timeout.connect(self.flush_checkpoint)
+        if self._checkpoint_path is not None:
+            self.state_changed.connect(self._schedule_checkpoint)
+
     # ---- Compatibility and v0.4 state ---------------------------------
 
     @property
@@ -225,6 +273,16 @@ class BreakReminder(QObject):
     def total(self) -> int:
         return self._total
 
+    @property
+    def activity(self) -> ActivityAccumulator | None:
+        return self._activity
+
+    @property
+    def ticking(self) -> bool:
+        """Whether the timer emits per-second ticks instead of boundary wake-ups."""
+
+        return not self._tick_on_demand or bool(self._tick_watchers)
+
     @property
     def deadline(self) -> float | None:
         """Current monotonic deadline, mainly useful to diagnostics/tests."""
@@ -234,7 +292,11 @@ class BreakReminder(QObject):
     # ---- Lifecycle ------------------------------------------------------
 
     def start(self) -> None:
-        """Start (or restart) with complete short and long work cycles."""
+        """Start (or restart) with complete short and long work cycles.
+
+        A checkpoint passed to :meth:`restore_checkpoint` is consumed instead,
+        resuming the saved phase with offline time credited as rest.
+        """
 
         self._enabled = True
         self._paused = False
@@ -243,8 +305,10 @@ class BreakReminder(QObject):
         self._clear_due_state()
         self._is_on_break = False
         self._active_break_kind = ""
-        self._reset_both_cycles()
-        self._begin_working()
+        checkpoint, self._pending_checkpoint = self._pending_checkpoint, None
+        if checkpoint is None or not self._resume_checkpoint(checkpoint):
+            self._reset_both_cycles()
+            self._begin_working()
         log.info(
             "Break reminder started (mode=%s, short=%ds/%ds, long=%s)",
             self._mode,
@@ -270,11 +334,14 @@ class BreakReminder(QObject):
         self._total = 0
         self._deadline = None
         self._last_active_at = None
+        self._pending_checkpoint = None
         if was_on_break:
             self.break_ended.emit()
         if had_prompt:
             self.prompt_changed.emit("", "none")
         self.state_changed.emit()
+        self._checkpoint_timer.stop()
+        self.flush_checkpoint()
         log.info("Break reminder stopped")
 
     def pause(self) -> None:
@@ -320,7 +387,7 @@ class BreakReminder(QObject):
         now = self._clock()
         self._paused = False
         if self._paused_from == "working":
-            self._last_active_at = now
+            self._start_active_span(now)
             self._deadline = now + max(0.0, self._short_remaining)
         elif self._paused_from == "resting":
             self._deadline = now + max(0, self._remaining)
@@ -332,7 +399,7 @@ class BreakReminder(QObject):
             )
         elif self._paused_from == "prompting":
             self._prompt_started_at = now - self._prompt_elapsed
-        self._timer.start()
+        self._arm_timer()
         self.state_changed.emit()
         log.info("Break reminder resumed (%s)", self._paused_from)
 
@@ -350,11 +417,164 @@ class BreakReminder(QObject):
         else:
             self.state_changed.emit()
 
+    # ---- Checkpoints ----------------------------------------------------
+
+    def checkpoint(self) -> BreakCheckpoint | None:
+        """Capture current cadence progress; ``None`` while stopped."""
+
+        if not self._enabled and not self._suspended:
+            return None
+        now = self._clock()
+        phase = self._paused_from if self._paused else self.phase
+        short = self._short_remaining
+        long = self._long_remaining if self._long_enabled else 0.0
+        deadline_remaining = 0.0
+        if phase == "working" and not self._paused:
+            elapsed = self._active_elapsed(now)
+            short = max(0.0, short - elapsed)
+            if self._long_enabled:
+                long = max(0.0, long - elapsed)
+        elif phase in {"resting", "snoozed"}:
+            if self._paused or self._deadline is None:
+                deadline_remaining = float(self._remaining)
+            else:
+                deadline_remaining = max(0.0, self._deadline - now)
+        return BreakCheckpoint(
+            phase=phase,
+            kind=self._active_break_kind or self._due_kind,
+            short_remaining=short,
+            long_remaining=long,
+            deadline_remaining=deadline_remaining,
+            short_interval=self._short_interval,
+            long_enabled=self._long_enabled,
+            long_interval=self._long_interval,
+            saved_at=self._wall_clock(),
+            saved_monotonic=now,
+        )
+
+    def restore_checkpoint(self, checkpoint: BreakCheckpoint | None) -> bool:
+        """Resume ``checkpoint`` on the next :meth:`start` instead of resetting."""
+
+        if self._enabled or self._suspended:
+            return False
+        self._pending_checkpoint = checkpoint
+        return checkpoint is not None
+
+    def load_checkpoint(self) -> bool:
+        """Read the persisted checkpoint, if any, for the next :meth:`start`."""
+
+        if self._checkpoint_path is None:
+            return False
+        checkpoint = load_checkpoint(self._checkpoint_path)
+        if checkpoint is not None:
+            self._written_progress = checkpoint.progress
+        return self.restore_checkpoint(checkpoint)
+
+    def flush_checkpoint(self) -> None:
+        """Write the current checkpoint now if its progress changed."""
+
+        if self._checkpoint_path is None:
+            return
+        if self._pending_checkpoint is not None:
+            # Not started yet; the loaded checkpoint is still authoritative.
+            return
+        checkpoint = self.checkpoint()
+        progress = checkpoint.progress if checkpoint is not None else None
+        if progress != self._written_progress:
+            try:
+                save_checkpoint(self._checkpoint_path, checkpoint)
+            except OSError:
+                log.exception("Failed to persist the break checkpoint")
+            else:
+                self._written_progress = progress
+        if self._enabled and not self._paused:
+            # Working time keeps moving without state changes.
+            self._schedule_checkpoint()
+
+    def _schedule_checkpoint(self) -> None:
+        if not self._checkpoint_timer.isActive():
+            self._checkpoint_timer.start()
+
+    def _resume_checkpoint(self, checkpoint: BreakCheckpoint) -> bool:
+        if (
+            checkpoint.short_interval != self._short_interval
+            or checkpoint.long_enabled != self._long_enabled
+            or checkpoint.long_interval != self._long_interval
+        ):
+            log.info("Break cadence changed since the checkpoint; starting fresh")
+            return False
+        now = self._clock()
+        offline = checkpoint.offline_seconds(self._wall_clock(), now)
+        kind = checkpoint.kind or "short"
+        self._short_remaining = min(
+            checkpoint.short_remaining, float(self._short_interval)
+        )
+        self._long_remaining = (
+            min(checkpoint.long_remaining, float(self._long_interval))
+            if self._long_enabled
+            else 0.0
+        )
+        phase = checkpoint.phase
+        rested = offline
+        if phase == "resting":
+            left = checkpoint.deadline_remaining - offline
+            if left > 0:
+                self._due_kind = kind
+                self._begin_break(record=False)
+                self._deadline = now + left
+                self._remaining = self._display_seconds(left)
+                self._arm_timer()
+                return True
+            # The break ran out while the application was closed.
+            rested = max(
+                offline,
+                self._long_duration if kind == "long" else self._short_duration,
+            )
+        # Time away from the computer counts as rest toward each cadence.
+        if self._long_enabled and rested >= self._long_duration:
+            self._reset_both_cycles()
+            phase = "working"
+        elif rested >= self._short_duration and (
+            kind == "short" or phase == "working" or phase == "resting"
+        ):
+            self._short_remaining = float(self._short_interval)
+            if kind == "short":
+                phase = "working"
+        if phase == "resting":
+            phase = "working"
+        left = checkpoint.deadline_remaining - offline
+        if phase == "snoozed" and left > 0:
+            self._due_kind = kind
+            self._snooze_deadline = now + left
+            self._deadline = self._snooze_deadline
+            self._snoozed_until = datetime.now().astimezone() + timedelta(
+                seconds=left
+            )
+            self._remaining = self._display_seconds(left)
+            self._total = self._remaining
+            self._last_active_at = None
+            self._arm_timer()
+            self.prompt_changed.emit(kind, "none")
+            self.state_changed.emit()
+        elif phase in {"snoozed", "prompting"}:
+            self._enter_due(kind)
+            if not self._timer.isActive():
+                self._arm_timer()
+        else:
+            self._begin_working()
+        log.info(
+            "Break cadence restored (%s, %.0fs offline)", checkpoint.phase, offline
+        )
+        return True
+
     # ---- User actions ---------------------------------------------------
 
     def start_due_break(self) -> bool:
         """Start the due rest countdown after a progressive prompt."""
 
+        return self._begin_break()
+
+    def _begin_break(self, *, record: bool = True) -> bool:
         if not self._enabled or not self._due_kind:
             return False
         kind = self._due_kind
@@ -371,9 +591,11 @@ class BreakReminder(QObject):
         now = self._clock()
         self._deadline = now + duration
         self._last_active_at = None
-        self._timer.start()
+        self._arm_timer()
         self.prompt_changed.emit("", "none")
         self.break_started.emit()
+        if record:
+            self.history_event.emit("started", kind, 0)
         self.state_changed.emit()
         return True
 
@@ -400,6 +622,7 @@ class BreakReminder(QObject):
 
         kind = self._active_break_kind or self._due_kind
         if kind:
+            self.history_event.emit("snoozed", kind, self._rested_seconds())
             if self._is_on_break:
                 self._is_on_break = False
                 self._active_break_kind = ""
@@ -415,7 +638,7 @@ class BreakReminder(QObject):
             )
             self._remaining = seconds
             self._total = seconds
-            self._timer.start()
+            self._arm_timer()
             self.prompt_changed.emit(kind, "none")
         elif self._paused:
             self._short_remaining += seconds
@@ -427,8 +650,9 @@ class BreakReminder(QObject):
             self._remaining = self._display_seconds(self._short_remaining)
             self._total = max(self._total, self._remaining)
             now = self._clock()
-            self._last_active_at = now
+            self._start_active_span(now)
             self._deadline = now + self._short_remaining
+            self._arm_timer()
         self._emit_ticks()
         self.state_changed.emit()
         log.info("Break reminder snoozed for %ds", seconds)
@@ -455,7 +679,7 @@ class BreakReminder(QObject):
         self._prompt_stage = "gentle"
         self._prompt_elapsed = 0.0
         self._prompt_started_at = self._clock()
-        self._timer.start()
+        self._arm_timer()
         self.prompt_changed.emit(self._due_kind, "gentle")
         self._emit_ticks()
         self.state_changed.emit()
@@ -468,6 +692,7 @@ class BreakReminder(QObject):
         if not kind:
             return
         was_on_break = self._is_on_break
+        self.history_event.emit("skipped", kind, self._rested_seconds())
         if kind == "long":
             self._reset_both_cycles()
         else:
@@ -485,6 +710,7 @@ class BreakReminder(QObject):
         """Reset both activity cadences after five minutes of natural rest."""
 
         if not self._enabled:
+            self._pending_checkpoint = None
             self._reset_both_cycles()
             return False
         was_on_break = self._is_on_break
@@ -513,6 +739,30 @@ class BreakReminder(QObject):
     # Alias for integrations that read more naturally in event handlers.
     natural_rest_completed = complete_natural_rest
 
+    def set_tick_watcher(self, owner: str, watching: bool) -> None:
+        """Register whether ``owner`` currently shows a live countdown."""
+
+        was_ticking = self.ticking
+        if watching:
+            self._tick_watchers.add(str(owner))
+        else:
+            self._tick_watchers.discard(str(owner))
+        if self.ticking == was_ticking or not self._enabled or self._paused:
+            return
+        # Refresh the newly shown countdown and switch the timer mode.
+        self._timer.stop()
+        self._on_tick()
+
+    def observe_context(self, snapshot) -> None:
+        """Feed one context sample's input idle time to the accumulator."""
+
+        if self._activity is None:
+            return
+        idle = float(getattr(snapshot, "idle_seconds", 0))
+        if getattr(snapshot, "session", "active") != "active":
+            idle = math.inf
+        self._activity.observe(self._clock(), idle)
+
     # ---- Configuration --------------------------------------------------
 
     def set_reminder_style(self, style: str) -> None:
@@ -592,6 +842,7 @@ class BreakReminder(QObject):
             self._long_remaining = 0.0
         elif self._long_remaining <= 0:
             self._long_remaining = float(self._long_interval)
+        self._arm_timer()
         self.state_changed.emit()
 
     def set_long_interval(self, seconds: int) -> None:
@@ -619,9 +870,9 @@ class BreakReminder(QObject):
         self._total = self._short_interval
         self._remaining = self._display_seconds(self._short_remaining)
         now = self._clock()
-        self._last_active_at = now
+        self._start_active_span(now)
         self._deadline = now + self._short_remaining
-        self._timer.start()
+        self._arm_timer()
         self.state_changed.emit()
 
     def _reset_both_cycles(self) -> None:
@@ -655,12 +906,24 @@ class BreakReminder(QObject):
         else:
             self._begin_working()
 
+    def _start_active_span(self, now: float) -> None:
+        self._last_active_at = now
+        if self._activity is not None:
+            self._active_mark = self._activity.active_seconds
+
+    def _active_elapsed(self, now: float) -> float:
+        if self._last_active_at is None:
+            return 0.0
+        if self._activity is not None and self._activity.is_live(now):
+            return max(0.0, self._activity.active_seconds - self._active_mark)
+        return max(0.0, now - self._last_active_at)
+
     def _consume_active_time(self, now: float) -> None:
         if self._last_active_at is None:
-            self._last_active_at = now
+            self._start_active_span(now)
             return
-        elapsed = max(0.0, now - self._last_active_at)
-        self._last_active_at = now
+        elapsed = self._active_elapsed(now)
+        self._start_active_span(now)
         self._short_remaining = max(0.0, self._short_remaining - elapsed)
         if self._long_enabled:
             self._long_remaining = max(0.0, self._long_remaining - elapsed)
@@ -693,6 +956,7 @@ class BreakReminder(QObject):
 
     def _finish_break(self) -> None:
         kind = self._active_break_kind or "short"
+        self.history_event.emit("completed", kind, max(0, int(self._total)))
         self._is_on_break = False
         self._active_break_kind = ""
         if kind == "long":
@@ -702,6 +966,11 @@ class BreakReminder(QObject):
         self.break_ended.emit()
         self._begin_working()
 
+    def _rested_seconds(self) -> int:
+        if not self._is_on_break:
+            return 0
+        return max(0, int(self._total) - self.remaining)
+
     def _resume_due_after_snooze(self) -> None:
         kind = self._due_kind
         self._snooze_deadline = None
@@ -756,7 +1025,7 @@ class BreakReminder(QObject):
             and self.phase == "working"
             and self._last_active_at is not None
         ):
-            elapsed = max(0.0, (self._clock() if now is None else now) - self._last_active_at)
+            elapsed = self._active_elapsed(self._clock() if now is None else now)
             short = max(0.0, short - elapsed)
             if self._long_enabled:
                 long = max(0.0, long - elapsed)
@@ -783,9 +1052,51 @@ class BreakReminder(QObject):
             return 0
         return cls._display_seconds(deadline - now)
 
+    def _arm_timer(self) -> None:
+        """Start per-second ticks, or one wake-up at the next boundary."""
+
+        if not self._enabled or self._paused:
+            self._timer.stop()
+            return
+        if self.ticking:
+            self._timer.setSingleShot(False)
+            self._timer.start(1000)
+            return
+        delay = self._next_boundary_delay(self._clock())
+        if delay is None:
+            self._timer.stop()
+            return
+        self._timer.setSingleShot(True)
+        self._timer.start(max(1, math.ceil(delay * 1000)))
+
+    def _next_boundary_delay(self, now: float) -> float | None:
+        if self._is_on_break:
+            deadline = self._deadline
+        elif self._snooze_deadline is not None:
+            deadline = self._snooze_deadline
+        elif self._due_kind:
+            if self._prompt_stage != "gentle" or self._prompt_started_at is None:
+                return None
+            deadline = self._prompt_started_at + self.PROMPT_ESCALATION_SECONDS
+        else:
+            remaining = self._short_remaining
+            if self._long_enabled:
+                remaining = min(remaining, self._long_remaining)
+            # Credited time never outpaces wall time, so this is the earliest
+            # moment the cadence can fall due.
+            return max(0.0, remaining - self._active_elapsed(now))
+        if deadline is None:
+            return None
+        return max(0.0, deadline - now)
+
     def _on_tick(self) -> None:
         if not self._enabled or self._paused:
             return
+        self._advance()
+        if not self.ticking or not self._timer.isActive():
+            self._arm_timer()
+
+    def _advance(self) -> None:
         now = self._clock()
         if self._is_on_break:
             self._remaining = self._seconds_until(self._deadline, now)
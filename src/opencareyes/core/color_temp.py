@@ -1,6 +1,18 @@
 """Tanner Helland algorithm: convert color temperature (Kelvin) to RGB multipliers."""
 
+import ctypes
 import math
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from opencareyes.constants import TEMP_MAX, TEMP_MIN
+
+# Gamma ramp: 256 entries per channel (R, G, B) = 768 total unsigned shorts
+GAMMA_RAMP_SIZE = 256
+GammaRamp = ctypes.c_ushort * (GAMMA_RAMP_SIZE * 3)
+
+_RAMP_INDEXES = range(GAMMA_RAMP_SIZE)
 
 
 def kelvin_to_rgb(kelvin: int) -> tuple[float, float, float]:
@@ -35,3 +47,106 @@ def kelvin_to_rgb(kelvin: int) -> tuple[float, float, float]:
         b = max(0.0, min(255.0, b)) / 255.0
 
     return (r, g, b)
+
+
+def build_gamma_ramp(r: float, g: float, b: float) -> GammaRamp:
+    """Build a 768-entry gamma ramp from RGB multipliers in one bulk copy.
+
+    The channels are packed into a native ``array('H')`` which the returned
+    ctypes array wraps without copying, so the result can be handed straight
+    to ``SetDeviceGammaRamp``. Multipliers are clamped to ``0.0-1.0`` once,
+    so each channel is a single expression with no per-entry bounds check.
+    """
+
+    values = array("H")
+    for multiplier in (r, g, b):
+        multiplier = min(1.0, max(0.0, multiplier))
+        values.extend([int(index * multiplier * 257) for index in _RAMP_INDEXES])
+    return GammaRamp.from_buffer(values)
+
+
+class GammaRampTable:
+    """Bounded LRU of ready-to-write gamma ramps quantized to a Kelvin step.
+
+    Returned ramps are shared between callers and must be treated as
+    read-only; writers pass them to ``SetDeviceGammaRamp`` by reference.
+    """
+
+    def __init__(self, step: int = 10, capacity: int = 128) -> None:
+        self._step = max(1, int(step))
+        self._capacity = max(1, int(capacity))
+        self._ramps: OrderedDict[int, GammaRamp] = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def step(self) -> int:
+        return self._step
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def __len__(self) -> int:
+        return len(self._ramps)
+
+    def quantize(self, kelvin: int) -> int:
+        """Snap a temperature to the nearest cached step."""
+
+        step = self._step
+        return int(kelvin + step // 2) // step * step
+
+    def ramp(self, kelvin: int) -> GammaRamp:
+        """Return the shared ramp for ``kelvin``, building it at most once."""
+
+        key = self.quantize(kelvin)
+        cached = self._ramps.pop(key, None)
+        if cached is not None:
+            self._ramps[key] = cached
+            self._hits += 1
+            return cached
+        self._misses += 1
+        ramp = build_gamma_ramp(*kelvin_to_rgb(key))
+        self._ramps[key] = ramp
+        while len(self._ramps) > self._capacity:
+            self._ramps.popitem(last=False)
+        return ramp
+
+    def warm(
+        self,
+        minimum: int = TEMP_MIN,
+        maximum: int = TEMP_MAX,
+        *,
+        temperatures: Iterable[int] | None = None,
+    ) -> int:
+        """Precompute every step in the range; returns the number built.
+
+        ``temperatures`` warms just those values instead of the whole range.
+        The table grows to hold the warmed keys so they are never evicted by
+        the lookups that follow.
+        """
+
+        if temperatures is not None:
+            keys = sorted({self.quantize(int(kelvin)) for kelvin in temperatures})
+        else:
+            start = self.quantize(minimum)
+            stop = self.quantize(maximum)
+            keys = range(start, stop + 1, self._step)
+        self._capacity = max(self._capacity, len(keys))
+        built = 0
+        for key in keys:
+            if key not in self._ramps:
+                self._ramps[key] = build_gamma_ramp(*kelvin_to_rgb(key))
+                built += 1
+        return built
+
+    def clear(self) -> None:
+        self._ramps.clear()
@@ -3,21 +3,34 @@
 from __future__ import annotations
 
 import logging
-from dataclasses import dataclass
+import threading
+import time
+from collections.abc import Callable, Mapping, Sequence
+from dataclasses import dataclass, replace
 
 from PySide6.QtCore import QObject, QThread, QTimer, Qt, Signal, Slot
 from PySide6.QtWidgets import QApplication
 
-from opencareyes.core.blue_light_filter import BlueLightFilter
+from opencareyes.core.blue_light_filter import BlueLightFilter, DisplayOutputPool
 
 log = logging.getLogger(__name__)
 
+# Frame pacing for worker-side color temperature transitions (20 Hz, the
+# same ceiling as coalesced slider previews).
+TRANSITION_FRAME_MS = 50
+
 
 def _display_failure_message(code: str) -> str:
     """Return a fixed user message for native display failures."""
 
     if code == "hdr_active":
         return "HDR 已开启，色温调节已暂停；可改用 Windows 夜间模式。"
+    if code == "transition_superseded":
+        return "色温渐变已由更新的显示请求替代。"
+    if code == "preview_superseded":
+        return "预览已由更新的显示请求替代。"
+    if code == "request_superseded":
+        return "显示请求已由更新的请求替代。"
     if code == "gamma_rollback_failed":
         return "显示效果回滚不完整，请重启 OpenCareEyes 后检查显示。"
     if code in {
@@ -44,6 +57,9 @@ class GammaRequestToken:
     kind: str
     purpose: str
     requested_value: int | None = None
+    start_value: int | None = None
+    duration_ms: int = 0
+    output_targets: tuple[tuple[str, int], ...] = ()
 
 
 @dataclass(frozen=True, slots=True)
@@ -81,17 +97,190 @@ class GammaResult:
         return self.token.requested_value
 
 
+class _CommandQueue:
+    """Thread-safe mailbox that the worker drains as one batch."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._commands: list[_Command] = []
+
+    def put(self, command: _Command) -> bool:
+        """Queue a command; returns True when the worker needs a wake-up."""
+
+        with self._lock:
+            self._commands.append(command)
+            return len(self._commands) == 1
+
+    def take_all(self) -> list[_Command]:
+        with self._lock:
+            commands, self._commands = self._commands, []
+        return commands
+
+
+@dataclass(frozen=True, slots=True)
+class _Batch:
+    """Minimal native work for a burst of queued tokens."""
+
+    refreshes: tuple[GammaRequestToken, ...] = ()
+    outputs: tuple[GammaRequestToken, ...] = ()
+    operation: GammaRequestToken | None = None
+    final: GammaRequestToken | None = None
+    covered: tuple[GammaRequestToken, ...] = ()
+    superseded: tuple[tuple[GammaRequestToken, str], ...] = ()
+
+
+def _coalesce(tokens: Sequence[GammaRequestToken]) -> _Batch:
+    """Collapse queued tokens into at most one refresh and one state change.
+
+    Refreshes are merged and run first so the state change sees the current
+    topology; only the latest per-output target map is kept. Earlier state
+    tokens share the final operation's result unless the batch reversed what
+    they asked for, in which case they complete as superseded.
+    """
+
+    refreshes = tuple(token for token in tokens if token.kind == "refresh")
+    outputs = tuple(token for token in tokens if token.kind == "outputs")
+    updates = [
+        token for token in tokens if token.kind not in {"refresh", "outputs"}
+    ]
+    if not updates:
+        return _Batch(refreshes=refreshes, outputs=outputs)
+    final = updates[-1]
+    enabled: bool | None = None
+    temperature: int | None = None
+    for token in updates:
+        if token.kind in {"enable", "transition"}:
+            enabled = True
+            temperature = token.requested_value
+        elif token.kind == "disable":
+            enabled = False
+            temperature = None
+        elif token.kind == "temperature":
+            temperature = token.requested_value
+
+    if final.kind in {"transition", "disable"} or len(updates) == 1:
+        operation = final
+    elif enabled is True:
+        operation = replace(final, kind="enable", requested_value=temperature)
+    elif enabled is False:
+        operation = replace(final, kind="disable", requested_value=None)
+    else:
+        operation = replace(final, kind="temperature", requested_value=temperature)
+
+    covered: list[GammaRequestToken] = []
+    superseded: list[tuple[GammaRequestToken, str]] = []
+    for token in updates[:-1]:
+        if token.purpose == "preview":
+            superseded.append((token, "preview_superseded"))
+        elif token.kind == "transition":
+            superseded.append((token, "transition_superseded"))
+        elif (
+            (token.kind == "enable" and enabled is False)
+            or (token.kind == "disable" and enabled is True)
+            or (token.kind == "temperature" and enabled is False)
+        ):
+            superseded.append((token, "request_superseded"))
+        else:
+            covered.append(token)
+    return _Batch(
+        refreshes=refreshes,
+        outputs=outputs,
+        operation=operation,
+        final=final,
+        covered=tuple(covered),
+        superseded=tuple(superseded),
+    )
+
+
+@dataclass(slots=True)
+class _Transition:
+    token: GammaRequestToken
+    start: int
+    end: int
+    started_at: float
+    duration: float
+    applied: int | None = None
+
+
 class _GammaWorker(QObject):
     completed = Signal(int, bool, object)
     shutdown_completed = Signal()
 
-    def __init__(self, backend: BlueLightFilter):
+    def __init__(
+        self,
+        backend: BlueLightFilter,
+        commands: _CommandQueue,
+        *,
+        clock: Callable[[], float] | None = None,
+    ):
         super().__init__()
         self._backend = backend
+        self._commands = commands
+        self._clock = clock or time.monotonic
+        self._transition: _Transition | None = None
+        # Parented to the worker so moveToThread() carries it along; frames
+        # are re-armed only after the previous one finished, so a late worker
+        # skips straight to the current interpolated value.
+        self._frame_timer = QTimer(self)
+        self._frame_timer.setSingleShot(True)
+        self._frame_timer.timeout.connect(self._advance_transition)
+        # DCs are opened lazily by the first command and therefore live on
+        # the worker thread until a refresh, native failure or shutdown.
+        self._outputs = DisplayOutputPool()
+        attach = getattr(backend, "attach_output_pool", None)
+        if callable(attach):
+            attach(self._outputs)
 
-    @Slot(object)
-    def execute(self, command: _Command) -> None:
-        token = command.token
+    @Slot()
+    def drain(self) -> None:
+        tokens = [command.token for command in self._commands.take_all()]
+        if not tokens:
+            return
+        batch = _coalesce(tokens)
+        outcomes: dict[int, tuple[bool, dict[str, object]]] = {}
+        if batch.operation is not None:
+            # Display refreshes reapply the current frame and let a running
+            # transition continue; every other request supersedes it.
+            self._cancel_transition()
+        if batch.refreshes:
+            outcome = self._run(batch.refreshes[-1])
+            for token in batch.refreshes:
+                outcomes[token.request_id] = outcome
+        if batch.outputs and batch.operation is None:
+            outcome = self._run(batch.outputs[-1])
+            for token in batch.outputs:
+                outcomes[token.request_id] = outcome
+        elif batch.outputs:
+            # The state change below writes every output anyway, so only
+            # record the targets instead of rewriting the ramps twice.
+            try:
+                self._set_output_targets(batch.outputs[-1], apply=False)
+            except Exception:
+                log.exception("Gamma worker could not store output targets")
+                outcome = (False, self._failure_payload())
+                for token in batch.outputs:
+                    outcomes[token.request_id] = outcome
+        if batch.operation is not None:
+            if batch.operation.kind == "transition":
+                failure = self._start_transition(batch.operation)
+                if failure is not None:
+                    outcomes[batch.final.request_id] = failure
+                outcome = failure or (True, self._snapshot())
+            else:
+                outcome = self._run(batch.operation)
+                outcomes[batch.final.request_id] = outcome
+            for token in (*batch.covered, *batch.outputs):
+                outcomes.setdefault(token.request_id, outcome)
+        for token, code in batch.superseded:
+            payload = self._snapshot()
+            payload.update(superseded=True, error_code=code, error_message="")
+            outcomes[token.request_id] = (False, payload)
+        for token in tokens:
+            outcome = outcomes.get(token.request_id)
+            if outcome is not None:
+                self.completed.emit(token.request_id, outcome[0], outcome[1])
+
+    def _run(self, token: GammaRequestToken) -> tuple[bool, dict[str, object]]:
         try:
             if token.kind == "enable":
                 success = self._backend.enable(
@@ -103,6 +292,8 @@ class _GammaWorker(QObject):
                 success = self._backend.set_temperature(
                     int(token.requested_value or 6500)
                 )
+            elif token.kind == "outputs":
+                success = self._set_output_targets(token)
             elif token.kind == "refresh":
                 result = self._backend.refresh_screens()
                 success = (
@@ -114,23 +305,129 @@ class _GammaWorker(QObject):
                 success = False
         except Exception:
             log.exception("Gamma worker command failed: %s", token.kind)
-            success = False
-            payload = self._snapshot()
-            payload.update(
-                error_code="gamma_worker_exception",
-                error_message="色温效果未能安全应用，已保持原始显示。",
-            )
-        else:
-            payload = self._snapshot()
-        self.completed.emit(token.request_id, bool(success), payload)
+            return False, self._failure_payload()
+        return bool(success), self._snapshot()
+
+    def _set_output_targets(
+        self,
+        token: GammaRequestToken,
+        *,
+        apply: bool = True,
+    ) -> bool:
+        setter = getattr(self._backend, "set_output_temperatures", None)
+        if not callable(setter):
+            return True
+        return bool(setter(dict(token.output_targets), apply=apply))
 
     @Slot()
     def shutdown(self) -> None:
+        self._cancel_transition()
         try:
             self._backend.disable()
         finally:
+            self._outputs.invalidate()
             self.shutdown_completed.emit()
 
+    def _start_transition(
+        self,
+        token: GammaRequestToken,
+    ) -> tuple[bool, dict[str, object]] | None:
+        """Arm the fade frames; returns the failure outcome if it cannot start."""
+        end = int(token.requested_value or 6500)
+        start = (
+            int(token.start_value)
+            if token.start_value is not None
+            else int(getattr(self._backend, "current_temperature", end))
+        )
+        if not bool(getattr(self._backend, "enabled", False)):
+            try:
+                enabled = self._backend.enable(start)
+            except Exception:
+                log.exception("Gamma transition could not enable the filter")
+                return False, self._failure_payload()
+            if not enabled:
+                return False, self._snapshot()
+        self._transition = _Transition(
+            token=token,
+            start=start,
+            end=end,
+            started_at=self._clock(),
+            duration=(
+                max(0, int(token.duration_ms)) / 1000.0 if start != end else 0.0
+            ),
+        )
+        # The first frame runs after the current batch has reported, so the
+        # tokens it covered never complete after the transition itself.
+        self._frame_timer.start(0)
+        return None
+
+    @Slot()
+    def _advance_transition(self) -> None:
+        transition = self._transition
+        if transition is None:
+            return
+        elapsed = self._clock() - transition.started_at
+        progress = (
+            1.0
+            if transition.duration <= 0
+            else min(1.0, max(0.0, elapsed / transition.duration))
+        )
+        kelvin = round(
+            transition.start + (transition.end - transition.start) * progress
+        )
+        if progress >= 1.0:
+            kelvin = transition.end
+        success = True
+        frame = self._frame_key(kelvin)
+        if frame != transition.applied or progress >= 1.0:
+            try:
+                success = bool(self._backend.set_temperature(kelvin))
+            except Exception:
+                log.exception("Gamma transition frame failed")
+                self._transition = None
+                self._fail(transition.token)
+                return
+            transition.applied = frame
+        if not success or progress >= 1.0:
+            self._transition = None
+            self.completed.emit(
+                transition.token.request_id,
+                success,
+                self._snapshot(),
+            )
+            return
+        self._frame_timer.start(TRANSITION_FRAME_MS)
+
+    def _frame_key(self, kelvin: int) -> int:
+        table = getattr(self._backend, "ramp_table", None)
+        quantize = getattr(table, "quantize", None)
+        return int(quantize(kelvin)) if callable(quantize) else int(kelvin)
+
+    def _cancel_transition(self) -> None:
+        transition = self._transition
+        if transition is None:
+            return
+        self._transition = None
+        self._frame_timer.stop()
+        payload = self._snapshot()
+        payload.update(
+            superseded=True,
+            error_code="transition_superseded",
+            error_message="",
+        )
+        self.completed.emit(transition.token.request_id, False, payload)
+
+    def _fail(self, token: GammaRequestToken) -> None:
+        self.completed.emit(token.request_id, False, self._failure_payload())
+
+    def _failure_payload(self) -> dict[str, object]:
+        payload = self._snapshot()
+        payload.update(
+            error_code="gamma_worker_exception",
+            error_message="色温效果未能安全应用，已保持原始显示。",
+        )
+        return payload
+
     def _snapshot(self) -> dict[str, object]:
         return {
             "enabled": bool(getattr(self._backend, "enabled", False)),
@@ -155,7 +452,7 @@ class QueuedBlueLightFilter(QObject):
     ``pending`` remains true until the native operation has completed.
     """
 
-    _execute_requested = Signal(object)
+    _execute_requested = Signal()
     _shutdown_requested = Signal()
     state_changed = Signal()
     operation_finished = Signal(bool, str, str)
@@ -188,9 +485,10 @@ class QueuedBlueLightFilter(QObject):
         self._temperature_timer.timeout.connect(self._submit_temperature)
 
         self._thread = QThread(self)
-        self._worker = _GammaWorker(self._backend)
+        self._commands = _CommandQueue()
+        self._worker = _GammaWorker(self._backend, self._commands)
         self._worker.moveToThread(self._thread)
-        self._execute_requested.connect(self._worker.execute, Qt.QueuedConnection)
+        self._execute_requested.connect(self._worker.drain, Qt.QueuedConnection)
         self._shutdown_requested.connect(self._worker.shutdown, Qt.QueuedConnection)
         self._worker.completed.connect(self._complete, Qt.QueuedConnection)
         # shutdown() waits from the GUI thread, so quitting must not be queued
@@ -221,7 +519,7 @@ class QueuedBlueLightFilter(QObject):
     @property
     def pending_target(self) -> bool | None:
         for token in reversed(tuple(self._pending.values())):
-            if token.kind == "enable":
+            if token.kind in {"enable", "transition"}:
                 return True
             if token.kind == "disable":
                 return False
@@ -327,6 +625,60 @@ class QueuedBlueLightFilter(QObject):
         self._dispatch(token)
         return token
 
+    def request_transition(
+        self,
+        temperature: int,
+        duration_ms: int,
+        *,
+        start: int | None = None,
+        revision: int = 0,
+        purpose: str = "commit",
+    ) -> GammaRequestToken:
+        """Fade to ``temperature`` on the worker over ``duration_ms``.
+
+        The worker interpolates from ``start`` (or the applied temperature)
+        on its own clock and completes the token once the final value is
+        verified. Any later non-refresh request supersedes the fade.
+        """
+
+        token = self._reserve(
+            "transition",
+            int(temperature),
+            revision,
+            purpose,
+            start_value=None if start is None else int(start),
+            duration_ms=max(0, int(duration_ms)),
+        )
+        self._cancel_temperature_preview()
+        self._dispatch(token)
+        return token
+
+    def request_output_temperatures(
+        self,
+        targets: Mapping[str, int],
+        *,
+        revision: int = 0,
+        purpose: str = "system",
+    ) -> GammaRequestToken:
+        """Pin outputs to their own temperature; see ``BlueLightFilter``.
+
+        Unlike a state change this does not cancel a pending preview or a
+        running transition: the worker rewrites only the outputs whose
+        target changed and later frames honour the new map.
+        """
+
+        token = self._reserve(
+            "outputs",
+            None,
+            revision,
+            purpose,
+            output_targets=tuple(
+                sorted((str(key), int(value)) for key, value in targets.items())
+            ),
+        )
+        self._dispatch(token)
+        return token
+
     def preview_temperature(
         self,
         temperature: int,
@@ -395,6 +747,10 @@ class QueuedBlueLightFilter(QObject):
         value: int | None,
         revision: int,
         purpose: str,
+        *,
+        start_value: int | None = None,
+        duration_ms: int = 0,
+        output_targets: tuple[tuple[str, int], ...] = (),
     ) -> GammaRequestToken:
         token = GammaRequestToken(
             request_id=self._next_identifier,
@@ -402,6 +758,9 @@ class QueuedBlueLightFilter(QObject):
             kind=str(kind),
             purpose=str(purpose),
             requested_value=value,
+            start_value=start_value,
+            duration_ms=duration_ms,
+            output_targets=output_targets,
         )
         self._next_identifier += 1
         self._pending[token.request_id] = token
@@ -410,7 +769,10 @@ class QueuedBlueLightFilter(QObject):
 
     def _dispatch(self, token: GammaRequestToken) -> None:
         self.state_changed.emit()
-        self._execute_requested.emit(_Command(token))
+        # Tokens queued while the worker is busy are drained together and
+        # collapsed into the minimal native operation sequence.
+        if self._commands.put(_Command(token)):
+            self._execute_requested.emit()
 
     @Slot(int, bool, object)
     def _complete(self, identifier: int, success: bool, payload: object) -> None:
@@ -418,7 +780,9 @@ class QueuedBlueLightFilter(QObject):
         if token is None:
             return
         data = payload if isinstance(payload, dict) else {}
-        superseded = token.request_id < self._latest_result_id
+        superseded = token.request_id < self._latest_result_id or bool(
+            data.get("superseded", False)
+        )
         code = str(data.get("error_code", "") or "") or (
             "" if success else "gamma_apply_failed"
         )
@@ -427,7 +791,10 @@ class QueuedBlueLightFilter(QObject):
         if not success and raw_message:
             log.error("Gamma operation failed [%s]: %s", code, raw_message)
         if not superseded:
-            self._latest_result_id = token.request_id
+            # Topology and per-output results report the current state but
+            # must not mark a still-running transition as superseded.
+            if token.kind not in {"refresh", "outputs"}:
+                self._latest_result_id = token.request_id
             self._enabled = bool(data.get("enabled", False))
             self._temperature = int(data.get("temperature", self._temperature))
             self._hdr_active = bool(data.get("hdr_active", False))
@@ -6,6 +6,7 @@ from PySide6.QtCore import QObject, Qt, Signal, Slot
 from PySide6.QtGui import QColor, QPainter, QScreen
 from PySide6.QtWidgets import QApplication, QWidget
 
+from opencareyes.core.overlay_pool import OverlayPool
 from opencareyes.platform.win32_api import (
     GWL_EXSTYLE,
     HWND_NOTOPMOST,
@@ -78,7 +79,7 @@ class FocusMode(QObject):
         super().__init__(parent)
         self._enabled = False
         self._dim_level = 150
-        self._overlays: list[_FocusOverlay] = []
+        self._pool: OverlayPool[_FocusOverlay] = OverlayPool(self._new_overlay)
         self._watched_screens: set[int] = set()
         self._last_error_code = ""
         self._last_error_message = ""
@@ -122,10 +123,7 @@ class FocusMode(QObject):
             )
             return False
         try:
-            for overlay in self._overlays:
-                overlay.show()
-                if not overlay.isVisible():
-                    raise RuntimeError("focus overlay did not become visible")
+            self._show(self._pool.overlays)
         except Exception:
             log.exception("Failed to show all focus overlays")
             self._destroy_overlays()
@@ -162,24 +160,45 @@ class FocusMode(QObject):
     def set_dim_level(self, level: int):
         """Configure background dim level (0-255)."""
         self._dim_level = max(0, min(255, level))
-        for overlay in self._overlays:
+        for overlay in self._pool.overlays:
             overlay.set_dim_level(self._dim_level)
 
     def refresh_screens(self) -> bool:
-        """Rebuild focus overlays after a native display change."""
+        """Align focus overlays with the screens after a display change."""
 
         if not self._enabled:
             return True
-        saved_level = self._dim_level
-        if not self.disable():
+        app = QApplication.instance()
+        screens = list(app.screens()) if app is not None else []
+        try:
+            if not screens:
+                raise RuntimeError("no screens are available")
+            added = self._pool.sync(screens)
+            self._show(added)
+        except Exception:
+            log.exception("Failed to align focus overlays with the screens")
+            self._destroy_overlays()
+            self._enabled = False
+            self._report_failure(
+                "focus_overlay_failed",
+                "专注遮罩未能在所有屏幕上显示。",
+            )
             return False
-        self._dim_level = saved_level
-        return self.enable()
+        if added:
+            self._on_foreground_changed(GetForegroundWindow())
+        return True
+
+    @staticmethod
+    def _show(overlays) -> None:
+        for overlay in overlays:
+            overlay.show()
+            if not overlay.isVisible():
+                raise RuntimeError("focus overlay did not become visible")
 
     @Slot(object)
     def _on_foreground_changed(self, hwnd):
         """Place overlay just below the foreground window in Z-order."""
-        if not self._enabled or not self._overlays or not hwnd:
+        if not self._enabled or not len(self._pool) or not hwnd:
             return
 
         # Strategy: insert the overlay directly behind the foreground window.
@@ -190,7 +209,7 @@ class FocusMode(QObject):
         # 3. The foreground window stays in its normal Z-position — we never
         #    make it TOPMOST, so clicking other windows works normally.
 
-        for overlay in self._overlays:
+        for overlay in self._pool.overlays:
             overlay_hwnd = int(overlay.winId())
             if not overlay_hwnd or hwnd == overlay_hwnd:
                 continue
@@ -213,29 +232,21 @@ class FocusMode(QObject):
         if not screens:
             return False
         try:
-            for screen in screens:
-                overlay = _FocusOverlay()
-                overlay.setGeometry(screen.geometry())
-                overlay.set_dim_level(self._dim_level)
-                self._overlays.append(overlay)
+            self._pool.sync(screens)
         except Exception:
             log.exception("Failed to create focus overlays")
             self._destroy_overlays()
             return False
-        return len(self._overlays) == len(screens)
+        return len(self._pool) == len(screens)
+
+    def _new_overlay(self, screen: QScreen) -> _FocusOverlay:
+        overlay = _FocusOverlay()
+        overlay.setGeometry(screen.geometry())
+        overlay.set_dim_level(self._dim_level)
+        return overlay
 
     def _destroy_overlays(self) -> bool:
-        success = True
-        for overlay in self._overlays:
-            try:
-                overlay.hide()
-                overlay.close()
-                overlay.deleteLater()
-            except Exception:
-                success = False
-                log.exception("Failed to remove a focus overlay")
-        self._overlays.clear()
-        return success
+        return self._pool.clear()
 
     def _on_screens_changed(self, *_):
         app = QApplication.instance()
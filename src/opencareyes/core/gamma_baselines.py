@@ -0,0 +1,161 @@
+"""Original Gamma ramps kept for rollback, optionally persisted for recovery."""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Iterator, MutableMapping
+from pathlib import Path
+
+from opencareyes.core.color_temp import GammaRamp
+
+log = logging.getLogger(__name__)
+
+OutputIdentity = tuple[str, tuple[str, ...]]
+
+SCHEMA_VERSION = 1
+_RAMP_BYTES = len(bytes(GammaRamp()))
+
+
+class GammaBaselines(MutableMapping[OutputIdentity, bytes]):
+    """Immutable ramp bytes indexed by output identity and display source.
+
+    At most one baseline exists per source, so a changed clone/target set is
+    matched with a single dict lookup. Ramps stay as ``bytes`` and are copied
+    into a ctypes buffer only when they are written back.
+    """
+
+    __slots__ = ("_ramps", "_by_source")
+
+    def __init__(
+        self,
+        entries: Iterable[tuple[OutputIdentity, bytes]] = (),
+    ) -> None:
+        self._ramps: dict[OutputIdentity, bytes] = {}
+        self._by_source: dict[str, OutputIdentity] = {}
+        for identity, ramp in entries:
+            self[identity] = ramp
+
+    def __getitem__(self, identity: OutputIdentity) -> bytes:
+        return self._ramps[identity]
+
+    def __setitem__(self, identity: OutputIdentity, ramp: bytes) -> None:
+        ramp = bytes(ramp)
+        if len(ramp) != _RAMP_BYTES:
+            raise ValueError("gamma baselines must be complete 768-entry ramps")
+        previous = self._by_source.get(identity[0])
+        if previous is not None and previous != identity:
+            del self._ramps[previous]
+        self._ramps[identity] = ramp
+        self._by_source[identity[0]] = identity
+
+    def __delitem__(self, identity: OutputIdentity) -> None:
+        del self._ramps[identity]
+        del self._by_source[identity[0]]
+
+    def __iter__(self) -> Iterator[OutputIdentity]:
+        return iter(self._ramps)
+
+    def __len__(self) -> int:
+        return len(self._ramps)
+
+    def copy(self) -> GammaBaselines:
+        clone = GammaBaselines()
+        clone._ramps = dict(self._ramps)
+        clone._by_source = dict(self._by_source)
+        return clone
+
+    def match(self, identity: OutputIdentity) -> OutputIdentity | None:
+        """Return the stored identity for the same source and target set.
+
+        A source whose targets changed still matches while at least one
+        target is shared, e.g. when a clone target is added.
+        """
+        if identity in self._ramps:
+            return identity
+        previous = self._by_source.get(identity[0])
+        if previous is None or not set(identity[1]).intersection(previous[1]):
+            return None
+        return previous
+
+    def migrate(self, identity: OutputIdentity) -> bool:
+        """Re-key a matching baseline under ``identity``; False if none."""
+        matched = self.match(identity)
+        if matched is None:
+            return False
+        if matched != identity:
+            self[identity] = self._ramps[matched]
+        return True
+
+    def ramp(self, identity: OutputIdentity) -> GammaRamp:
+        """Return a writable ctypes copy of the baseline for ``identity``."""
+        return GammaRamp.from_buffer_copy(self._ramps[identity])
+
+
+def load_baselines(path: str | os.PathLike[str]) -> GammaBaselines:
+    """Read persisted baselines; a missing or damaged file yields none."""
+
+    path = Path(path)
+    try:
+        raw = json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return GammaBaselines()
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        log.warning("Persisted Gamma baselines could not be read", exc_info=True)
+        return GammaBaselines()
+    baselines = GammaBaselines()
+    if not isinstance(raw, dict) or raw.get("schema_version") != SCHEMA_VERSION:
+        return baselines
+    records = raw.get("baselines")
+    if not isinstance(records, list):
+        return baselines
+    for record in records:
+        try:
+            identity = (
+                str(record["source"]),
+                tuple(str(target) for target in record["targets"]),
+            )
+            baselines[identity] = base64.b64decode(record["ramp"], validate=True)
+        except (KeyError, TypeError, ValueError):
+            log.warning("Ignoring a damaged persisted Gamma baseline")
+    return baselines
+
+
+def save_baselines(
+    path: str | os.PathLike[str],
+    baselines: GammaBaselines,
+) -> None:
+    """Atomically persist ``baselines``; an empty store removes the file."""
+
+    path = Path(path)
+    if not baselines:
+        path.unlink(missing_ok=True)
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "schema_version": SCHEMA_VERSION,
+        "baselines": [
+            {
+                "source": identity[0],
+                "targets": list(identity[1]),
+                "ramp": base64.b64encode(ramp).decode("ascii"),
+            }
+            for identity, ramp in baselines.items()
+        ],
+    }
+    fd, temporary_name = tempfile.mkstemp(
+        prefix=f".{path.name}.", suffix=".tmp", dir=path.parent
+    )
+    temporary = Path(temporary_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+            json.dump(payload, handle, separators=(",", ":"))
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, path)
+    except OSError:
+        temporary.unlink(missing_ok=True)
+        raise
@@ -1,7 +1,12 @@
 """Monitor enumeration and information via Win32 API."""
 
+from __future__ import annotations
+
 import ctypes
 import logging
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, fields
 
 from opencareyes.platform.win32_api import (
     MONITORENUMPROC,
@@ -13,56 +18,132 @@ from opencareyes.platform.win32_api import (
 
 log = logging.getLogger(__name__)
 
+_Rect = tuple[int, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class MonitorInfo:
+    """One attached monitor; rectangles are ``(left, top, right, bottom)``."""
+
+    handle: int
+    name: str
+    geometry: _Rect
+    work_area: _Rect
+    is_primary: bool = False
+
+    def __getitem__(self, key: str):
+        """Keep ``monitor["name"]`` working for callers of the old dict records."""
+
+        if key not in _MONITOR_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+
+_MONITOR_FIELDS = frozenset(field.name for field in fields(MonitorInfo))
+
+
+def enumerate_monitors() -> tuple[MonitorInfo, ...]:
+    """Enumerate attached monitors with one ``EnumDisplayMonitors`` pass."""
+
+    monitors: list[MonitorInfo] = []
+
+    @MONITORENUMPROC
+    def _callback(hmonitor, hdc, lprect, lparam):
+        info = MONITORINFOEXW()
+        info.cbSize = ctypes.sizeof(MONITORINFOEXW)
+        if GetMonitorInfoW(hmonitor, ctypes.byref(info)):
+            rc = info.rcMonitor
+            work = info.rcWork
+            monitors.append(
+                MonitorInfo(
+                    handle=int(hmonitor or 0),
+                    name=str(info.szDevice),
+                    geometry=(rc.left, rc.top, rc.right, rc.bottom),
+                    work_area=(work.left, work.top, work.right, work.bottom),
+                    is_primary=bool(info.dwFlags & MONITORINFOF_PRIMARY),
+                )
+            )
+        return True  # continue enumeration
+
+    if not EnumDisplayMonitors(None, None, _callback, 0):
+        raise ctypes.WinError()
+    return tuple(monitors)
+
 
 class MonitorManager:
-    """Enumerates and stores information about connected display monitors."""
-
-    def __init__(self):
-        self._monitors: list[dict] = []
-
-    def refresh(self) -> None:
-        """Re-enumerate all connected monitors."""
-        self._monitors.clear()
-        monitors = self._monitors  # local ref for closure
-
-        @MONITORENUMPROC
-        def _callback(hmonitor, hdc, lprect, lparam):
-            info = MONITORINFOEXW()
-            info.cbSize = ctypes.sizeof(MONITORINFOEXW)
-            if GetMonitorInfoW(hmonitor, ctypes.byref(info)):
-                rc = info.rcMonitor
-                monitors.append({
-                    "handle": int(hmonitor),
-                    "name": info.szDevice,
-                    "geometry": {
-                        "left": rc.left,
-                        "top": rc.top,
-                        "right": rc.right,
-                        "bottom": rc.bottom,
-                    },
-                    "is_primary": bool(info.dwFlags & MONITORINFOF_PRIMARY),
-                })
-            return True  # continue enumeration
+    """Versioned cache of the connected display topology.
 
-        try:
-            EnumDisplayMonitors(None, None, _callback, 0)
-        except Exception:
-            log.exception("Failed to enumerate monitors")
+    Monitors are enumerated once and reused until ``invalidate`` runs from a
+    display-change or Qt screen notification. ``generation`` only advances when
+    a re-enumeration yields a different topology, so consumers can keep derived
+    data until the number they recorded changes. The cache may be shared
+    between the GUI thread and the Gamma worker.
+    """
+
+    def __init__(
+        self,
+        *,
+        enumerator: Callable[[], tuple[MonitorInfo, ...]] | None = None,
+    ):
+        self._enumerate = enumerator or enumerate_monitors
+        self._lock = threading.Lock()
+        self._monitors: tuple[MonitorInfo, ...] = ()
+        self._generation = 0
+        self._stale = True
+
+    @property
+    def generation(self) -> int:
+        """Topology version, refreshed first if an invalidation is pending."""
+
+        self._ensure_current()
+        return self._generation
+
+    @property
+    def stale(self) -> bool:
+        return self._stale
+
+    def invalidate(self, *_args) -> None:
+        """Mark the topology stale; the next read re-enumerates once."""
+
+        self._stale = True
 
-    def get_monitors(self) -> list[dict]:
-        """Return a list of monitor info dicts.
+    def refresh(self) -> bool:
+        """Re-enumerate all connected monitors now.
 
-        Each dict contains:
-            handle     - HMONITOR handle (int)
-            name       - device name string
-            geometry   - dict with left, top, right, bottom
-            is_primary - bool
+        Returns ``True`` when the topology differs from the cached one.
         """
-        if not self._monitors:
-            self.refresh()
-        return list(self._monitors)
+        with self._lock:
+            return self._refresh_locked()
+
+    def get_monitors(self) -> tuple[MonitorInfo, ...]:
+        """Return the cached, immutable monitor records."""
+
+        self._ensure_current()
+        return self._monitors
 
     def get_monitor_count(self) -> int:
-        if not self._monitors:
-            self.refresh()
-        return len(self._monitors)
+        return len(self.get_monitors())
+
+    def _ensure_current(self) -> None:
+        if not self._stale:
+            return
+        with self._lock:
+            if self._stale:
+                self._refresh_locked()
+
+    def _refresh_locked(self) -> bool:
+        # Clear first so an invalidation arriving mid-enumeration is kept.
+        self._stale = False
+        try:
+            monitors = tuple(self._enumerate())
+        except Exception:
+            log.exception("Failed to enumerate monitors")
+            monitors = ()
+        if not monitors:
+            # Nothing usable was reported; retry on the next read.
+            self._stale = True
+        if monitors == self._monitors:
+            return False
+        self._monitors = monitors
+        self._generation += 1
+        return True
@@ -0,0 +1,97 @@
+"""Per-screen overlay windows that survive display topology changes."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from typing import Generic, TypeVar
+
+from PySide6.QtGui import QScreen
+from PySide6.QtWidgets import QWidget
+
+log = logging.getLogger(__name__)
+
+_Overlay = TypeVar("_Overlay", bound=QWidget)
+
+
+def screen_key(screen: QScreen) -> str:
+    """Casefolded device name, matching ``BlueLightFilter`` output sources."""
+    return str(screen.name()).strip().casefold()
+
+
+class OverlayPool(Generic[_Overlay]):
+    """Overlays keyed by screen identity and diffed against each topology.
+
+    ``sync`` only creates overlays for new screens, destroys those whose
+    screen went away and moves the rest, so repeated geometry notifications
+    (docking stations, taskbar auto-hide) do not recreate any window.
+    """
+
+    def __init__(self, factory: Callable[[QScreen], _Overlay]):
+        self._factory = factory
+        self._overlays: dict[str, _Overlay] = {}
+
+    @property
+    def overlays(self) -> tuple[_Overlay, ...]:
+        return tuple(self._overlays.values())
+
+    def __len__(self) -> int:
+        return len(self._overlays)
+
+    def sync(self, screens: Iterable[QScreen]) -> tuple[_Overlay, ...]:
+        """Align the pool with ``screens`` and return newly created overlays.
+
+        A factory failure propagates after the overlays created by this call
+        have been destroyed; retained overlays are left in place.
+        """
+        wanted: dict[str, QScreen] = {}
+        for screen in screens:
+            key = screen_key(screen) or "screen"
+            unique = key
+            suffix = 2
+            while unique in wanted:
+                unique = f"{key}#{suffix}"
+                suffix += 1
+            wanted[unique] = screen
+
+        for key in tuple(self._overlays):
+            if key not in wanted:
+                self._destroy(self._overlays.pop(key))
+
+        current: dict[str, _Overlay] = {}
+        added: list[_Overlay] = []
+        try:
+            for key, screen in wanted.items():
+                overlay = self._overlays.get(key)
+                geometry = screen.geometry()
+                if overlay is None:
+                    overlay = self._factory(screen)
+                    added.append(overlay)
+                if overlay.geometry() != geometry:
+                    overlay.setGeometry(geometry)
+                current[key] = overlay
+        except Exception:
+            for overlay in added:
+                self._destroy(overlay)
+            raise
+        self._overlays = current
+        return tuple(added)
+
+    def clear(self) -> bool:
+        """Destroy every overlay; returns False if any could not be removed."""
+        success = True
+        overlays, self._overlays = self._overlays, {}
+        for overlay in overlays.values():
+            success = self._destroy(overlay) and success
+        return success
+
+    @staticmethod
+    def _destroy(overlay: QWidget) -> bool:
+        try:
+            overlay.hide()
+            overlay.close()
+            overlay.deleteLater()
+        except Exception:
+            log.exception("Failed to remove a screen overlay")
+            return False
+        return True
@@ -3,17 +3,232 @@
 from __future__ import annotations
 
 import logging
-from collections.abc import Callable
+from bisect import bisect_right
+from collections.abc import Callable, Sequence
 from dataclasses import dataclass
-from datetime import datetime, time, timedelta
+from datetime import date, datetime, time, timedelta, tzinfo
 
 from PySide6.QtCore import QObject, QTimer, Signal
 
-from astral import LocationInfo
 from astral.sun import sun
 
+from opencareyes.core.solar_calendar import SolarCalendar, zone_key
+
 log = logging.getLogger(__name__)
 
+# Days compiled into one schedule index; weekly rules always have a boundary.
+_INDEX_DAYS = 15
+_ANCHORS = frozenset({"clock", "sunrise", "sunset"})
+# Ramp values are quantized so each write is a perceptible change.
+RAMP_TEMPERATURE_STEP = 50
+RAMP_DIM_STEP = 2
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleTime:
+    """A rule boundary: a wall-clock minute or an offset from a sun event."""
+
+    anchor: str = "clock"
+    minutes: int = 0
+
+    def __post_init__(self) -> None:
+        if self.anchor not in _ANCHORS:
+            raise ValueError(f"未知的自动化时间基准：{self.anchor}")
+        if self.anchor == "clock" and not 0 <= self.minutes < 24 * 60:
+            raise ValueError("固定时间必须在 00:00 到 23:59 之间")
+
+    @classmethod
+    def clock(cls, value: time) -> ScheduleTime:
+        return cls("clock", value.hour * 60 + value.minute)
+
+    @classmethod
+    def sunrise(cls, offset: int = 0) -> ScheduleTime:
+        return cls("sunrise", int(offset))
+
+    @classmethod
+    def sunset(cls, offset: int = 0) -> ScheduleTime:
+        return cls("sunset", int(offset))
+
+    @classmethod
+    def parse(cls, text: str) -> ScheduleTime:
+        """Parse ``HH:MM`` or ``sunrise``/``sunset`` with an optional ``±minutes``."""
+
+        value = str(text).strip().lower()
+        for anchor in ("sunrise", "sunset"):
+            if value.startswith(anchor):
+                offset = value[len(anchor):]
+                return cls(anchor, int(offset) if offset else 0)
+        hour, separator, minute = value.partition(":")
+        if not (separator and hour.isdigit() and minute.isdigit() and int(minute) < 60):
+            raise ValueError(f"时间格式无效：{text}，应为 HH:MM")
+        return cls("clock", int(hour) * 60 + int(minute))
+
+    def event(self, starting: bool) -> str:
+        """Legacy ``next_event`` name for crossing this boundary."""
+
+        if self.anchor == "clock":
+            return "on" if starting else "off"
+        return self.anchor
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleRule:
+    """Select ``profile`` from ``start`` until ``end`` on the given weekdays.
+
+    An end at or before the start falls on the following day. When rules
+    overlap, the one listed later wins.
+    """
+
+    start: ScheduleTime
+    end: ScheduleTime
+    profile: str
+    days: frozenset[int] = frozenset(range(7))
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleBoundary:
+    """A moment where the active profile changes; ``None`` means no rule."""
+
+    at: datetime
+    event: str
+    profile: str | None
+
+
+class ScheduleIndex:
+    """Merged, non-overlapping profile segments for a compiled date range.
+
+    ``profile_at`` and ``next_boundary`` are binary searches; answers are only
+    authoritative inside ``[valid_from, valid_to)``. ``probe``, when set, is
+    called with every boundary timestamp a lookup compares against.
+    """
+
+    __slots__ = ("valid_from", "valid_to", "probe", "_times", "_boundaries")
+
+    def __init__(
+        self,
+        valid_from: datetime,
+        valid_to: datetime,
+        boundaries: Sequence[ScheduleBoundary],
+    ):
+        self.valid_from = valid_from
+        self.valid_to = valid_to
+        self._boundaries = tuple(boundaries)
+        self._times = [boundary.at.timestamp() for boundary in self._boundaries]
+        self.probe: Callable[[float], None] | None = None
+
+    def __len__(self) -> int:
+        return len(self._boundaries)
+
+    def covers(self, moment: datetime) -> bool:
+        return self.valid_from <= moment < self.valid_to
+
+    def profile_at(self, moment: datetime) -> str | None:
+        position = self._position(moment) - 1
+        return self._boundaries[position].profile if position >= 0 else None
+
+    def next_boundary(self, moment: datetime) -> ScheduleBoundary | None:
+        position = self._position(moment)
+        if position < len(self._boundaries):
+            boundary = self._boundaries[position]
+            if boundary.at < self.valid_to:
+                return boundary
+        return None
+
+    def _position(self, moment: datetime) -> int:
+        probe = self.probe
+        if probe is None:
+            return bisect_right(self._times, moment.timestamp())
+
+        def observed(stamp: float) -> float:
+            probe(stamp)
+            return stamp
+
+        return bisect_right(self._times, moment.timestamp(), key=observed)
+
+
+def compile_schedule(
+    rules: Sequence[ScheduleRule],
+    first_day: date,
+    days: int,
+    *,
+    zone: tzinfo | None,
+    sun_events: Callable[[date], tuple[datetime, datetime]] | None = None,
+) -> ScheduleIndex:
+    """Resolve ``rules`` for ``days`` local dates and merge them into an index.
+
+    ``sun_events`` returns the sunrise and sunset of a local date and is only
+    required by sun-relative rules.
+    """
+
+    if days < 1:
+        raise ValueError("days must be positive")
+    resolved_sun: dict[date, tuple[datetime, datetime]] = {}
+
+    def resolve(point: ScheduleTime, day: date) -> datetime:
+        if point.anchor == "clock":
+            return datetime.combine(day, time(), tzinfo=zone) + timedelta(
+                minutes=point.minutes
+            )
+        if sun_events is None:
+            raise ValueError("日出日落规则需要位置")
+        if day not in resolved_sun:
+            resolved_sun[day] = sun_events(day)
+        sunrise, sunset = resolved_sun[day]
+        base = sunrise if point.anchor == "sunrise" else sunset
+        return base + timedelta(minutes=point.minutes)
+
+    # (timestamp, moment, delta, rank); rules starting the day before the
+    # range may still be active at its start.
+    edges: list[tuple[float, datetime, int, int]] = []
+    for offset in range(-1, days):
+        day = first_day + timedelta(days=offset)
+        weekday = day.weekday()
+        for rank, rule in enumerate(rules):
+            if weekday not in rule.days:
+                continue
+            start = resolve(rule.start, day)
+            end = resolve(rule.end, day)
+            if end <= start:
+                end = resolve(rule.end, day + timedelta(days=1))
+                if end <= start:
+                    raise ValueError("计算得到的结束时间必须晚于开始时间")
+            edges.append((start.timestamp(), start, 1, rank))
+            edges.append((end.timestamp(), end, -1, rank))
+    edges.sort(key=lambda edge: edge[0])
+
+    active = [0] * len(rules)
+    winner: int | None = None
+    profile: str | None = None
+    boundaries: list[ScheduleBoundary] = []
+    index = 0
+    while index < len(edges):
+        stamp, moment = edges[index][0], edges[index][1]
+        started: set[int] = set()
+        while index < len(edges) and edges[index][0] == stamp:
+            _stamp, _moment, delta, rank = edges[index]
+            active[rank] += delta
+            if delta > 0:
+                started.add(rank)
+            index += 1
+        previous = winner
+        winner = next(
+            (rank for rank in range(len(rules) - 1, -1, -1) if active[rank] > 0),
+            None,
+        )
+        current = rules[winner].profile if winner is not None else None
+        if winner == previous or current == profile:
+            continue
+        if winner is not None and winner in started:
+            event = rules[winner].start.event(True)
+        else:
+            event = rules[previous].end.event(False)
+        boundaries.append(ScheduleBoundary(moment, event, current))
+        profile = current
+
+    valid_from = datetime.combine(first_day, time(), tzinfo=zone)
+    valid_to = datetime.combine(first_day + timedelta(days=days), time(), tzinfo=zone)
+    return ScheduleIndex(valid_from, valid_to, boundaries)
+
 
 @dataclass(frozen=True, slots=True)
 class _ScheduleDecision:
@@ -22,6 +237,66 @@ class _ScheduleDecision:
     next_event: str
     next_event_at: datetime
     next_profile: str
+    next_night: bool = True
+
+
+@dataclass(frozen=True, slots=True)
+class ScheduleRampStep:
+    """Interpolated display values while easing toward ``profile``."""
+
+    profile: str
+    color_temperature: int
+    dim_level: int
+
+
+def ramp_values(
+    start: tuple[int, int],
+    end: tuple[int, int],
+    progress: float,
+) -> tuple[int, int]:
+    """Quantized Kelvin and dim level ``progress`` of the way to ``end``.
+
+    Kelvin is interpolated in mireds so equal time slices look like equal
+    colour shifts.
+    """
+    if progress >= 1.0:
+        return int(end[0]), int(end[1])
+    progress = max(0.0, progress)
+    start_mired, end_mired = 1e6 / start[0], 1e6 / end[0]
+    kelvin = 1e6 / (start_mired + (end_mired - start_mired) * progress)
+    dim = start[1] + (end[1] - start[1]) * progress
+    return (
+        int(round(kelvin / RAMP_TEMPERATURE_STEP)) * RAMP_TEMPERATURE_STEP,
+        int(round(dim / RAMP_DIM_STEP)) * RAMP_DIM_STEP,
+    )
+
+
+def _next_ramp_progress(
+    start: tuple[int, int],
+    end: tuple[int, int],
+    progress: float,
+) -> float:
+    """Progress at which ``ramp_values`` next changes, at most 1.0."""
+
+    kelvin, dim = ramp_values(start, end, progress)
+    candidates = [1.0]
+    if start[0] != end[0]:
+        half = RAMP_TEMPERATURE_STEP / 2
+        edge = kelvin + (half if end[0] > start[0] else -half)
+        start_mired, end_mired = 1e6 / start[0], 1e6 / end[0]
+        candidates.append((1e6 / edge - start_mired) / (end_mired - start_mired))
+    if start[1] != end[1]:
+        half = RAMP_DIM_STEP / 2
+        edge = dim + (half if end[1] > start[1] else -half)
+        candidates.append((edge - start[1]) / (end[1] - start[1]))
+    return min(candidate for candidate in candidates if candidate > progress)
+
+
+def _preset_values(profile: str) -> tuple[int, int]:
+    from opencareyes.config.presets import PRESETS
+
+    preset = PRESETS[profile]
+    return int(preset["temp"]), int(preset["dim"])
 
 
 @dataclass(frozen=True, slots=True)
@@ -36,6 +311,7 @@ class SchedulerRuntimeSnapshot:
     next_profile: str | None
     timer_active: bool
     timer_remaining_ms: int
+    timer_purpose: str = "boundary"
 
 
 class Scheduler(QObject):
@@ -49,6 +325,7 @@ class Scheduler(QObject):
 
     filter_state_requested = Signal(bool)
     profile_requested = Signal(str)
+    ramp_requested = Signal(object)  # ScheduleRampStep
     next_event_changed = Signal(object)  # datetime | None
     next_profile_changed = Signal(object)  # str | None
     running_changed = Signal(bool)
@@ -63,14 +340,26 @@ class Scheduler(QObject):
         *,
         now_provider: Callable[[], datetime] | None = None,
         sun_calculator: Callable | None = None,
+        solar_calendar: SolarCalendar | None = None,
+        profile_values: Callable[[str], tuple[int, int]] | None = None,
     ):
         super().__init__(parent)
         _ = blue_filter  # accepted only for source compatibility
         self._settings = settings
         self._now_provider = now_provider or (lambda: datetime.now().astimezone())
         self._sun_calculator = sun_calculator or sun
+        self._solar_calendar = solar_calendar or SolarCalendar(
+            sun_calculator=self._sun_calculator
+        )
+        self._profile_values = profile_values or _preset_values
+        self._schedule_index: ScheduleIndex | None = None
+        self._schedule_key: tuple | None = None
         self._state_callback: Callable[[bool], None] | None = None
         self._profile_callback: Callable[[str], None] | None = None
+        self._ramp_callback: Callable[[ScheduleRampStep], None] | None = None
+        self._ramp_step: ScheduleRampStep | None = None
+        # Whether the single timer waits for a boundary or a ramp step.
+        self._timer_purpose = "boundary"
 
         self._timer = QTimer(self)
         self._timer.setSingleShot(True)
@@ -114,6 +403,13 @@ class Scheduler(QObject):
         """Route selected day/night profiles through a controller."""
         self._profile_callback = callback
 
+    def set_ramp_callback(
+        self,
+        callback: Callable[[ScheduleRampStep], None] | None,
+    ) -> None:
+        """Route interpolated pre-boundary display values through a controller."""
+        self._ramp_callback = callback
+
     def set_manual_override(self, enabled: bool = True) -> None:
         """Keep a manual choice until the next schedule boundary."""
         value = bool(enabled)
@@ -138,6 +434,7 @@ class Scheduler(QObject):
         self._running = False
         self.set_manual_override(False)
         self._current_profile = None
+        self._ramp_step = None
         self._set_next_event(None, None, None)
         if was_running:
             self.running_changed.emit(False)
@@ -165,6 +462,7 @@ class Scheduler(QObject):
             next_profile=self._next_profile,
             timer_active=self._timer.isActive(),
             timer_remaining_ms=max(1, int(remaining)) if remaining >= 0 else -1,
+            timer_purpose=self._timer_purpose,
         )
 
     def restore_runtime(self, snapshot: SchedulerRuntimeSnapshot) -> None:
@@ -183,6 +481,7 @@ class Scheduler(QObject):
             snapshot.next_event_at,
             snapshot.next_profile,
         )
+        self._timer_purpose = snapshot.timer_purpose
         if snapshot.timer_active and snapshot.running:
             self._timer.start(max(1, int(snapshot.timer_remaining_ms)))
         if old_override != self._manual_override:
@@ -193,6 +492,9 @@ class Scheduler(QObject):
     def _on_timer(self) -> None:
         if not self._running:
             return
+        if self._timer_purpose == "ramp":
+            self._evaluate_and_schedule(apply_current=True, ramp_wake=True)
+            return
         self.set_manual_override(False)
         self._evaluate_and_schedule(apply_current=True)
 
@@ -201,7 +503,9 @@ class Scheduler(QObject):
         *,
         apply_current: bool,
         arm_timer: bool = True,
+        ramp_wake: bool = False,
     ) -> None:
+        self._timer_purpose = "boundary"
         try:
             now = self._normalise_now(self._now_provider())
             mode = getattr(self._settings, "schedule_mode", "sun")
@@ -223,28 +527,104 @@ class Scheduler(QObject):
                 self._timer.start(60 * 60 * 1000)
             return
 
+        if ramp_wake and (
+            self._next_event_at is None or now >= self._next_event_at
+        ):
+            # The boundary passed while waiting for a ramp step.
+            ramp_wake = False
+            self.set_manual_override(False)
         self._current_profile = decision.current_profile
         self._set_next_event(
             decision.next_event,
             decision.next_event_at,
             decision.next_profile,
         )
-        if apply_current and not self._manual_override:
+        if apply_current and not ramp_wake and not self._manual_override:
             self._request_scheduled_profile(
                 decision.night_active, decision.current_profile
             )
+        step, ramp_at = self._ramp_plan(decision, now)
+        if step is None:
+            self._ramp_step = None
+        elif (
+            apply_current
+            and self._running
+            and not self._manual_override
+            and step != self._ramp_step
+        ):
+            self._ramp_step = step
+            self._request_ramp(step)
         if self._running and arm_timer:
+            target = decision.next_event_at
+            if (
+                ramp_at is not None
+                and ramp_at < target
+                and not self._manual_override
+            ):
+                target = ramp_at
+                self._timer_purpose = "ramp"
             delay_ms = max(
                 1000,
-                int((decision.next_event_at - now).total_seconds() * 1000),
+                int((target - now).total_seconds() * 1000),
             )
             self._timer.start(min(delay_ms, 2_147_483_647))
-            log.info(
-                "Next schedule event: %s -> %s at %s",
-                decision.next_event,
-                decision.next_profile,
-                decision.next_event_at.isoformat(),
-            )
+            if self._timer_purpose == "boundary":
+                log.info(
+                    "Next schedule event: %s -> %s at %s",
+                    decision.next_event,
+                    decision.next_profile,
+                    decision.next_event_at.isoformat(),
+                )
+
+    def _ramp_plan(
+        self,
+        decision: _ScheduleDecision,
+        now: datetime,
+    ) -> tuple[ScheduleRampStep | None, datetime | None]:
+        """Return the ramp step for ``now`` and when its value next changes.
+
+        Ramps only lead into a rule profile, starting ``schedule_ramp_minutes``
+        before its boundary; the boundary itself still commits the profile.
+        """
+        minutes = self._ramp_minutes()
+        if (
+            minutes <= 0
+            or not decision.next_night
+            or decision.next_profile == decision.current_profile
+        ):
+            return None, None
+        window = timedelta(minutes=minutes)
+        begins = decision.next_event_at - window
+        if now < begins:
+            return None, begins
+        try:
+            start = self._profile_values(decision.current_profile)
+            end = self._profile_values(decision.next_profile)
+        except (KeyError, TypeError, ValueError):
+            log.warning("Schedule ramp skipped for an unknown display profile")
+            return None, None
+        if start == end:
+            return None, None
+        progress = (now - begins) / window
+        values = ramp_values(start, end, progress)
+        # Wake just past the rounding edge so the new value is certain.
+        ramp_at = (
+            begins
+            + window * _next_ramp_progress(start, end, progress)
+            + timedelta(seconds=1)
+        )
+        if ramp_at >= decision.next_event_at:
+            ramp_at = None
+        if values == ramp_values(start, end, 0.0):
+            return None, ramp_at
+        return ScheduleRampStep(decision.next_profile, *values), ramp_at
+
+    def _ramp_minutes(self) -> int:
+        try:
+            minutes = int(getattr(self._settings, "schedule_ramp_minutes", 0))
+        except (TypeError, ValueError):
+            return 0
+        return max(0, min(180, minutes))
 
     def _sun_schedule(self, now: datetime) -> _ScheduleDecision:
         if self._settings is None:
@@ -263,57 +643,18 @@ class Scheduler(QObject):
         sunrise_offset = self._offset("sunrise_offset")
         sunset_offset = self._offset("sunset_offset")
 
-        location = LocationInfo(
-            latitude=float(self._settings.latitude),
-            longitude=float(self._settings.longitude),
-        )
-        calculated: dict[object, dict[str, datetime]] = {}
-
-        def boundaries(day):
-            if day not in calculated:
-                calculated[day] = self._sun_calculator(
-                    location.observer,
-                    date=day,
-                    tzinfo=now.tzinfo,
-                )
-            return calculated[day]
-
-        intervals: list[tuple[datetime, datetime]] = []
-        for offset in range(-8, 15):
-            day = now.date() + timedelta(days=offset)
-            if day.weekday() not in days:
-                continue
-            sunset = boundaries(day)["sunset"] + timedelta(
-                minutes=sunset_offset
-            )
-            next_day = day + timedelta(days=1)
-            sunrise = boundaries(next_day)["sunrise"] + timedelta(
-                minutes=sunrise_offset
-            )
-            if sunrise <= sunset:
-                raise ValueError("计算得到的日出时间必须晚于前一日的日落时间")
-            intervals.append((sunset, sunrise))
-
-        for sunset, sunrise in intervals:
-            if sunset <= now < sunrise:
-                return _ScheduleDecision(
-                    True,
-                    night_profile,
-                    "sunrise",
-                    sunrise,
-                    day_profile,
-                )
-
-        future_sunsets = [sunset for sunset, _ in intervals if sunset > now]
-        if not future_sunsets:
-            raise RuntimeError("无法计算下一次日落自动化动作")
-        return _ScheduleDecision(
-            False,
-            day_profile,
-            "sunset",
-            min(future_sunsets),
+        rule = ScheduleRule(
+            ScheduleTime.sunset(sunset_offset),
+            ScheduleTime.sunrise(sunrise_offset),
             night_profile,
+            frozenset(days),
+        )
+        location = (
+            float(self._settings.latitude),
+            float(self._settings.longitude),
         )
+        rules = (rule, *self._stage_rules(rule.days))
+        return self._indexed_decision(now, rules, day_profile, location)
 
     def _fixed_schedule(self, now: datetime) -> _ScheduleDecision:
         if self._settings is None:
@@ -324,36 +665,83 @@ class Scheduler(QObject):
         if not days:
             raise ValueError("请至少选择一个执行日")
         day_profile, night_profile = self._profiles()
+        rule = ScheduleRule(
+            ScheduleTime.clock(on_time),
+            ScheduleTime.clock(off_time),
+            night_profile,
+            frozenset(days),
+        )
+        rules = (rule, *self._stage_rules(rule.days))
+        location = None
+        if any(
+            point.anchor != "clock" for stage in rules for point in (stage.start, stage.end)
+        ) and getattr(self._settings, "location_configured", True):
+            location = (
+                float(self._settings.latitude),
+                float(self._settings.longitude),
+            )
+        return self._indexed_decision(now, rules, day_profile, location)
 
-        intervals: list[tuple[datetime, datetime]] = []
-        for offset in range(-8, 9):
-            day = now.date() + timedelta(days=offset)
-            if day.weekday() not in days:
-                continue
-            start = datetime.combine(day, on_time, tzinfo=now.tzinfo)
-            end_day = day + timedelta(days=1) if off_time <= on_time else day
-            end = datetime.combine(end_day, off_time, tzinfo=now.tzinfo)
-            intervals.append((start, end))
-
-        for start, end in intervals:
-            if start <= now < end:
-                return _ScheduleDecision(
-                    True,
-                    night_profile,
-                    "off",
-                    end,
-                    day_profile,
-                )
+    def _stage_rules(self, days: frozenset[int]) -> tuple[ScheduleRule, ...]:
+        """Configured evening stages, layered over the night rule in order."""
+
+        return tuple(
+            ScheduleRule(
+                ScheduleTime.parse(stage["start"]),
+                ScheduleTime.parse(stage["end"]),
+                str(stage["profile"]),
+                days,
+            )
+            for stage in getattr(self._settings, "schedule_stages", ())
+        )
 
-        future_starts = [start for start, _ in intervals if start > now]
-        if not future_starts:
-            raise RuntimeError("无法计算下一次固定时间自动化动作")
+    def _indexed_decision(
+        self,
+        now: datetime,
+        rules: tuple[ScheduleRule, ...],
+        day_profile: str,
+        location: tuple[float, float] | None,
+    ) -> _ScheduleDecision:
+        """Answer from the compiled index, recompiling only when it is stale."""
+
+        key = (rules, location, zone_key(now.tzinfo))
+        index = self._schedule_index
+        if (
+            index is None
+            or key != self._schedule_key
+            or not index.covers(now)
+            or index.next_boundary(now) is None
+        ):
+            sun_events = None
+            if location is not None:
+                calendar = self._solar_calendar
+                latitude, longitude = location
+                zone = now.tzinfo
+
+                def sun_events(day):
+                    return calendar.sun_events(latitude, longitude, day, zone)
+
+            self._schedule_index = self._schedule_key = None
+            index = compile_schedule(
+                rules,
+                now.date(),
+                _INDEX_DAYS,
+                zone=now.tzinfo,
+                sun_events=sun_events,
+            )
+            self._schedule_index, self._schedule_key = index, key
+
+        boundary = index.next_boundary(now)
+        if boundary is None:
+            raise RuntimeError("无法计算下一次自动化动作")
+        profile = index.profile_at(now)
         return _ScheduleDecision(
-            False,
-            day_profile,
-            "on",
-            min(future_starts),
-            night_profile,
+            profile is not None,
+            profile or day_profile,
+            boundary.event,
+            boundary.at,
+            boundary.profile or day_profile,
+            boundary.profile is not None,
         )
 
     def _profiles(self) -> tuple[str, str]:
@@ -396,6 +784,11 @@ class Scheduler(QObject):
         if self._state_callback is not None:
             self._state_callback(night_active)
 
+    def _request_ramp(self, step: ScheduleRampStep) -> None:
+        self.ramp_requested.emit(step)
+        if self._ramp_callback is not None:
+            self._ramp_callback(step)
+
     def _set_next_event(
         self,
         event: str | None,
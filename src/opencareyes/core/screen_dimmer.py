@@ -1,11 +1,13 @@
 """Software screen dimming via transparent overlays."""
 
 import logging
+from collections.abc import Mapping
 
 from PySide6.QtCore import QObject, Qt, Signal
-from PySide6.QtGui import QColor, QPainter, QScreen
+from PySide6.QtGui import QColor, QGuiApplication, QPainter, QScreen
 from PySide6.QtWidgets import QApplication, QWidget
 
+from opencareyes.core.overlay_pool import OverlayPool, screen_key
 from opencareyes.platform.win32_api import (
     GWL_EXSTYLE,
     WS_EX_LAYERED,
@@ -17,6 +19,10 @@ from opencareyes.platform.win32_api import (
 
 log = logging.getLogger(__name__)
 
+# Qt platform plugins that draw no real windows, so window opacity has no
+# visible effect and the overlay must paint its own alpha.
+_PAINTED_PLATFORMS = frozenset({"minimal", "offscreen", "vnc"})
+
 
 def _make_click_through(widget: QWidget):
     """Force Win32 WS_EX_TRANSPARENT so the window passes all mouse input."""
@@ -30,21 +36,58 @@ def _make_click_through(widget: QWidget):
     )
 
 
+def _window_opacity_available() -> bool:
+    return QGuiApplication.platformName() not in _PAINTED_PLATFORMS
+
+
 class DimOverlay(QWidget):
-    """Full-screen transparent overlay for software dimming."""
+    """Full-screen overlay for software dimming.
 
-    def __init__(self, screen: QScreen):
+    By default the overlay is painted opaque black once and its intensity is
+    the layered-window alpha, so a level change never repaints the surface.
+    With ``window_opacity=False`` (or on platforms without real windows) it
+    falls back to painting a translucent fill for every level.
+    """
+
+    def __init__(self, screen: QScreen, *, window_opacity: bool | None = None):
         super().__init__()
         self.setWindowFlags(
             Qt.FramelessWindowHint
             | Qt.WindowStaysOnTopHint
             | Qt.Tool
         )
-        self.setAttribute(Qt.WA_TranslucentBackground)
+        self._window_opacity = (
+            _window_opacity_available() if window_opacity is None else window_opacity
+        )
+        if self._window_opacity:
+            self.setAttribute(Qt.WA_OpaquePaintEvent)
+            self.setAttribute(Qt.WA_NoSystemBackground)
+            self.setWindowOpacity(0.0)
+        else:
+            self.setAttribute(Qt.WA_TranslucentBackground)
         self.setAttribute(Qt.WA_TransparentForMouseEvents)
         self.setAttribute(Qt.WA_ShowWithoutActivating)
         self.setGeometry(screen.geometry())
+        self._screen_key = screen_key(screen)
         self._opacity = 0
+        self._paint_count = 0
+
+    @property
+    def screen_key(self) -> str:
+        return self._screen_key
+
+    @property
+    def dim_level(self) -> int:
+        return self._opacity
+
+    @property
+    def uses_window_opacity(self) -> bool:
+        return self._window_opacity
+
+    @property
+    def paint_count(self) -> int:
+        """Number of paint events so far; a probe for repaint cost."""
+        return self._paint_count
 
     def showEvent(self, event):
         """After the window is shown, apply Win32 click-through."""
@@ -53,12 +96,30 @@ class DimOverlay(QWidget):
 
     def set_dim_level(self, level: int):
         """Set dim level (0=no dim, 200=max dim)."""
-        self._opacity = max(0, min(200, level))
+        level = max(0, min(200, level))
+        if level == self._opacity:
+            return
+        self._opacity = level
+        if self._window_opacity:
+            try:
+                self.setWindowOpacity(level / 255.0)
+                return
+            except Exception:
+                log.exception("Window opacity failed; painting the dim level")
+                self._use_painted_alpha()
         self.update()
 
+    def _use_painted_alpha(self) -> None:
+        self._window_opacity = False
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+        self.setAttribute(Qt.WA_NoSystemBackground, False)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+
     def paintEvent(self, event):
+        self._paint_count += 1
+        alpha = 255 if self._window_opacity else self._opacity
         painter = QPainter(self)
-        painter.fillRect(self.rect(), QColor(0, 0, 0, self._opacity))
+        painter.fillRect(self.rect(), QColor(0, 0, 0, alpha))
         painter.end()
 
 
@@ -69,9 +130,10 @@ class ScreenDimmer(QObject):
 
     def __init__(self, *, watch_screen_events: bool = True):
         super().__init__()
-        self._overlays: list[DimOverlay] = []
+        self._pool: OverlayPool[DimOverlay] = OverlayPool(DimOverlay)
         self._enabled = False
         self._dim_level = 0
+        self._screen_levels: dict[str, int] = {}
         self._last_error_code = ""
         self._last_error_message = ""
         self._watched_screens: set[int] = set()
@@ -90,6 +152,10 @@ class ScreenDimmer(QObject):
     def dim_level(self) -> int:
         return self._dim_level
 
+    @property
+    def screen_levels(self) -> dict[str, int]:
+        return dict(self._screen_levels)
+
     @property
     def last_error_code(self) -> str:
         return self._last_error_code
@@ -111,11 +177,7 @@ class ScreenDimmer(QObject):
             )
             return False
         try:
-            for overlay in self._overlays:
-                overlay.set_dim_level(level)
-                overlay.show()
-                if not overlay.isVisible():
-                    raise RuntimeError("overlay did not become visible")
+            self._show(self._pool.overlays)
         except Exception:
             log.exception("Failed to show all dimmer overlays")
             self.disable()
@@ -132,16 +194,7 @@ class ScreenDimmer(QObject):
 
     def disable(self) -> bool:
         """Hide and remove all overlays."""
-        success = True
-        for overlay in self._overlays:
-            try:
-                overlay.hide()
-                overlay.close()
-                overlay.deleteLater()
-            except Exception:
-                success = False
-                log.exception("Failed to remove a dimmer overlay")
-        self._overlays.clear()
+        success = self._pool.clear()
         self._enabled = False
         self._dim_level = 0
         if success:
@@ -158,26 +211,68 @@ class ScreenDimmer(QObject):
     def set_brightness(self, level: int) -> bool:
         """Update dim level on all overlays."""
         self._dim_level = max(0, min(200, level))
-        if self._enabled and not self._overlays:
+        if self._enabled and not len(self._pool):
             self._report_failure(
                 "dimmer_overlay_missing",
                 "调暗层已丢失，请重新启用。",
             )
             self._enabled = False
             return False
-        for overlay in self._overlays:
-            overlay.set_dim_level(self._dim_level)
+        for overlay in self._pool.overlays:
+            overlay.set_dim_level(self._level_for(overlay))
         return True
 
+    def set_screen_levels(self, levels: Mapping[str, int]) -> bool:
+        """Give individual screens their own dim level.
+
+        Keys are casefolded screen device names; other screens keep the shared
+        level. Overlays whose level does not change are not repainted.
+        """
+        normalized = {
+            str(key).strip().casefold(): max(0, min(200, int(level)))
+            for key, level in levels.items()
+            if str(key).strip()
+        }
+        if normalized == self._screen_levels:
+            return True
+        self._screen_levels = normalized
+        if not self._enabled:
+            return True
+        return self.set_brightness(self._dim_level)
+
+    def _level_for(self, overlay: DimOverlay) -> int:
+        return self._screen_levels.get(overlay.screen_key, self._dim_level)
+
     def refresh_screens(self) -> bool:
-        """Recreate overlays when screen configuration changes."""
-        was_enabled = self._enabled
-        saved_level = self._dim_level
-        if not was_enabled:
+        """Align overlays with the current screens, reusing unchanged ones."""
+        if not self._enabled:
             return True
-        if not self.disable():
+        screens = self._screens()
+        try:
+            if not screens:
+                raise RuntimeError("no screens are available")
+            self._show(self._pool.sync(screens))
+        except Exception:
+            log.exception("Failed to align dimmer overlays with the screens")
+            self.disable()
+            self._report_failure(
+                "dimmer_overlay_failed",
+                "调暗层未能在所有屏幕上显示。",
+            )
             return False
-        return self.enable(saved_level)
+        return True
+
+    def _show(self, overlays) -> None:
+        for overlay in overlays:
+            overlay.set_dim_level(self._level_for(overlay))
+            overlay.show()
+            if not overlay.isVisible():
+                raise RuntimeError("overlay did not become visible")
+
+    @staticmethod
+    def _screens() -> list[QScreen]:
+        app = QApplication.instance()
+        return list(app.screens()) if app is not None else []
 
     def _on_screens_changed(self, *_):
         """Keep overlay topology aligned with monitor hot-plug events."""
@@ -212,14 +307,9 @@ class ScreenDimmer(QObject):
             log.warning("No screens are available; cannot create overlays")
             return False
         try:
-            for screen in screens:
-                overlay = DimOverlay(screen)
-                self._overlays.append(overlay)
+            self._pool.sync(screens)
         except Exception:
             log.exception("Failed to create dimmer overlays")
-            for overlay in self._overlays:
-                overlay.close()
-                overlay.deleteLater()
-            self._overlays.clear()
+            self._pool.clear()
             return False
-        return len(self._overlays) == len(screens)
+        return len(self._pool) == len(screens)
@@ -0,0 +1,255 @@
+"""Yearly sunrise/sunset tables cached in memory and on disk."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import date, datetime, timedelta, tzinfo
+from pathlib import Path
+
+from astral import LocationInfo
+from astral.sun import sun
+
+log = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+# Two decimals is roughly 1 km, which moves sun events by a few seconds.
+COORDINATE_PRECISION = 2
+
+_YearKey = tuple[float, float, str, int]
+
+
+def zone_key(zone: tzinfo | None) -> str:
+    """Stable name for the zone that assigns events to local dates."""
+
+    name = getattr(zone, "key", None)
+    if name:
+        return str(name)
+    try:
+        offset = zone.utcoffset(None) if zone is not None else None
+    except Exception:
+        offset = None
+    if offset is not None:
+        return f"{int(offset.total_seconds())}s"
+    return str(zone)
+
+
+class SolarYear:
+    """Sunrise and sunset instants for every local date of one year.
+
+    Times are POSIX timestamps; a day astral cannot resolve (polar day or
+    night) is ``None`` and only fails when a schedule actually needs it.
+    """
+
+    __slots__ = ("first_day", "sunrises", "sunsets")
+
+    def __init__(
+        self,
+        first_day: date,
+        sunrises: tuple[float | None, ...],
+        sunsets: tuple[float | None, ...],
+    ):
+        if len(sunrises) != len(sunsets):
+            raise ValueError("a solar year needs a sunrise and sunset per day")
+        self.first_day = first_day
+        self.sunrises = sunrises
+        self.sunsets = sunsets
+
+    def __len__(self) -> int:
+        return len(self.sunsets)
+
+    def events(self, day: date, zone: tzinfo | None) -> tuple[datetime, datetime]:
+        """Sunrise and sunset of local ``day``."""
+
+        index = (day - self.first_day).days
+        if not 0 <= index < len(self.sunsets):
+            raise ValueError(f"{day.isoformat()} 不在 {self.first_day.year} 年内")
+        sunrise = self.sunrises[index]
+        sunset = self.sunsets[index]
+        if sunrise is None or sunset is None:
+            raise ValueError(f"{day.isoformat()} 无日出或日落")
+        return (
+            datetime.fromtimestamp(sunrise, zone),
+            datetime.fromtimestamp(sunset, zone),
+        )
+
+
+class SolarCalendar:
+    """Sun events computed a year at a time and looked up by date.
+
+    Entries are keyed by rounded coordinates, local zone and year, so a
+    location edit or an offset change after DST only computes the affected
+    year. With ``path`` the tables are persisted and reused after restart.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] | None = None,
+        *,
+        sun_calculator: Callable | None = None,
+        max_years: int = 6,
+    ):
+        self._path = Path(path) if path is not None else None
+        self._sun_calculator = sun_calculator or sun
+        self._max_years = max(1, int(max_years))
+        self._years: OrderedDict[_YearKey, SolarYear] = OrderedDict()
+        self._loaded = self._path is None
+        self._compute_count = 0
+
+    @property
+    def compute_count(self) -> int:
+        """Number of years computed rather than served from cache or disk."""
+
+        return self._compute_count
+
+    def year(
+        self,
+        latitude: float,
+        longitude: float,
+        zone: tzinfo | None,
+        year: int,
+    ) -> SolarYear:
+        self._load()
+        key = (
+            round(float(latitude), COORDINATE_PRECISION),
+            round(float(longitude), COORDINATE_PRECISION),
+            zone_key(zone),
+            int(year),
+        )
+        table = self._years.get(key)
+        if table is not None:
+            self._years.move_to_end(key)
+            return table
+        table = self._compute(key[0], key[1], zone, key[3])
+        self._years[key] = table
+        while len(self._years) > self._max_years:
+            self._years.popitem(last=False)
+        self._save()
+        return table
+
+    def sun_events(
+        self,
+        latitude: float,
+        longitude: float,
+        day: date,
+        zone: tzinfo | None,
+    ) -> tuple[datetime, datetime]:
+        """Sunrise and sunset of local ``day``."""
+
+        return self.year(latitude, longitude, zone, day.year).events(day, zone)
+
+    def clear(self) -> None:
+        """Drop every cached year, including the persisted copy."""
+
+        self._years.clear()
+        self._loaded = True
+        self._save()
+
+    def _compute(
+        self,
+        latitude: float,
+        longitude: float,
+        zone: tzinfo | None,
+        year: int,
+    ) -> SolarYear:
+        observer = LocationInfo(latitude=latitude, longitude=longitude).observer
+        first_day = date(year, 1, 1)
+        length = (date(year + 1, 1, 1) - first_day).days
+        sunsets: list[float | None] = []
+        sunrises: list[float | None] = []
+        for offset in range(length):
+            day = first_day + timedelta(days=offset)
+            try:
+                events = self._sun_calculator(observer, date=day, tzinfo=zone)
+            except ValueError:
+                sunsets.append(None)
+                sunrises.append(None)
+                continue
+            sunsets.append(events["sunset"].timestamp())
+            sunrises.append(events["sunrise"].timestamp())
+        self._compute_count += 1
+        return SolarYear(first_day, tuple(sunrises), tuple(sunsets))
+
+    def _load(self) -> None:
+        if self._loaded:
+            return
+        self._loaded = True
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            log.warning("Cached solar calendar could not be read", exc_info=True)
+            return
+        if not isinstance(raw, dict) or raw.get("schema_version") != SCHEMA_VERSION:
+            return
+        records = raw.get("years")
+        if not isinstance(records, list):
+            return
+        for record in records[-self._max_years:]:
+            try:
+                key = (
+                    float(record["latitude"]),
+                    float(record["longitude"]),
+                    str(record["zone"]),
+                    int(record["year"]),
+                )
+                table = SolarYear(
+                    date(key[3], 1, 1),
+                    _timestamps(record["sunrises"]),
+                    _timestamps(record["sunsets"]),
+                )
+                if len(table) != (date(key[3] + 1, 1, 1) - table.first_day).days:
+                    raise ValueError("incomplete solar year")
+            except (KeyError, TypeError, ValueError):
+                log.warning("Ignoring a damaged cached solar year")
+                continue
+            self._years[key] = table
+
+    def _save(self) -> None:
+        if self._path is None:
+            return
+        try:
+            if not self._years:
+                self._path.unlink(missing_ok=True)
+                return
+            payload = {
+                "schema_version": SCHEMA_VERSION,
+                "years": [
+                    {
+                        "latitude": key[0],
+                        "longitude": key[1],
+                        "zone": key[2],
+                        "year": key[3],
+                        "sunrises": list(table.sunrises),
+                        "sunsets": list(table.sunsets),
+                    }
+                    for key, table in self._years.items()
+                ],
+            }
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            fd, temporary_name = tempfile.mkstemp(
+                prefix=f".{self._path.name}.",
+                suffix=".tmp",
+                dir=self._path.parent,
+            )
+            temporary = Path(temporary_name)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8", newline="\n") as handle:
+                    json.dump(payload, handle, separators=(",", ":"))
+                os.replace(temporary, self._path)
+            except OSError:
+                temporary.unlink(missing_ok=True)
+                raise
+        except OSError:
+            log.exception("Failed to persist the solar calendar")
+
+
+def _timestamps(values) -> tuple[float | None, ...]:
+    if not isinstance(values, list):
+        raise TypeError("solar events must be a list")
+    return tuple(None if value is None else float(value) for value in values)
@@ -1,5 +1,6 @@
 """Pure domain models and policies for context-aware behaviour."""
 
+from opencareyes.domain.activity import ActivityAccumulator
 from opencareyes.domain.context import (
     AppRule,
     AutoPausePreferences,
@@ -47,6 +48,7 @@ __all__ = [
     'PetVisualTheme',
     'PetState',
     'priority_for_event_kind',
+    "ActivityAccumulator",
     "AppRule",
     "AutoPausePolicy",
     "AutoPausePreferences",
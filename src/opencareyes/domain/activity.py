@@ -0,0 +1,144 @@
+"""Input-driven active screen time with a bounded per-minute history."""
+
+from __future__ import annotations
+
+import math
+
+
+class ActivityAccumulator:
+    """Credit only the time in which the user was actually giving input.
+
+    Each sample reports how long input has been idle. The interval since the
+    previous sample counts as active up to ``grace_seconds`` after the last
+    input, so reading or watching briefly without touching the keyboard still
+    counts while a walk away does not. Credit per sample is capped at
+    ``max_gap_seconds``, which keeps a stalled or suspended sensor from
+    crediting its whole gap and bounds the work per sample.
+
+    Active minutes are kept as one bit each in a ring buffer covering
+    ``history_minutes``; a week of history is about 1.3 KB.
+    """
+
+    __slots__ = (
+        "_grace",
+        "_max_gap",
+        "_history",
+        "_bits",
+        "_head_minute",
+        "_last_sample_at",
+        "_active_seconds",
+    )
+
+    def __init__(
+        self,
+        *,
+        grace_seconds: float = 60.0,
+        max_gap_seconds: float = 5.0,
+        history_minutes: int = 7 * 24 * 60,
+    ) -> None:
+        self._grace = 0.0
+        self.grace_seconds = grace_seconds
+        self._max_gap = max(0.0, float(max_gap_seconds))
+        self._history = max(1, int(history_minutes))
+        self._bits = bytearray((self._history + 7) // 8)
+        self._head_minute: int | None = None
+        self._last_sample_at: float | None = None
+        self._active_seconds = 0.0
+
+    @property
+    def grace_seconds(self) -> float:
+        return self._grace
+
+    @grace_seconds.setter
+    def grace_seconds(self, value: float) -> None:
+        value = float(value)
+        if not 0 <= value <= 10 * 60:
+            raise ValueError("活跃宽限时间必须在 0 到 600 秒之间")
+        self._grace = value
+
+    @property
+    def active_seconds(self) -> float:
+        """Total credited active time since creation or :meth:`reset`."""
+
+        return self._active_seconds
+
+    @property
+    def last_sample_at(self) -> float | None:
+        return self._last_sample_at
+
+    @property
+    def history_minutes(self) -> int:
+        return self._history
+
+    def is_live(self, now: float, stale_after: float | None = None) -> bool:
+        """Whether samples are arriving, so credited time can be trusted."""
+
+        if self._last_sample_at is None:
+            return False
+        limit = self._max_gap if stale_after is None else float(stale_after)
+        return now - self._last_sample_at <= limit
+
+    def observe(self, now: float, idle_seconds: float) -> float:
+        """Ingest one sample and return the seconds it credited.
+
+        ``idle_seconds`` may be ``math.inf`` when no input can happen, for
+        example while the session is locked.
+        """
+
+        previous = self._last_sample_at
+        self._last_sample_at = now
+        if previous is None or now <= previous:
+            return 0.0
+        start = max(previous, now - self._max_gap)
+        active_until = min(now, now - max(0.0, float(idle_seconds)) + self._grace)
+        if active_until <= start:
+            return 0.0
+        credited = active_until - start
+        self._active_seconds += credited
+        first = math.floor(start / 60)
+        last = math.floor(math.nextafter(active_until, -math.inf) / 60)
+        for minute in range(max(first, last - self._history + 1), last + 1):
+            self._mark(minute)
+        return credited
+
+    def minute_active(self, minute: int) -> bool:
+        """Whether absolute minute ``minute`` (``now // 60``) saw activity."""
+
+        if self._head_minute is None:
+            return False
+        if not self._head_minute - self._history < minute <= self._head_minute:
+            return False
+        slot = minute % self._history
+        return bool(self._bits[slot >> 3] & (1 << (slot & 7)))
+
+    def active_minutes(self, now: float, window_minutes: int) -> int:
+        """Count active minutes among the last ``window_minutes`` up to ``now``."""
+
+        end = math.floor(now / 60)
+        window = max(0, min(int(window_minutes), self._history))
+        return sum(
+            1 for minute in range(end - window + 1, end + 1)
+            if self.minute_active(minute)
+        )
+
+    def reset(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self._head_minute = None
+        self._last_sample_at = None
+        self._active_seconds = 0.0
+
+    def _mark(self, minute: int) -> None:
+        head = self._head_minute
+        if head is None or minute - head >= self._history:
+            self._bits = bytearray(len(self._bits))
+            head = minute - 1
+        elif minute <= head - self._history:
+            return
+        # Minutes skipped since the head are idle; clear their stale bits.
+        for skipped in range(head + 1, minute + 1):
+            slot = skipped % self._history
+            self._bits[slot >> 3] &= ~(1 << (slot & 7)) & 0xFF
+        if minute > head:
+            self._head_minute = minute
+        slot = minute % self._history
+        self._bits[slot >> 3] |= 1 << (slot & 7)
@@ -7,10 +7,13 @@ import math
 import sys
 from collections.abc import Callable, Iterable
 from dataclasses import dataclass
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
 from PySide6.QtGui import QGuiApplication
 
+if TYPE_CHECKING:
+    from opencareyes.core.monitor_manager import MonitorManager
+
 if sys.platform == "win32":
     from opencareyes.platform import win32_api as api
 else:  # pragma: no cover - Windows is the supported production platform.
@@ -94,8 +97,12 @@ class Win32WindowGeometryBackend:
         self,
         *,
         ignored_hwnds: Callable[[], set[int] | frozenset[int]] | None = None,
+        monitor_manager: MonitorManager | None = None,
     ) -> None:
         self._ignored_hwnds = ignored_hwnds or (lambda: frozenset())
+        self._monitor_manager = monitor_manager
+        self._monitor_generation = -1
+        self._cached_monitors: tuple[MonitorGeometry, ...] = ()
 
     def sample(self) -> WindowGeometrySnapshot:
         if api is None:
@@ -152,8 +159,20 @@ class Win32WindowGeometryBackend:
         sampled = _screen_rect(rect)
         return sampled if sampled.is_valid else None
 
+    def _monitors(self) -> tuple[MonitorGeometry, ...]:
+        manager = self._monitor_manager
+        if manager is None:
+            return self._enumerate_monitors()
+        # The shared topology cache is invalidated by display-change events;
+        # rebuild the work areas only when its generation moves.
+        generation = manager.generation
+        if generation != self._monitor_generation:
+            self._cached_monitors = _monitor_geometries(manager.get_monitors())
+            self._monitor_generation = generation
+        return self._cached_monitors
+
     @staticmethod
-    def _monitors() -> tuple[MonitorGeometry, ...]:
+    def _enumerate_monitors() -> tuple[MonitorGeometry, ...]:
         monitors: list[MonitorGeometry] = []
 
         @api.MONITORENUMPROC
@@ -352,5 +371,20 @@ def _handle_value(handle) -> int:
     return int(getattr(handle, "value", handle) or 0)
 
 
+def _monitor_geometries(records) -> tuple[MonitorGeometry, ...]:
+    monitors: list[MonitorGeometry] = []
+    for record in records:
+        work_area = ScreenRect(*record.work_area)
+        if work_area.is_valid:
+            monitors.append(
+                MonitorGeometry(
+                    monitor_id=_monitor_id(record.handle),
+                    work_area=work_area,
+                    device_name=str(record.name).strip() or None,
+                )
+            )
+    return tuple(monitors)
+
+
 def _monitor_id(handle) -> str:
     return f"monitor-{_handle_value(handle):x}"
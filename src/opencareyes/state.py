@@ -70,6 +70,7 @@ class AutomationState:
     night_profile: str = "night"
     sunrise_offset: int = 0
     sunset_offset: int = 0
+    ramp_minutes: int = 0
     smart_pause: SmartPausePreferencesState = field(
         default_factory=SmartPausePreferencesState
     )
@@ -182,6 +183,28 @@ class BreakCadenceState:
     long_remaining: int = 0
 
 
+@dataclass(frozen=True, slots=True)
+class BreakSummaryState:
+    days: int = 7
+    started: int = 0
+    completed: int = 0
+    skipped: int = 0
+    snoozed: int = 0
+    suppressed: int = 0
+    rest_seconds: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class BreakHistoryState:
+    available: bool = False
+    last_7_days: BreakSummaryState = field(
+        default_factory=lambda: BreakSummaryState(days=7)
+    )
+    last_30_days: BreakSummaryState = field(
+        default_factory=lambda: BreakSummaryState(days=30)
+    )
+
+
 @dataclass(frozen=True, slots=True)
 class BreakPromptState:
     kind: str = "none"
@@ -333,6 +356,7 @@ class AppState:
     display_health: DisplayHealthState = field(default_factory=DisplayHealthState)
     break_cadence: BreakCadenceState = field(default_factory=BreakCadenceState)
     break_prompt: BreakPromptState = field(default_factory=BreakPromptState)
+    break_history: BreakHistoryState = field(default_factory=BreakHistoryState)
     notices: tuple[UserNotice, ...] = ()
     update: UpdateState = field(default_factory=UpdateState)
     pet_catalog: PetCatalogState = field(default_factory=PetCatalogState)
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import inspect
 import ntpath
+from collections.abc import Mapping
 from datetime import datetime
 
 from PySide6.QtCore import QSignalBlocker, QTime
@@ -30,6 +31,7 @@ from opencareyes.ui.widgets import (
     Card,
     PageHeader,
     ScrollPage,
+    bind_state,
     feature_description,
     first_state_value,
     schedule_event_description,
@@ -289,7 +291,12 @@ class AutomationPage(ScrollPage):
         self._resume_context_button.clicked.connect(
             self._controller.resume_breaks_for_current_context
         )
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            ("automation", "capabilities", "context", "effective_policy", "general"),
+            self.render,
+            widget=self,
+        )
 
     def _update_mode_visibility(self, *_args) -> None:
         fixed = self._mode_combo.currentData() == "fixed"
@@ -445,7 +452,7 @@ class AutomationPage(ScrollPage):
     def _render_app_rules(self, rules) -> None:
         normalized = []
         for rule in rules:
-            getter = rule.get if isinstance(rule, dict) else lambda key, default=None: getattr(
+            getter = rule.get if isinstance(rule, Mapping) else lambda key, default=None: getattr(
                 rule, key, default
             )
             app_id = _basename_app_id(getter("app_id", ""))
@@ -18,6 +18,7 @@ from opencareyes.ui.widgets import (
     Card,
     PageHeader,
     ScrollPage,
+    bind_state,
     display_backend_description,
     first_state_value,
     set_accessible,
@@ -180,7 +181,12 @@ class BlueLightPage(ScrollPage):
         self._temperature_slider.sliderReleased.connect(self._commit_temperature)
         self._dim_slider.valueChanged.connect(self._on_dim_changed)
         self._dim_slider.sliderReleased.connect(self._commit_dim)
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            ("capabilities", "display", "display_health"),
+            self.render,
+            widget=self,
+        )
 
     def _on_temperature_changed(self, value: int) -> None:
         self._preview_temperature = value
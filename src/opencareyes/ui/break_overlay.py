@@ -6,7 +6,7 @@ from PySide6.QtCore import Qt, QTimer, Signal
 from PySide6.QtGui import QColor, QFont, QKeyEvent, QPainter, QPalette
 from PySide6.QtWidgets import QApplication, QHBoxLayout, QLabel, QPushButton, QVBoxLayout, QWidget
 
-from opencareyes.ui.widgets import first_state_value
+from opencareyes.ui.widgets import bind_state, first_state_value, watch_break_ticks
 
 
 _TIPS = (
@@ -67,10 +67,15 @@ class BreakOverlay(QWidget):
         self.apply_theme(getattr(app, "theme_snapshot", None))
 
         if controller is not None:
-            controller.state_changed.connect(self.render)
+            bind_state(
+                controller,
+                ("break_prompt", "breaks", "effective_policy"),
+                self.render,
+            )
             break_tick = getattr(controller, "break_tick", None)
             if break_tick is not None:
                 break_tick.connect(self._on_break_tick)
+            watch_break_ticks(controller, self, "break_overlay")
             self.skip_requested.connect(controller.skip_break)
             self.snooze_requested.connect(controller.snooze_break)
             resume_break = getattr(controller, "resume_break", None)
@@ -19,10 +19,12 @@ from opencareyes.ui.widgets import (
     Card,
     PageHeader,
     ScrollPage,
+    bind_state,
     first_state_value,
     format_duration,
     refresh_property,
     set_accessible,
+    watch_break_ticks,
 )
 
 
@@ -221,10 +223,16 @@ class BreakPage(ScrollPage):
         self._display_combo.currentIndexChanged.connect(self._display_mode_changed)
         self._pet_preview_button.clicked.connect(self._show_pet_preview)
         self._pet_reset_button.clicked.connect(self._reset_pet_position)
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            ("break_cadence", "breaks", "capabilities"),
+            self.render,
+            widget=self,
+        )
         break_tick = getattr(self._controller, "break_tick", None)
         if break_tick is not None:
             break_tick.connect(self._render_break_tick)
+        watch_break_ticks(self._controller, self, "break_page")
 
     def _render_break_tick(self, remaining: int, _total: int) -> None:
         state = self._controller.state
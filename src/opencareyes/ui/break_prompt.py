@@ -15,7 +15,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from opencareyes.ui.widgets import first_state_value
+from opencareyes.ui.widgets import bind_state, first_state_value
 
 
 class _UndoToast(QWidget):
@@ -148,7 +148,11 @@ class BreakPrompt(QWidget):
             undo = getattr(controller, "undo_break_snooze", None)
             if undo is not None:
                 self.undo_requested.connect(undo)
-            controller.state_changed.connect(self.render)
+            bind_state(
+                controller,
+                ("break_prompt", "breaks", "effective_policy"),
+                self.render,
+            )
             self.render(controller.state)
 
     @property
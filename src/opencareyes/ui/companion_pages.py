@@ -25,7 +25,7 @@ from opencareyes.ui.automation_page import AutomationPage, _basename_app_id
 from opencareyes.ui.blue_light_page import BlueLightPage
 from opencareyes.ui.break_page import BreakPage
 from opencareyes.ui.focus_page import FocusPage
-from opencareyes.ui.widgets import Card, PageHeader, ScrollPage, first_state_value
+from opencareyes.ui.widgets import Card, PageHeader, ScrollPage, bind_state, first_state_value
 
 
 class FerretPreview(QWidget):
@@ -227,7 +227,22 @@ class CompanionHomePage(ScrollPage):
         self.layout.addLayout(self._bottom_layout)
         self.layout.addStretch()
 
-        controller.state_changed.connect(self.render)
+        bind_state(
+            controller,
+            (
+                'break_cadence',
+                'breaks',
+                'companion',
+                'display',
+                'display_health',
+                'focus',
+                'global_pause',
+                'pet_catalog',
+                'weather',
+            ),
+            self.render,
+            widget=self,
+        )
         self.render(controller.state)
         self._apply_compact_layout(self.viewport().width() < 640)
 
@@ -460,7 +475,12 @@ class PetCatalogPage(ScrollPage):
             self._countdown_display_changed
         )
         self._weather.toggled.connect(self._toggle_weather)
-        controller.state_changed.connect(self.render)
+        bind_state(
+            controller,
+            ('breaks', 'companion', 'pet_catalog', 'quick_tools', 'weather'),
+            self.render,
+            widget=self,
+        )
         loader = getattr(controller, 'ensure_pet_catalog_loaded', None)
         if (
             callable(loader)
@@ -710,7 +730,12 @@ class CompanionAutomationPage(AutomationPage):
         super().__init__(controller, parent)
         self._app_props = AppPropRulesCard(controller)
         self.layout.insertWidget(max(0, self.layout.count() - 1), self._app_props)
-        controller.state_changed.connect(self._app_props.render)
+        bind_state(
+            controller,
+            ('context',),
+            self._app_props.render,
+            widget=self._app_props,
+        )
         self._app_props.render(controller.state)
 
 
@@ -8,7 +8,14 @@ from PySide6.QtCore import QSignalBlocker, Qt
 from PySide6.QtWidgets import QCheckBox, QHBoxLayout, QLabel, QSlider
 
 from opencareyes.constants import DIM_MAX
-from opencareyes.ui.widgets import Card, PageHeader, ScrollPage, first_state_value, set_accessible
+from opencareyes.ui.widgets import (
+    Card,
+    PageHeader,
+    ScrollPage,
+    bind_state,
+    first_state_value,
+    set_accessible,
+)
 
 
 class DimmerPage(ScrollPage):
@@ -40,7 +47,7 @@ class DimmerPage(ScrollPage):
         )
         self._slider.valueChanged.connect(lambda value: self._value.setText(f"{value}%"))
         self._slider.sliderReleased.connect(self._commit)
-        self._controller.state_changed.connect(self.render)
+        bind_state(self._controller, ("display",), self.render, widget=self)
         self.render(self._controller.state)
 
     def _commit(self) -> None:
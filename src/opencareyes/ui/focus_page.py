@@ -5,7 +5,14 @@ from __future__ import annotations
 from PySide6.QtCore import QSignalBlocker, Qt
 from PySide6.QtWidgets import QCheckBox, QComboBox, QHBoxLayout, QLabel, QPushButton, QSlider
 
-from opencareyes.ui.widgets import Card, PageHeader, ScrollPage, first_state_value, set_accessible
+from opencareyes.ui.widgets import (
+    Card,
+    PageHeader,
+    ScrollPage,
+    bind_state,
+    first_state_value,
+    set_accessible,
+)
 
 
 _FOCUS_DIM_MAX = 255
@@ -87,7 +94,12 @@ class FocusPage(ScrollPage):
             lambda value: self._dim_value.setText(f"{value}%")
         )
         self._dim_slider.sliderReleased.connect(self._commit_dim)
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            ("capabilities", "focus"),
+            self.render,
+            widget=self,
+        )
 
     def _start_focus(self) -> None:
         minutes = int(self._duration_combo.currentData())
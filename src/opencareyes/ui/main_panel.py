@@ -30,7 +30,7 @@ from opencareyes.ui.companion_pages import (
     StudyDeskPage,
 )
 from opencareyes.ui.settings_page import SettingsPage
-from opencareyes.ui.widgets import first_state_value
+from opencareyes.ui.widgets import bind_state, first_state_value
 
 
 _PAGES = (
@@ -180,7 +180,12 @@ class MainPanel(QWidget):
         self._stack.setCurrentWidget(self._ensure_page(index))
 
     def _connect_signals(self) -> None:
-        self._controller.state_changed.connect(self._render)
+        bind_state(
+            self._controller,
+            ("general", "pet_catalog"),
+            self._render,
+            widget=self,
+        )
         failed = getattr(self._controller, "operation_failed", None)
         if failed is not None:
             failed.connect(self._show_error)
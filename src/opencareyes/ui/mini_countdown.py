@@ -23,7 +23,7 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
-from opencareyes.ui.widgets import first_state_value
+from opencareyes.ui.widgets import bind_state, first_state_value, watch_break_ticks
 
 
 _MOOD_COLORS = {
@@ -236,10 +236,15 @@ class MiniCountdownWidget(QWidget):
             skip = getattr(controller, "skip_break", None)
             if skip is not None:
                 self.skip_requested.connect(skip)
-            controller.state_changed.connect(self.render)
+            bind_state(
+                controller,
+                ("break_prompt", "breaks", "effective_policy", "general"),
+                self.render,
+            )
             break_tick = getattr(controller, "break_tick", None)
             if break_tick is not None:
                 break_tick.connect(self._on_break_tick)
+            watch_break_ticks(controller, self, "mini_countdown")
             self.render(controller.state)
 
     @property
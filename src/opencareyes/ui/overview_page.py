@@ -10,8 +10,10 @@ from PySide6.QtWidgets import QGridLayout, QHBoxLayout, QLabel, QMenu, QPushButt
 from opencareyes.ui.widgets import (
     Card,
     PageHeader,
+    RenderedState,
     ScrollPage,
     StatusCard,
+    bind_state,
     display_backend_description,
     first_state_value,
     format_duration,
@@ -19,6 +21,7 @@ from opencareyes.ui.widgets import (
     set_accessible,
     suppression_reason_description,
     temperature_description,
+    watch_break_ticks,
 )
 
 
@@ -36,11 +39,29 @@ class OverviewPage(ScrollPage):
     def __init__(self, controller, parent=None):
         super().__init__(parent)
         self._controller = controller
+        self._rendered = RenderedState()
         self._build_ui()
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            (
+                "automation",
+                "break_cadence",
+                "break_history",
+                "breaks",
+                "context",
+                "display",
+                "display_health",
+                "effective_policy",
+                "focus",
+                "global_pause",
+            ),
+            self.render,
+            widget=self,
+        )
         break_tick = getattr(self._controller, "break_tick", None)
         if break_tick is not None:
             break_tick.connect(self._render_break_tick)
+        watch_break_ticks(self._controller, self, "overview_page")
         self.render(controller.state)
 
     def _render_break_tick(self, remaining: int, _total: int) -> None:
@@ -148,6 +169,11 @@ class OverviewPage(ScrollPage):
         grid.setVerticalSpacing(16)
         self._display_card = StatusCard("屏幕舒适度")
         self._break_card = StatusCard("休息节奏")
+        self._break_history = QLabel("")
+        self._break_history.setObjectName("statusDetail")
+        self._break_history.setWordWrap(True)
+        self._break_history.setVisible(False)
+        self._break_card.body.addWidget(self._break_history)
         self._resume_context_button = QPushButton("本次场景继续提醒")
         self._resume_context_button.setObjectName("secondaryButton")
         self._resume_context_button.clicked.connect(
@@ -180,6 +206,13 @@ class OverviewPage(ScrollPage):
         self.layout.addWidget(quick_card)
         self.layout.addStretch()
 
+    @staticmethod
+    def _format_break_summary(summary) -> str:
+        days = int(getattr(summary, "days", 0) or 0)
+        completed = int(getattr(summary, "completed", 0) or 0)
+        skipped = int(getattr(summary, "skipped", 0) or 0)
+        return f"近 {days} 天完成 {completed} 次，跳过 {skipped} 次"
+
     @staticmethod
     def _format_event(event: str, at) -> str:
         if not event or not at:
@@ -192,237 +225,267 @@ class OverviewPage(ScrollPage):
         return f"{when} · {action}"
 
     def render(self, state) -> None:
-        paused = bool(first_state_value(state, "global_pause.active", default=False))
-        pause_mode = str(first_state_value(state, "global_pause.mode", default="none"))
-        pause_until = first_state_value(state, "global_pause.until", default=None)
-        self._pause_banner.setVisible(paused)
-        self._pause_button.setVisible(not paused)
-        self._resume_button.setVisible(paused)
-        pause_detail = {
-            "next_schedule": "将在下一次自动切换时恢复",
-            "manual": "等待手动恢复",
-            "timed": "稍后自动恢复",
-        }.get(pause_mode, "")
-        if pause_until:
-            if isinstance(pause_until, datetime):
-                pause_detail = f"恢复时间 {pause_until.astimezone().strftime('%H:%M')}"
+        changes = self._rendered.advance(state)
+        if changes.touched("global_pause"):
+            paused = bool(first_state_value(state, "global_pause.active", default=False))
+            pause_mode = str(first_state_value(state, "global_pause.mode", default="none"))
+            pause_until = first_state_value(state, "global_pause.until", default=None)
+            self._pause_banner.setVisible(paused)
+            self._pause_button.setVisible(not paused)
+            self._resume_button.setVisible(paused)
+            pause_detail = {
+                "next_schedule": "将在下一次自动切换时恢复",
+                "manual": "等待手动恢复",
+                "timed": "稍后自动恢复",
+            }.get(pause_mode, "")
+            if pause_until:
+                if isinstance(pause_until, datetime):
+                    pause_detail = f"恢复时间 {pause_until.astimezone().strftime('%H:%M')}"
+                else:
+                    pause_detail = f"恢复时间 {pause_until}"
+            self._pause_banner_detail.setText(pause_detail)
+
+        if changes.touched(
+            "display",
+            "display_health",
+            "effective_policy.filter",
+            "effective_policy.dimmer",
+        ):
+            filter_enabled = bool(first_state_value(state, "display.filter_enabled", default=False))
+            dimmer_enabled = bool(first_state_value(state, "display.dimmer_enabled", default=False))
+            filter_suppressed = tuple(first_state_value(
+                state, "effective_policy.filter.suppressed_by", default=()
+            ))
+            dimmer_suppressed = tuple(first_state_value(
+                state, "effective_policy.dimmer.suppressed_by", default=()
+            ))
+            filter_effective = bool(first_state_value(
+                state,
+                "effective_policy.filter.effective_enabled",
+                default=filter_enabled,
+            ))
+            dimmer_effective = bool(first_state_value(
+                state,
+                "effective_policy.dimmer.effective_enabled",
+                default=dimmer_enabled,
+            ))
+            temp = int(first_state_value(state, "display.color_temperature", default=6500))
+            dim_level = int(first_state_value(state, "display.dim_level", default=0))
+            profile = str(first_state_value(state, "display.preset", default="custom"))
+            display_desired = filter_enabled or dimmer_enabled
+            display_enabled = filter_effective or dimmer_effective
+            display_suppressed = tuple(dict.fromkeys(
+                (*filter_suppressed, *dimmer_suppressed)
+            ))
+            dim_percent = round(dim_level * 100 / 200)
+            display_health = str(first_state_value(
+                state,
+                "display_health.status",
+                default="active" if display_enabled else "ready",
+            ))
+            display_backend = display_backend_description(first_state_value(
+                state,
+                "display_health.backend",
+                default="gamma_ramp",
+            ))
+            health_message = str(first_state_value(
+                state,
+                "display_health.message",
+                default="",
+            ))
+            hdr_active = bool(first_state_value(
+                state,
+                "display_health.hdr_active",
+                default=False,
+            ))
+            pending = bool(first_state_value(
+                state,
+                "display_health.pending",
+                default=False,
+            ))
+            if hdr_active:
+                self._runtime_status.setText("HDR 已开启 · 色温安全暂停")
+            elif pending:
+                self._runtime_status.setText("正在应用显示效果…")
+            elif display_health in {"error", "failed", "degraded", "unavailable"}:
+                self._runtime_status.setText(health_message or "显示效果需要检查")
+            elif display_suppressed:
+                reasons = "、".join(
+                    suppression_reason_description(reason)
+                    for reason in display_suppressed
+                )
+                self._runtime_status.setText(f"显示效果因{reasons}暂停")
+            elif display_enabled:
+                self._runtime_status.setText(f"显示效果已验证 · {display_backend}")
             else:
-                pause_detail = f"恢复时间 {pause_until}"
-        self._pause_banner_detail.setText(pause_detail)
+                self._runtime_status.setText("显示效果未启用")
+            self._display_card.set_status(
+                display_enabled,
+                (
+                    "当前因 HDR 暂停"
+                    if hdr_active
+                    else "当前受运行策略暂停"
+                    if display_suppressed
+                    else _PROFILE_NAMES.get(profile, "自定义方案")
+                ),
+                f"{temperature_description(temp)} {temp}K · 调暗 {dim_percent}%",
+                active_text=(
+                    "自动暂停"
+                    if display_desired and (display_suppressed or hdr_active)
+                    else "运行中"
+                ),
+            )
 
-        filter_enabled = bool(first_state_value(state, "display.filter_enabled", default=False))
-        dimmer_enabled = bool(first_state_value(state, "display.dimmer_enabled", default=False))
-        filter_suppressed = tuple(first_state_value(
-            state, "effective_policy.filter.suppressed_by", default=()
-        ))
-        dimmer_suppressed = tuple(first_state_value(
-            state, "effective_policy.dimmer.suppressed_by", default=()
-        ))
-        filter_effective = bool(first_state_value(
-            state,
-            "effective_policy.filter.effective_enabled",
-            default=filter_enabled,
-        ))
-        dimmer_effective = bool(first_state_value(
-            state,
-            "effective_policy.dimmer.effective_enabled",
-            default=dimmer_enabled,
-        ))
-        temp = int(first_state_value(state, "display.color_temperature", default=6500))
-        dim_level = int(first_state_value(state, "display.dim_level", default=0))
-        profile = str(first_state_value(state, "display.preset", default="custom"))
-        display_desired = filter_enabled or dimmer_enabled
-        display_enabled = filter_effective or dimmer_effective
-        display_suppressed = tuple(dict.fromkeys(
-            (*filter_suppressed, *dimmer_suppressed)
-        ))
-        dim_percent = round(dim_level * 100 / 200)
-        display_health = str(first_state_value(
-            state,
-            "display_health.status",
-            default="active" if display_enabled else "ready",
-        ))
-        display_backend = display_backend_description(first_state_value(
-            state,
-            "display_health.backend",
-            default="gamma_ramp",
-        ))
-        health_message = str(first_state_value(
-            state,
-            "display_health.message",
-            default="",
-        ))
-        hdr_active = bool(first_state_value(
-            state,
-            "display_health.hdr_active",
-            default=False,
-        ))
-        pending = bool(first_state_value(
-            state,
-            "display_health.pending",
-            default=False,
-        ))
-        if hdr_active:
-            self._runtime_status.setText("HDR 已开启 · 色温安全暂停")
-        elif pending:
-            self._runtime_status.setText("正在应用显示效果…")
-        elif display_health in {"error", "failed", "degraded", "unavailable"}:
-            self._runtime_status.setText(health_message or "显示效果需要检查")
-        elif display_suppressed:
-            reasons = "、".join(
-                suppression_reason_description(reason)
-                for reason in display_suppressed
+        if changes.touched("focus", "effective_policy.focus"):
+            focus_enabled = bool(first_state_value(state, "focus.enabled", default=False))
+            focus_suppressed = tuple(first_state_value(
+                state, "effective_policy.focus.suppressed_by", default=()
+            ))
+            focus_level = int(first_state_value(state, "focus.dim_level", default=0))
+            focus_ends = first_state_value(state, "focus.session_ends_at", default=None)
+            focus_detail = f"背景暗化 {round(focus_level * 100 / 255)}%"
+            if isinstance(focus_ends, datetime):
+                focus_detail += f" · {focus_ends.astimezone().strftime('%H:%M')} 结束"
+            self._focus_card.set_status(
+                focus_enabled,
+                "情境中暂时隐藏" if focus_suppressed else "保持专注" if focus_enabled else "未启用",
+                focus_detail,
             )
-            self._runtime_status.setText(f"显示效果因{reasons}暂停")
-        elif display_enabled:
-            self._runtime_status.setText(f"显示效果已验证 · {display_backend}")
-        else:
-            self._runtime_status.setText("显示效果未启用")
-        self._display_card.set_status(
-            display_enabled,
-            (
-                "当前因 HDR 暂停"
-                if hdr_active
-                else "当前受运行策略暂停"
-                if display_suppressed
-                else _PROFILE_NAMES.get(profile, "自定义方案")
-            ),
-            f"{temperature_description(temp)} {temp}K · 调暗 {dim_percent}%",
-            active_text=(
-                "自动暂停"
-                if display_desired and (display_suppressed or hdr_active)
-                else "运行中"
-            ),
-        )
 
-        break_enabled = bool(first_state_value(state, "breaks.enabled", default=False))
-        break_phase = str(first_state_value(state, "breaks.phase", default="stopped"))
-        break_paused = bool(first_state_value(state, "breaks.paused", default=False))
-        break_suppressed = tuple(first_state_value(
-            state, "effective_policy.breaks.suppressed_by", default=()
-        ))
-        break_resume = str(first_state_value(
-            state, "effective_policy.breaks.resume_condition", default=""
-        ))
-        remaining = first_state_value(state, "breaks.remaining", default=0)
-        short_remaining = first_state_value(
-            state,
-            "break_cadence.short_remaining",
-            "breaks.cadence.short_remaining",
-            "breaks.short_remaining",
-            default=remaining,
-        )
-        long_remaining = first_state_value(
-            state,
-            "break_cadence.long_remaining",
-            "breaks.cadence.long_remaining",
-            "breaks.long_remaining",
-            default=None,
-        )
-        self._activity_status.setText(
-            (
-                f"短休息 {format_duration(short_remaining)}"
-                + (
-                    f" · 长休息 {format_duration(long_remaining)}"
-                    if long_remaining is not None
-                    else ""
+        if changes.touched("break_history"):
+            history_available = bool(first_state_value(
+                state, "break_history.available", default=False
+            ))
+            self._break_history.setVisible(history_available)
+            if history_available:
+                self._break_history.setText(" · ".join(
+                    self._format_break_summary(first_state_value(
+                        state, f"break_history.{window}", default=None
+                    ))
+                    for window in ("last_7_days", "last_30_days")
+                ))
+
+        # The automation card mirrors break suppression, so both follow the same paths.
+        if changes.touched(
+            "automation",
+            "break_cadence",
+            "breaks",
+            "context",
+            "effective_policy.breaks",
+        ):
+            break_enabled = bool(first_state_value(state, "breaks.enabled", default=False))
+            break_phase = str(first_state_value(state, "breaks.phase", default="stopped"))
+            break_paused = bool(first_state_value(state, "breaks.paused", default=False))
+            break_suppressed = tuple(first_state_value(
+                state, "effective_policy.breaks.suppressed_by", default=()
+            ))
+            break_resume = str(first_state_value(
+                state, "effective_policy.breaks.resume_condition", default=""
+            ))
+            remaining = first_state_value(state, "breaks.remaining", default=0)
+            short_remaining = first_state_value(
+                state,
+                "break_cadence.short_remaining",
+                "breaks.cadence.short_remaining",
+                "breaks.short_remaining",
+                default=remaining,
+            )
+            long_remaining = first_state_value(
+                state,
+                "break_cadence.long_remaining",
+                "breaks.cadence.long_remaining",
+                "breaks.long_remaining",
+                default=None,
+            )
+            self._activity_status.setText(
+                (
+                    f"短休息 {format_duration(short_remaining)}"
+                    + (
+                        f" · 长休息 {format_duration(long_remaining)}"
+                        if long_remaining is not None
+                        else ""
+                    )
                 )
+                if break_enabled
+                else "休息计时未启用"
             )
-            if break_enabled
-            else "休息计时未启用"
-        )
-        if break_suppressed:
-            reason = "、".join(
-                suppression_reason_description(item)
-                for item in break_suppressed
+            if break_suppressed:
+                reason = "、".join(
+                    suppression_reason_description(item)
+                    for item in break_suppressed
+                )
+                break_value = f"因{reason}暂停"
+            elif break_phase == "resting":
+                break_value = "正在休息"
+            elif break_phase == "prompting":
+                break_value = "该休息一下了"
+            elif break_paused:
+                break_value = "计时已暂停"
+            elif break_enabled:
+                break_value = f"{format_duration(remaining)} 后休息"
+            else:
+                break_value = "未启用"
+            break_detail = {
+                "20-20-20": "20-20-20",
+                "pomodoro": "番茄钟",
+                "balanced": "平衡节奏",
+                "custom": "自定义",
+            }.get(
+                str(first_state_value(state, "breaks.mode", default="custom")), "自定义"
+            )
+            if break_suppressed:
+                break_detail = break_resume or "当前情境结束后恢复"
+            self._break_card.set_status(
+                break_enabled,
+                break_value,
+                break_detail,
+                active_text=(
+                    "自动暂停" if break_suppressed
+                    else "已暂停" if break_paused
+                    else "运行中"
+                ),
+            )
+            self._resume_context_button.setVisible(
+                bool(break_suppressed)
+                and not {
+                    "locked",
+                    "session_locked",
+                    "suspended",
+                    "system_suspended",
+                }.intersection(break_suppressed)
             )
-            break_value = f"因{reason}暂停"
-        elif break_phase == "resting":
-            break_value = "正在休息"
-        elif break_phase == "prompting":
-            break_value = "该休息一下了"
-        elif break_paused:
-            break_value = "计时已暂停"
-        elif break_enabled:
-            break_value = f"{format_duration(remaining)} 后休息"
-        else:
-            break_value = "未启用"
-        break_detail = {
-            "20-20-20": "20-20-20",
-            "pomodoro": "番茄钟",
-            "balanced": "平衡节奏",
-            "custom": "自定义",
-        }.get(
-            str(first_state_value(state, "breaks.mode", default="custom")), "自定义"
-        )
-        if break_suppressed:
-            break_detail = break_resume or "当前情境结束后恢复"
-        self._break_card.set_status(
-            break_enabled,
-            break_value,
-            break_detail,
-            active_text=(
-                "自动暂停" if break_suppressed
-                else "已暂停" if break_paused
-                else "运行中"
-            ),
-        )
-        self._resume_context_button.setVisible(
-            bool(break_suppressed)
-            and not {
-                "locked",
-                "session_locked",
-                "suspended",
-                "system_suspended",
-            }.intersection(break_suppressed)
-        )
-
-        focus_enabled = bool(first_state_value(state, "focus.enabled", default=False))
-        focus_suppressed = tuple(first_state_value(
-            state, "effective_policy.focus.suppressed_by", default=()
-        ))
-        focus_level = int(first_state_value(state, "focus.dim_level", default=0))
-        focus_ends = first_state_value(state, "focus.session_ends_at", default=None)
-        focus_detail = f"背景暗化 {round(focus_level * 100 / 255)}%"
-        if isinstance(focus_ends, datetime):
-            focus_detail += f" · {focus_ends.astimezone().strftime('%H:%M')} 结束"
-        self._focus_card.set_status(
-            focus_enabled,
-            "情境中暂时隐藏" if focus_suppressed else "保持专注" if focus_enabled else "未启用",
-            focus_detail,
-        )
 
-        automation_enabled = bool(first_state_value(state, "automation.enabled", default=False))
-        smart_enabled = bool(first_state_value(
-            state, "automation.smart_pause.enabled", default=True
-        ))
-        event = str(first_state_value(state, "automation.next_event", default=""))
-        event_at = first_state_value(state, "automation.next_event_at", default=None)
-        override = bool(first_state_value(state, "automation.manual_override", default=False))
-        context_app = str(first_state_value(state, "context.foreground_app_id", default=""))
-        context_fullscreen = bool(first_state_value(state, "context.fullscreen", default=False))
-        context_detail = (
-            f"当前全屏：{context_app or '未知应用'}"
-            if context_fullscreen
-            else "显示方案自动切换"
-        )
-        self._automation_card.set_status(
-            automation_enabled or smart_enabled,
-            (
-                break_value
-                if break_suppressed
-                else self._format_event(event, event_at)
-                if automation_enabled
-                else "智能免打扰已启用"
-                if smart_enabled
-                else "未启用"
-            ),
-            (
-                break_resume
-                if break_suppressed
-                else "手动调整将在此时恢复自动化"
-                if override
-                else context_detail
-            ),
-            active_text="运行中" if automation_enabled else "情境感知",
-        )
+            automation_enabled = bool(first_state_value(state, "automation.enabled", default=False))
+            smart_enabled = bool(first_state_value(
+                state, "automation.smart_pause.enabled", default=True
+            ))
+            event = str(first_state_value(state, "automation.next_event", default=""))
+            event_at = first_state_value(state, "automation.next_event_at", default=None)
+            override = bool(first_state_value(state, "automation.manual_override", default=False))
+            context_app = str(first_state_value(state, "context.foreground_app_id", default=""))
+            context_fullscreen = bool(first_state_value(state, "context.fullscreen", default=False))
+            context_detail = (
+                f"当前全屏：{context_app or '未知应用'}"
+                if context_fullscreen
+                else "显示方案自动切换"
+            )
+            self._automation_card.set_status(
+                automation_enabled or smart_enabled,
+                (
+                    break_value
+                    if break_suppressed
+                    else self._format_event(event, event_at)
+                    if automation_enabled
+                    else "智能免打扰已启用"
+                    if smart_enabled
+                    else "未启用"
+                ),
+                (
+                    break_resume
+                    if break_suppressed
+                    else "手动调整将在此时恢复自动化"
+                    if override
+                    else context_detail
+                ),
+                active_text="运行中" if automation_enabled else "情境感知",
+            )
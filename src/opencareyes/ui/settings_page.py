@@ -19,7 +19,14 @@ from PySide6.QtWidgets import (
 )
 
 from opencareyes.constants import APP_NAME, APP_VERSION
-from opencareyes.ui.widgets import Card, PageHeader, ScrollPage, first_state_value, set_accessible
+from opencareyes.ui.widgets import (
+    Card,
+    PageHeader,
+    ScrollPage,
+    bind_state,
+    first_state_value,
+    set_accessible,
+)
 
 
 _HOTKEY_FIELDS = (
@@ -149,7 +156,12 @@ class SettingsPage(ScrollPage):
         self._open_release_button.clicked.connect(self._open_release)
         self._export_button.clicked.connect(self._export_diagnostics)
         self._reset_button.clicked.connect(self._reset_settings)
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            ("capabilities", "general", "update"),
+            self.render,
+            widget=self,
+        )
 
     def _theme_changed(self, index: int) -> None:
         if not self._rendering:
@@ -11,6 +11,7 @@ from PySide6.QtWidgets import QApplication, QMenu, QSystemTrayIcon
 from opencareyes.application.status_presenter import StatusPresenter
 from opencareyes.constants import ICONS_DIR
 from opencareyes.ui.widgets import (
+    bind_state,
     first_state_value,
     format_duration,
     suppression_reason_description,
@@ -39,7 +40,21 @@ class TrayIcon(QSystemTrayIcon):
         self._create_icon()
         self._create_menu()
         self.activated.connect(self._on_activated)
-        self._controller.state_changed.connect(self.render)
+        bind_state(
+            self._controller,
+            (
+                "break_cadence",
+                "breaks",
+                "companion",
+                "display",
+                "display_health",
+                "effective_policy",
+                "focus",
+                "general",
+                "global_pause",
+            ),
+            self.render,
+        )
         notification = getattr(self._controller, "notification_requested", None)
         if notification is not None:
             notification.connect(self._show_notification)
@@ -7,10 +7,11 @@ visual hierarchy and accessibility metadata consistent.
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Iterable, Mapping
+from operator import attrgetter
 from typing import Any
 
-from PySide6.QtCore import Qt
+from PySide6.QtCore import QEvent, QObject, Qt
 from PySide6.QtWidgets import (
     QFrame,
     QHBoxLayout,
@@ -20,32 +21,173 @@ from PySide6.QtWidgets import (
     QWidget,
 )
 
+from opencareyes.application.state_diff import EVERYTHING, StateChanges, diff_states
+
+
+_MAPPING_ATTRIBUTES = frozenset(dir(dict))
+_ACCESSORS: dict[str, Callable[[object], Any]] = {}
 
-def state_value(state: object, path: str, default: Any = None) -> Any:
-    """Read a dotted path from dataclasses, mappings, or simple namespaces."""
 
+def _walk_state(state: object, names: tuple[str, ...]) -> Any:
     value: Any = state
-    for name in path.split("."):
+    for name in names:
         if value is None:
-            return default
+            return None
         if isinstance(value, Mapping):
-            value = value.get(name, default)
+            value = value.get(name)
         else:
-            value = getattr(value, name, default)
+            value = getattr(value, name, None)
+    return value
+
+
+def _compile_state_path(path: str) -> Callable[[object], Any]:
+    names = tuple(path.split("."))
+
+    def walk(state: object) -> Any:
+        return _walk_state(state, names)
+
+    if _MAPPING_ATTRIBUTES.intersection(names):
+        # ``attrgetter`` would return a dict method for keys such as "items".
+        return walk
+    getter = attrgetter(path)
+
+    def read(state: object) -> Any:
+        try:
+            return getter(state)
+        except AttributeError:
+            # Missing fields, ``None`` parents and mappings take the walk from
+            # now on instead of raising on every render.
+            _ACCESSORS[path] = walk
+            return walk(state)
+
+    return read
+
+
+def state_accessor(path: str) -> Callable[[object], Any]:
+    """Return a cached reader for a dotted path; missing values read as None."""
+
+    accessor = _ACCESSORS.get(path)
+    if accessor is None:
+        accessor = _ACCESSORS[path] = _compile_state_path(path)
+    return accessor
+
+
+def state_value(state: object, path: str, default: Any = None) -> Any:
+    """Read a dotted path from dataclasses, mappings, or simple namespaces."""
+
+    accessor = _ACCESSORS.get(path) or state_accessor(path)
+    value = accessor(state)
     return default if value is None else value
 
 
 def first_state_value(state: object, *paths: str, default: Any = None) -> Any:
     """Return the first state value present among several compatible paths."""
 
-    sentinel = object()
     for path in paths:
-        value = state_value(state, path, sentinel)
-        if value is not sentinel and value is not None:
+        accessor = _ACCESSORS.get(path) or state_accessor(path)
+        value = accessor(state)
+        if value is not None:
             return value
     return default
 
 
+class _ShowResumer(QObject):
+    def __init__(self, subscription, widget: QWidget):
+        super().__init__(widget)
+        self._subscription = subscription
+
+    def eventFilter(self, watched, event) -> bool:
+        if event.type() == QEvent.Show:
+            self._subscription.resume()
+        return False
+
+
+def bind_state(
+    controller,
+    slices: Iterable[str],
+    render: Callable[[Any], object],
+    *,
+    widget: QWidget | None = None,
+):
+    """Call ``render`` when the named top-level state slices change.
+
+    With ``widget``, updates that arrive while it is hidden are rendered once
+    when it is shown again. Controllers without slice subscriptions fall back
+    to the whole-state ``state_changed`` signal.
+    """
+
+    # Looked up on the type so catch-all ``__getattr__`` proxies fall back.
+    subscribe = getattr(type(controller), "subscribe_state", None)
+    subscription = (
+        subscribe(
+            controller,
+            tuple(slices),
+            render,
+            is_active=None if widget is None else widget.isVisible,
+        )
+        if callable(subscribe)
+        else None
+    )
+    if not callable(getattr(subscription, "resume", None)):
+        controller.state_changed.connect(render)
+        return None
+    if widget is not None:
+        widget.installEventFilter(_ShowResumer(subscription, widget))
+        widget.destroyed.connect(lambda *_args: subscription.cancel())
+    return subscription
+
+
+class _TickWatcher(QObject):
+    def __init__(self, set_watcher: Callable[[str, bool], object], name: str, widget: QWidget):
+        super().__init__(widget)
+        self._set_watcher = set_watcher
+        self._name = name
+
+    def eventFilter(self, watched, event) -> bool:
+        kind = event.type()
+        if kind == QEvent.Show:
+            self._set_watcher(self._name, True)
+        elif kind == QEvent.Hide:
+            self._set_watcher(self._name, False)
+        return False
+
+
+def watch_break_ticks(controller, widget: QWidget, name: str) -> None:
+    """Register ``widget`` as the break tick watcher ``name`` while it is shown.
+
+    Controllers without ``set_break_tick_watcher`` keep ticking every second,
+    so nothing is installed for them.
+    """
+
+    set_watcher = getattr(controller, "set_break_tick_watcher", None)
+    if not callable(set_watcher):
+        return
+    widget.installEventFilter(_TickWatcher(set_watcher, name, widget))
+
+
+class RenderedState:
+    """Remember what a view last rendered so ``render`` can skip sections.
+
+    ``advance`` returns the paths changed since the previous call. Receiving
+    the same snapshot again, as a forced refresh does, reports everything so
+    optimistic controls are reset.
+    """
+
+    __slots__ = ("_rendered",)
+
+    def __init__(self) -> None:
+        self._rendered: object | None = None
+
+    def advance(self, state: object) -> StateChanges:
+        previous, self._rendered = self._rendered, state
+        if previous is state:
+            return EVERYTHING
+        return diff_states(previous, state)
+
+    def reset(self) -> None:
+        self._rendered = None
+
+
 def format_duration(seconds: int | float | None, fallback: str = "--") -> str:
     """Format a duration for compact UI labels."""
 
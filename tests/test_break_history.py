@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+
+import pytest
+from PySide6.QtCore import QThreadPool
+
+from opencareyes.application import break_history as break_history_module
+from opencareyes.application.break_history import BreakHistory
+
+
+class _Now:
+    def __init__(self):
+        self.value = datetime(2026, 3, 2, 9, 0).astimezone()
+
+    def __call__(self):
+        return self.value
+
+    def advance(self, **delta):
+        self.value += timedelta(**delta)
+
+
+def _wait_written(qtbot, history):
+    qtbot.waitUntil(lambda: not history._tasks, timeout=2000)
+
+
+def test_summary_counts_events_per_calendar_window(qtbot, tmp_path):
+    now = _Now()
+    history = BreakHistory(tmp_path / 'history.sqlite3', now=now)
+    history.record('started', 'short')
+    history.record('completed', 'short', rest_seconds=20)
+    now.advance(days=-8)
+    history.record('skipped', 'long', rest_seconds=90)
+    now.advance(days=8)
+    history.record('suppressed', reason='fullscreen')
+
+    week = history.summary(7)
+    month = history.summary(30)
+
+    assert (week.completed, week.skipped, week.suppressed) == (1, 0, 1)
+    assert week.rest_seconds == 20
+    assert (month.skipped, month.rest_seconds) == (1, 110)
+    assert history.summary(7, today=date(2026, 2, 23)).skipped == 1
+    assert history.day_count == 2
+    with pytest.raises(ValueError):
+        history.record('finished')
+    assert history.shutdown()
+
+
+def test_writes_are_batched_off_the_gui_thread_and_reload_reads_rollups(
+    qtbot,
+    tmp_path,
+    monkeypatch,
+):
+    path = tmp_path / 'history.sqlite3'
+    threads = []
+    connect = break_history_module._connect
+
+    def tracking_connect(target):
+        threads.append(threading.current_thread())
+        return connect(target)
+
+    now = _Now()
+    history = BreakHistory(path, now=now, thread_pool=QThreadPool())
+    monkeypatch.setattr(break_history_module, '_connect', tracking_connect)
+    for _ in range(3):
+        history.record('completed', 'short', rest_seconds=20)
+    history.record('snoozed', 'long')
+
+    assert history.pending_count == 4
+    assert history._flush_timer.isActive()
+    assert history.flush() is True
+    assert history.pending_count == 0
+    _wait_written(qtbot, history)
+
+    assert threads and threading.main_thread() not in threads
+    with sqlite3.connect(path) as connection:
+        assert connection.execute('SELECT COUNT(*) FROM events').fetchone() == (4,)
+        assert connection.execute(
+            'SELECT completed, snoozed, rest_seconds FROM daily'
+        ).fetchall() == [(3, 1, 60)]
+
+    history.record('completed', 'long', rest_seconds=300)
+    assert history.shutdown()
+
+    monkeypatch.setattr(break_history_module, '_connect', connect)
+    reloaded = BreakHistory(path, now=now)
+    summary = reloaded.summary(30)
+    assert (summary.completed, summary.snoozed, summary.rest_seconds) == (4, 1, 360)
+    assert reloaded.pending_count == 0
+
+
+def test_failed_batch_is_requeued_ahead_of_newer_events(qtbot, tmp_path):
+    blocker = tmp_path / 'not_a_directory'
+    blocker.write_text('', encoding='utf-8')
+    history = BreakHistory(
+        blocker / 'history.sqlite3',
+        now=_Now(),
+        thread_pool=QThreadPool(),
+    )
+    history.record('completed', 'short', rest_seconds=20)
+    history.record('skipped', 'long')
+
+    assert history.flush() is True
+    history.record('started', 'short')
+    _wait_written(qtbot, history)
+
+    assert [event[2] for event in history._pending] == [
+        'completed',
+        'skipped',
+        'started',
+    ]
+    assert history._flush_timer.isActive()
+    assert history.summary(7).completed == 1
@@ -10,6 +10,8 @@ from PySide6.QtWidgets import QApplication
 from opencareyes.state import AppState, BreakState
 from opencareyes.ui.break_overlay import BreakOverlay
 from opencareyes.ui.mini_countdown import MiniCountdownWidget
+from opencareyes.ui.pet_bubble import PetBubble
+from opencareyes.ui.widgets import watch_break_ticks
 
 
 class _Controller(QObject):
@@ -197,6 +199,39 @@ def test_countdown_pet_reflects_rest_and_pause(qtbot):
     assert pet._label.text() == "休息已暂停"
     assert pet._countdown_label.text() == "0:21"
 
+def test_break_surfaces_watch_ticks_only_while_shown(qtbot):
+    class _WatchingController(_Controller):
+        def __init__(self, state: AppState):
+            super().__init__(state)
+            self.watchers: list[tuple[str, bool]] = []
+
+        def set_break_tick_watcher(self, owner: str, watching: bool) -> None:
+            self.watchers.append((owner, watching))
+
+    controller = _WatchingController(_state(phase="resting"))
+    overlay = BreakOverlay(controller)
+    qtbot.addWidget(overlay)
+    pet = MiniCountdownWidget(controller)
+    qtbot.addWidget(pet)
+    pet.show()
+    bubble = PetBubble()
+    qtbot.addWidget(bubble)
+    watch_break_ticks(controller, bubble, "pet_bubble")
+    bubble.show()
+
+    controller.publish(_state(phase="working"))
+    pet.hide()
+    bubble.hide()
+
+    assert controller.watchers == [
+        ("break_overlay", True),
+        ("mini_countdown", True),
+        ("pet_bubble", True),
+        ("break_overlay", False),
+        ("mini_countdown", False),
+        ("pet_bubble", False),
+    ]
+
 
 def test_standalone_overlay_escape_is_always_safe(qtbot):
     overlay = BreakOverlay()
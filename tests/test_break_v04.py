@@ -4,6 +4,7 @@ import pytest
 from PySide6.QtTest import QSignalSpy
 
 from opencareyes.core.break_reminder import BreakReminder
+from opencareyes.domain.activity import ActivityAccumulator
 
 
 class _Clock:
@@ -240,3 +241,297 @@ def test_snooze_can_be_undone_back_to_progressive_prompt() -> None:
     assert reminder.phase == "prompting"
     assert reminder.prompt_stage == "gentle"
     assert reminder.remaining == 0
+
+
+def test_history_events_report_outcomes_with_rested_seconds() -> None:
+    clock = _Clock()
+    reminder = BreakReminder(clock=clock)
+    reminder.configure_cadence(
+        short_interval=2,
+        short_duration=60,
+        long_enabled=False,
+        long_interval=5,
+        long_duration=2,
+    )
+    reminder.set_reminder_style("progressive")
+    reminder.start()
+    events = []
+    reminder.history_event.connect(lambda *event: events.append(event))
+
+    clock.advance(2)
+    reminder._on_tick()
+    reminder.snooze(10)
+    clock.advance(10)
+    reminder._on_tick()
+    reminder.start_due_break()
+    clock.advance(30)
+    reminder.skip_break()
+    clock.advance(2)
+    reminder._on_tick()
+    reminder.start_due_break()
+    clock.advance(60)
+    reminder._on_tick()
+
+    assert events == [
+        ("snoozed", "short", 0),
+        ("started", "short", 0),
+        ("skipped", "short", 30),
+        ("started", "short", 0),
+        ("completed", "short", 60),
+    ]
+    reminder.stop()
+
+
+def test_on_demand_ticks_arm_only_the_next_boundary() -> None:
+    clock = _Clock()
+    reminder = BreakReminder(clock=clock, tick_on_demand=True)
+    reminder.configure_cadence(
+        short_interval=20 * 60,
+        short_duration=20,
+        long_enabled=True,
+        long_interval=60 * 60,
+        long_duration=5 * 60,
+    )
+    reminder.set_reminder_style("progressive")
+    ticks = QSignalSpy(reminder.tick)
+    reminder.start()
+
+    assert reminder.ticking is False
+    assert reminder._timer.isSingleShot()
+    assert reminder._timer.interval() == 20 * 60 * 1000
+
+    clock.advance(20 * 60)
+    reminder._on_tick()
+
+    assert reminder.phase == "prompting"
+    assert reminder._timer.interval() == reminder.PROMPT_ESCALATION_SECONDS * 1000
+    clock.advance(reminder.PROMPT_ESCALATION_SECONDS)
+    reminder._on_tick()
+
+    assert reminder.prompt_stage == "prominent"
+    assert not reminder._timer.isActive()
+    assert ticks.count() == 2
+    reminder.stop()
+
+
+def test_visible_countdown_switches_to_per_second_ticks_and_back() -> None:
+    clock = _Clock()
+    reminder = BreakReminder(clock=clock, tick_on_demand=True)
+    reminder.configure_cadence(short_interval=10 * 60, short_duration=20)
+    ticks = QSignalSpy(reminder.tick)
+    reminder.start()
+    clock.advance(61)
+
+    reminder.set_tick_watcher("mini_countdown", True)
+
+    assert reminder.ticking is True
+    assert not reminder._timer.isSingleShot()
+    assert reminder._timer.interval() == 1000
+    assert ticks.count() == 1
+    assert ticks.at(0) == [539, 600]
+
+    reminder.set_tick_watcher("break_page", True)
+    reminder.set_tick_watcher("mini_countdown", False)
+    assert reminder.ticking is True
+    assert ticks.count() == 1
+
+    reminder.set_tick_watcher("break_page", False)
+
+    assert reminder.ticking is False
+    assert reminder._timer.isSingleShot()
+    assert reminder._timer.interval() == 539 * 1000
+    reminder.stop()
+
+
+def test_activity_accumulator_credits_input_plus_grace_only() -> None:
+    activity = ActivityAccumulator(grace_seconds=30)
+    activity.observe(0.0, 0)
+    for second in range(1, 121):
+        activity.observe(float(second), 0 if second <= 10 else second - 10)
+
+    # Ten seconds of input plus thirty seconds of grace.
+    assert activity.active_seconds == pytest.approx(40.0)
+    assert activity.active_minutes(120.0, 5) == 1
+
+    activity.observe(400.0, 0)
+    # A stalled sensor only credits the capped gap.
+    assert activity.active_seconds == pytest.approx(45.0)
+    assert activity.minute_active(6)
+    assert not activity.minute_active(2)
+
+
+def test_activity_history_is_a_bounded_ring_of_minute_bits() -> None:
+    activity = ActivityAccumulator(history_minutes=60)
+    second = 0.0
+    for minute in range(3 * 24 * 60):
+        for offset in (30, 31):
+            second = minute * 60.0 + offset
+            activity.observe(second, 0 if minute % 2 == 0 else 90)
+
+    assert len(activity._bits) == 8
+    now_minute = 3 * 24 * 60 - 1
+    assert activity.active_minutes(second, 60) == 30
+    assert activity.minute_active(now_minute - 1)
+    assert not activity.minute_active(now_minute)
+    assert not activity.minute_active(now_minute - 60)
+    with pytest.raises(ValueError):
+        activity.grace_seconds = -1
+
+
+def test_cadence_counts_credited_activity_instead_of_wall_time() -> None:
+    clock = _Clock()
+    activity = ActivityAccumulator(grace_seconds=10)
+    reminder = BreakReminder(clock=clock, tick_on_demand=True, activity=activity)
+    reminder.configure_cadence(short_interval=60, short_duration=20)
+    reminder.set_reminder_style("progressive")
+    reminder.start()
+    reminder.observe_context(type("Sample", (), {"idle_seconds": 0})())
+
+    for second in range(1, 101):
+        clock.advance(1)
+        idle = 0 if second <= 20 or second > 70 else second - 20
+        reminder.observe_context(type("Sample", (), {"idle_seconds": idle})())
+    reminder._on_tick()
+
+    # 20 s of input + 10 s grace + 30 s of input: exactly one short interval.
+    assert activity.active_seconds == pytest.approx(60.0)
+    assert reminder.phase == "prompting"
+
+    reminder.complete_natural_rest()
+    clock.advance(30)
+    locked = type("Sample", (), {"idle_seconds": 0, "session": "locked"})()
+    reminder.observe_context(locked)
+    assert reminder.short_remaining == 60
+    reminder.stop()
+
+
+def test_cadence_falls_back_to_wall_time_without_samples() -> None:
+    clock = _Clock()
+    reminder = BreakReminder(clock=clock, activity=ActivityAccumulator())
+    reminder.configure_cadence(short_interval=60, short_duration=20)
+    reminder.start()
+
+    clock.advance(45)
+
+    assert reminder.short_remaining == 15
+    reminder.stop()
+
+
+class _Wall(_Clock):
+    def __init__(self) -> None:
+        self.now = 1_800_000_000.0
+
+
+def _checkpointed(clock: _Clock, wall: _Wall, path) -> BreakReminder:
+    reminder = BreakReminder(clock=clock, wall_clock=wall, checkpoint_path=path)
+    reminder.configure_cadence(
+        short_interval=20 * 60,
+        short_duration=20,
+        long_enabled=True,
+        long_interval=60 * 60,
+        long_duration=5 * 60,
+    )
+    reminder.set_reminder_style("progressive")
+    return reminder
+
+
+def test_checkpoint_keeps_long_cadence_across_a_quick_restart(tmp_path) -> None:
+    path = tmp_path / "break_checkpoint.json"
+    clock, wall = _Clock(), _Wall()
+    first = _checkpointed(clock, wall, path)
+    first.start()
+    clock.advance(10 * 60)
+    wall.advance(10 * 60)
+    first.flush_checkpoint()
+    first.suspend()
+
+    restarted = _checkpointed(_Clock(), wall, path)
+    wall.advance(15)
+    assert restarted.load_checkpoint() is True
+    restarted.start()
+
+    assert restarted.phase == "working"
+    assert restarted.short_remaining == 10 * 60
+    assert restarted.long_remaining == 50 * 60
+    restarted.stop()
+    assert not path.exists()
+
+
+def test_checkpoint_credits_time_away_as_rest(tmp_path) -> None:
+    path = tmp_path / "break_checkpoint.json"
+    clock, wall = _Clock(), _Wall()
+    first = _checkpointed(clock, wall, path)
+    first.start()
+    clock.advance(20 * 60)
+    wall.advance(20 * 60)
+    first._on_tick()
+    assert first.phase == "prompting"
+    first.snooze(5 * 60)
+    clock.advance(60)
+    wall.advance(60)
+    first.flush_checkpoint()
+
+    snoozed = _checkpointed(_Clock(), wall, path)
+    wall.advance(10)
+    snoozed.load_checkpoint()
+    snoozed.start()
+    assert snoozed.phase == "snoozed"
+    assert snoozed.remaining == 230
+    assert snoozed.long_remaining == 40 * 60
+    snoozed.flush_checkpoint()
+
+    # The machine slept for an hour: both cadences count as rested.
+    slept = _checkpointed(_Clock(), wall, path)
+    wall.advance(60 * 60)
+    slept.load_checkpoint()
+    slept.start()
+    assert slept.phase == "working"
+    assert slept.short_remaining == 20 * 60
+    assert slept.long_remaining == 60 * 60
+
+
+def test_checkpoint_writes_are_batched_and_skip_unchanged_progress(
+    tmp_path, monkeypatch
+) -> None:
+    import opencareyes.core.break_reminder as module
+
+    writes = []
+    real_save = module.save_checkpoint
+    monkeypatch.setattr(
+        module,
+        "save_checkpoint",
+        lambda path, checkpoint: (writes.append(checkpoint), real_save(path, checkpoint)),
+    )
+    clock, wall = _Clock(), _Wall()
+    reminder = _checkpointed(clock, wall, tmp_path / "break_checkpoint.json")
+    reminder.start()
+
+    assert writes == []
+    assert reminder._checkpoint_timer.interval() == 60 * 1000
+    reminder.flush_checkpoint()
+    reminder.flush_checkpoint()
+    clock.advance(0.2)
+    reminder.flush_checkpoint()
+    assert len(writes) == 1
+
+    clock.advance(60)
+    reminder.flush_checkpoint()
+    assert len(writes) == 2
+    reminder.stop()
+
+
+def test_changed_cadence_ignores_an_old_checkpoint(tmp_path) -> None:
+    path = tmp_path / "break_checkpoint.json"
+    clock, wall = _Clock(), _Wall()
+    first = _checkpointed(clock, wall, path)
+    first.start()
+    clock.advance(5 * 60)
+    first.flush_checkpoint()
+
+    reconfigured = BreakReminder(clock=_Clock(), wall_clock=wall, checkpoint_path=path)
+    reconfigured.configure_cadence(short_interval=25 * 60, short_duration=5 * 60)
+    reconfigured.load_checkpoint()
+    reconfigured.start()
+
+    assert reconfigured.short_remaining == 25 * 60
+    reconfigured.stop()
@@ -1,8 +1,16 @@
 """Unit tests for the Tanner Helland color temperature algorithm."""
 
+import ctypes
+
 import pytest
 
-from opencareyes.core.color_temp import kelvin_to_rgb
+from opencareyes.core import color_temp
+from opencareyes.core.color_temp import (
+    GammaRamp,
+    GammaRampTable,
+    build_gamma_ramp,
+    kelvin_to_rgb,
+)
 
 
 class TestKelvinToRgb:
@@ -60,3 +68,89 @@ class TestKelvinToRgb:
         """3400K (night preset) should produce warm tones."""
         r, g, b = kelvin_to_rgb(3400)
         assert r > g > b, "Night mode should be warm: R > G > B"
+
+
+def _reference_ramp(kelvin: int) -> bytes:
+    r, g, b = kelvin_to_rgb(kelvin)
+    ramp = GammaRamp()
+    for i in range(256):
+        ramp[i] = min(65535, int(i * r * 257))
+        ramp[i + 256] = min(65535, int(i * g * 257))
+        ramp[i + 512] = min(65535, int(i * b * 257))
+    return bytes(ramp)
+
+
+class TestGammaRampTable:
+    """Tests for the cached Kelvin to gamma ramp table."""
+
+    def test_bulk_build_matches_per_entry_reference(self):
+        for kelvin in (1000, 1900, 3400, 4500, 6500):
+            ramp = build_gamma_ramp(*kelvin_to_rgb(kelvin))
+            assert ctypes.sizeof(ramp) == ctypes.sizeof(GammaRamp)
+            assert bytes(ramp) == _reference_ramp(kelvin)
+
+    def test_lookup_quantizes_and_reuses_the_same_buffer(self, monkeypatch):
+        calls = []
+        original = color_temp.kelvin_to_rgb
+
+        def counting(kelvin):
+            calls.append(kelvin)
+            return original(kelvin)
+
+        monkeypatch.setattr(color_temp, "kelvin_to_rgb", counting)
+        table = GammaRampTable(step=50)
+
+        first = table.ramp(4510)
+        second = table.ramp(4490)
+
+        assert first is second
+        assert calls == [4500]
+        assert bytes(first) == _reference_ramp(4500)
+        assert (table.hits, table.misses) == (1, 1)
+
+    def test_lru_is_bounded(self):
+        table = GammaRampTable(step=100, capacity=2)
+        warmest = table.ramp(3000)
+        table.ramp(4000)
+        table.ramp(3000)
+        table.ramp(5000)
+
+        assert len(table) == 2
+        assert table.ramp(3000) is warmest
+        assert table.misses == 3
+
+    def test_warm_covers_configured_range(self):
+        table = GammaRampTable(step=500, capacity=1)
+
+        assert table.warm(1000, 6500) == 12
+        assert len(table) == 12
+        table.ramp(6500)
+        table.ramp(1000)
+        assert table.misses == 0
+
+    def test_warm_can_target_preset_temperatures(self):
+        table = GammaRampTable(step=10, capacity=1)
+
+        assert table.warm(temperatures=[5500, 3400, 3404, 6200]) == 3
+        assert len(table) == 3
+        assert table.ramp(3400) is table.ramp(3404)
+        assert table.misses == 0
+
+    def test_slider_drag_after_warm_builds_no_ramps(self, monkeypatch):
+        """A slider drag costs lookups, not ramp rebuilds."""
+
+        temperatures = [1000 + (index * 100) % 5600 for index in range(200)]
+        table = GammaRampTable(step=100)
+        table.warm(1000, 6500)
+        built = []
+        monkeypatch.setattr(
+            color_temp,
+            "build_gamma_ramp",
+            lambda *rgb: built.append(rgb),
+        )
+
+        for kelvin in temperatures:
+            table.ramp(kelvin)
+
+        assert built == []
+        assert (table.hits, table.misses) == (len(temperatures), 0)
@@ -7,7 +7,7 @@ import pytest
 from PySide6.QtCore import QCoreApplication, QObject, Signal
 from PySide6.QtTest import QSignalSpy
 
-from opencareyes.config.settings import Settings
+from opencareyes.config.settings import Settings, SettingsTransactionError
 from opencareyes.controller import AppController
 from opencareyes.core.break_reminder import BreakReminder
 from opencareyes.application.utility_timer import UtilityTimerService
@@ -363,6 +363,8 @@ def test_schedule_public_command_delegates_all_arguments(qapp, monkeypatch):
         night_profile="night",
         sunrise_offset=15,
         sunset_offset=-20,
+        ramp_minutes=90,
+        stages=({"start": "23:00", "end": "06:00", "profile": "movie"},),
     ) is True
     assert calls == [
         (
@@ -379,6 +381,8 @@ def test_schedule_public_command_delegates_all_arguments(qapp, monkeypatch):
                 "night_profile": "night",
                 "sunrise_offset": 15,
                 "sunset_offset": -20,
+                "ramp_minutes": 90,
+                "stages": ({"start": "23:00", "end": "06:00", "profile": "movie"},),
             },
         )
     ]
@@ -680,6 +684,189 @@ def test_failed_service_write_is_visible_and_not_persisted(controller):
     assert state_spy.at(0)[0].display.filter_enabled is False
 
 
+def test_slice_subscribers_wake_only_for_their_slices(qapp):
+    controller = AppController(Settings(MemoryStore()))
+    general = []
+    breaks = []
+    hidden = []
+    visible = [False]
+    controller.subscribe_state(("general",), general.append)
+    controller.subscribe_state(("breaks", "break_cadence"), breaks.append)
+    deferred = controller.subscribe_state(
+        ("general",), hidden.append, is_active=lambda: visible[0]
+    )
+
+    assert controller.set_theme("dark") is True
+    assert controller.set_theme("dark") is True
+
+    assert [state.general.theme for state in general] == ["dark"]
+    assert breaks == []
+    assert hidden == [] and deferred.deferred
+    visible[0] = True
+    assert deferred.resume() is True
+    assert hidden == [controller.state]
+    assert deferred.resume() is False
+
+
+def test_unchanged_refresh_reuses_the_snapshot_without_rebuilding_slices(
+    controller, monkeypatch
+):
+    instance, settings, *_ = controller
+    projector = instance._state_projector
+    builds = []
+    for name in ("_automation_state", "_general_state", "_display_state"):
+        factory = getattr(projector, name)
+        monkeypatch.setattr(
+            projector,
+            name,
+            lambda factory=factory, name=name: builds.append(name) or factory(),
+        )
+    instance.refresh_state()
+    before = instance.state
+    spy = QSignalSpy(instance.state_changed)
+    monkeypatch.setattr(
+        type(before),
+        "__eq__",
+        lambda *_args: pytest.fail("unchanged refresh compared whole states"),
+    )
+
+    for _ in range(100):
+        assert instance.refresh_state() is before
+
+    assert builds == []
+    assert spy.count() == 0
+    monkeypatch.undo()
+
+    assert instance.set_theme("dark") is True
+
+    after = instance.state
+    assert after.general is not before.general
+    assert after.display is before.display
+    assert after.automation is before.automation
+    assert after.breaks is before.breaks
+
+
+def test_published_state_carries_the_changed_paths(controller):
+    instance, *_ = controller
+    spy = QSignalSpy(instance.state_changes)
+
+    assert instance.set_theme("dark") is True
+    instance.refresh_state()
+    instance.refresh_state(force=True)
+
+    assert spy.count() == 2
+    state, changes = spy.at(0)
+    assert state is instance.state
+    assert set(changes) == {"general.theme"}
+    assert changes.touched("general") and not changes.touched("display")
+    assert spy.at(1)[1].touched("display")
+    assert instance.last_changes is spy.at(1)[1]
+
+
+def test_coalesced_controller_publishes_once_per_event_loop_turn(qapp):
+    instance = AppController(
+        Settings(MemoryStore()),
+        FakeDisplayEffect(),
+        FakeDisplayEffect(),
+        coalesce_state_updates=True,
+    )
+    spy = QSignalSpy(instance.state_changed)
+    changes = QSignalSpy(instance.state_changes)
+
+    assert instance.set_theme("dark") is True
+    assert instance.set_filter_enabled(True) is True
+    instance.refresh_state()
+
+    assert instance.state.general.theme == "dark"
+    assert instance.state.display.filter_enabled is True
+    assert spy.count() == 0
+    QCoreApplication.processEvents()
+    assert spy.count() == 1
+    assert spy.at(0)[0] is instance.state
+    assert changes.at(0)[1].touched("general.theme", "display.filter_enabled")
+
+    instance.refresh_state(force=True)
+    instance.refresh_state()
+    assert instance.flush_state() is True
+    assert spy.count() == 2
+    assert changes.at(1)[1].touched("focus")
+    assert instance.flush_state() is False
+    QCoreApplication.processEvents()
+    assert spy.count() == 2
+
+
+def test_single_setting_command_writes_only_its_key_behind_a_synced_journal(qapp):
+    class CountingStore(MemoryStore):
+        def __init__(self):
+            super().__init__()
+            self.writes = []
+            self.syncs = 0
+
+        def setValue(self, key, value):
+            self.writes.append(key)
+            super().setValue(key, value)
+
+        def sync(self):
+            self.syncs += 1
+
+        def remove(self, key):
+            self.values.pop(key, None)
+
+    store = CountingStore()
+    settings = Settings(store)
+    for index in range(50):
+        store.setValue(f"ui/extra_{index}", index)
+    controller = AppController(settings)
+    store.writes.clear()
+    store.syncs = 0
+
+    assert controller.set_theme("dark") is True
+
+    assert [key for key in store.writes if not key.startswith("meta/")] == [
+        "general/theme"
+    ]
+    # One sync persists the journal ahead of the key, one commits it.
+    assert store.syncs == 2
+    assert not any(key.startswith("meta/pending") for key in store.values)
+
+
+def test_command_inside_an_open_write_set_joins_it(qapp):
+    class CountingStore(MemoryStore):
+        def __init__(self):
+            super().__init__()
+            self.syncs = 0
+
+        def sync(self):
+            self.syncs += 1
+
+        def remove(self, key):
+            self.values.pop(key, None)
+
+    store = CountingStore()
+    settings = Settings(store)
+    controller = AppController(settings)
+    original_theme = settings.theme
+    store.syncs = 0
+
+    with settings.transaction():
+        assert controller.set_theme("dark") is True
+        assert store.syncs == 1
+    assert store.syncs == 2
+    assert settings.theme == "dark"
+
+    failures = []
+    controller.operation_failed.connect(lambda code, _message: failures.append(code))
+    with pytest.raises(SettingsTransactionError, match="inside this settings transaction"):
+        with settings.transaction():
+            assert controller.set_theme(original_theme) is True
+            assert controller.set_pet_anchor("free", 0) is False
+            assert settings.in_transaction is True
+    assert failures == ["pet_anchor"]
+    assert settings.theme == "dark"
+    assert settings.pet_anchor_edge != "free"
+    assert settings.in_transaction is False
+
+
 def test_hotkey_sync_failure_restores_settings_and_native_mapping(qapp):
     store = FailingSyncStore()
     settings = Settings(store)
@@ -994,3 +1181,42 @@ def test_strict_break_rejects_snooze_from_every_entry_point(controller):
     assert settings.force_break is True
     assert reminder.force_break is True
     assert spy.count() == 1
+
+
+def test_restore_resumes_persisted_break_cadence(qapp, tmp_path):
+    path = tmp_path / "break_checkpoint.json"
+    now = [1000.0]
+    wall = [1_800_000_000.0]
+
+    def restored_reminder():
+        settings = Settings(MemoryStore())
+        settings.break_enabled = True
+        reminder = BreakReminder(
+            clock=lambda: now[0],
+            wall_clock=lambda: wall[0],
+            checkpoint_path=path,
+        )
+        instance = AppController(
+            settings,
+            FakeDisplayEffect(),
+            FakeDisplayEffect(),
+            reminder,
+            FakeFocus(),
+            FakeScheduler(),
+        )
+        instance.restore()
+        return reminder
+
+    first = restored_reminder()
+    interval = first.short_interval
+    now[0] += 7 * 60
+    wall[0] += 7 * 60
+    first.flush_checkpoint()
+    first.suspend()
+
+    wall[0] += 5
+    second = restored_reminder()
+
+    assert second.enabled is True
+    assert second.short_remaining == interval - 7 * 60
+    second.stop()
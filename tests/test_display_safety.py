@@ -9,18 +9,20 @@ import pytest
 from opencareyes.core import blue_light_filter as filter_module
 from opencareyes.core.blue_light_filter import BlueLightFilter, _GammaArray
 from opencareyes.core.display_capabilities import AdvancedColorStatus
+from opencareyes.core.gamma_baselines import GammaBaselines, load_baselines
+from opencareyes.core.monitor_manager import MonitorInfo, MonitorManager
 
 
 class _Monitors:
     def __init__(self, names=("DISPLAY1", "DISPLAY2")):
         self.names = names
-        self.refresh_count = 0
+        self.invalidate_count = 0
 
     def get_monitors(self):
         return [{"name": name} for name in self.names]
 
-    def refresh(self):
-        self.refresh_count += 1
+    def invalidate(self):
+        self.invalidate_count += 1
 
 
 def _identity_ramp() -> _GammaArray:
@@ -429,6 +431,117 @@ def test_distinct_target_interfaces_do_not_share_baselines(monkeypatch):
     }
 
 
+def test_baseline_store_keeps_bytes_and_matches_changed_targets_by_source():
+    baselines = GammaBaselines()
+    ramp = _offset_ramp(7)
+    baselines[("DISPLAY1", ("monitor-a",))] = ramp
+
+    assert baselines[("DISPLAY1", ("monitor-a",))] == bytes(ramp)
+    assert baselines.match(("DISPLAY1", ("monitor-a", "monitor-b"))) == (
+        "DISPLAY1",
+        ("monitor-a",),
+    )
+    assert baselines.match(("DISPLAY1", ("monitor-c",))) is None
+    assert baselines.match(("DISPLAY2", ("monitor-a",))) is None
+
+    baselines[("DISPLAY1", ("monitor-c",))] = _identity_ramp()
+    assert list(baselines) == [("DISPLAY1", ("monitor-c",))]
+    assert bytes(baselines.ramp(("DISPLAY1", ("monitor-c",)))) == bytes(
+        _identity_ramp()
+    )
+    with pytest.raises(ValueError):
+        baselines[("DISPLAY2", ())] = b"short"
+
+
+def test_persisted_baselines_recover_true_original_after_restart(
+    monkeypatch,
+    tmp_path,
+):
+    original, current, _calls = _install_fake_gamma(monkeypatch)
+    path = tmp_path / "gamma_baselines.json"
+    sdr = lambda: AdvancedColorStatus(False, False, True, "sdr_ready")  # noqa: E731
+    crashed = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=sdr,
+        identity_resolver=_identity,
+        baseline_path=path,
+    )
+
+    assert crashed.enable(3500) is True
+    assert dict(load_baselines(path)) == dict(crashed._original_ramps)
+    assert bytes(current[1]) != bytes(original[1])
+
+    restarted = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=sdr,
+        identity_resolver=_identity,
+        baseline_path=path,
+    )
+    assert restarted.recovery_pending is True
+    assert restarted.refresh_screens() is True
+    assert restarted.recovery_pending is False
+    assert all(bytes(current[key]) == bytes(original[key]) for key in original)
+    assert not path.exists()
+
+
+def test_restart_capture_prefers_persisted_original_over_tinted_readback(
+    monkeypatch,
+    tmp_path,
+):
+    original, current, _calls = _install_fake_gamma(monkeypatch)
+    path = tmp_path / "gamma_baselines.json"
+    sdr = lambda: AdvancedColorStatus(False, False, True, "sdr_ready")  # noqa: E731
+    BlueLightFilter(
+        _Monitors(),
+        hdr_probe=sdr,
+        identity_resolver=_identity,
+        baseline_path=path,
+    ).enable(3500)
+
+    restarted = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=sdr,
+        identity_resolver=_identity,
+        baseline_path=path,
+    )
+    assert restarted.enable(5000) is True
+    assert restarted.recovery_pending is False
+    assert restarted.disable() is True
+    assert all(bytes(current[key]) == bytes(original[key]) for key in original)
+    assert not path.exists()
+
+
+def test_failed_recovery_keeps_persisted_baselines_for_retry(
+    monkeypatch,
+    tmp_path,
+):
+    original, current, _calls = _install_fake_gamma(
+        monkeypatch,
+        fail_restore_device=2,
+    )
+    path = tmp_path / "gamma_baselines.json"
+    sdr = lambda: AdvancedColorStatus(False, False, True, "sdr_ready")  # noqa: E731
+    BlueLightFilter(
+        _Monitors(),
+        hdr_probe=sdr,
+        identity_resolver=_identity,
+        baseline_path=path,
+    ).enable(3500)
+    restarted = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=sdr,
+        identity_resolver=_identity,
+        baseline_path=path,
+    )
+
+    assert restarted.refresh_screens() is False
+    assert restarted.last_error_code == "gamma_rollback_failed"
+    assert list(load_baselines(path)) == [("display2", _identity("DISPLAY2"))]
+    assert restarted.refresh_screens() is True
+    assert all(bytes(current[key]) == bytes(original[key]) for key in original)
+    assert not path.exists()
+
+
 @pytest.mark.parametrize("names", ((), ("DISPLAY1",)))
 def test_untrusted_or_missing_display_identity_fails_without_gamma_io(
     monkeypatch,
@@ -461,3 +574,278 @@ def test_untrusted_or_missing_display_identity_fails_without_gamma_io(
     assert writes == []
     assert service.last_error_code == "display_identity_unavailable"
     assert "可靠识别" in service.last_error_message
+
+
+def test_identical_reapply_skips_gdi_until_verification_is_due(monkeypatch):
+    _install_fake_gamma(monkeypatch)
+    now = [100.0]
+    gdi = []
+    underlying_get = filter_module.GetDeviceGammaRamp
+    underlying_set = filter_module.SetDeviceGammaRamp
+
+    def tracked_get(dc, pointer):
+        gdi.append(("get", int(dc)))
+        return underlying_get(dc, pointer)
+
+    def tracked_set(dc, pointer):
+        gdi.append(("set", int(dc)))
+        return underlying_set(dc, pointer)
+
+    monkeypatch.setattr(filter_module, "GetDeviceGammaRamp", tracked_get)
+    monkeypatch.setattr(filter_module, "SetDeviceGammaRamp", tracked_set)
+    probes = []
+    hdr_active = [False]
+
+    def probe():
+        probes.append(now[0])
+        return AdvancedColorStatus(True, hdr_active[0], True, "test")
+
+    service = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=probe,
+        identity_resolver=_identity,
+        verify_interval=30.0,
+        clock=lambda: now[0],
+    )
+    assert service.enable(4500) is True
+
+    gdi.clear()
+    probes.clear()
+    for _ in range(5):
+        assert service.set_temperature(4500) is True
+    assert gdi == []
+    assert len(probes) == 5
+
+    hdr_active[0] = True
+    assert service.set_temperature(4500) is False
+    assert gdi == []
+    hdr_active[0] = False
+    assert service.enable(4500) is True
+    gdi.clear()
+
+    assert service.set_temperature(4100) is True
+    assert gdi == [("set", 1), ("get", 1), ("set", 2), ("get", 2)]
+
+    gdi.clear()
+    now[0] += 31.0
+    assert service.set_temperature(4100) is True
+    assert [call for call, _dc in gdi] == ["set", "get", "set", "get"]
+
+    gdi.clear()
+    assert service.set_temperature(4100, force_verify=True) is True
+    assert len(gdi) == 4
+
+    gdi.clear()
+    assert service.refresh_screens() is True
+    assert ("set", 1) in gdi and ("set", 2) in gdi
+    assert service.current_temperature == 4100
+
+
+def test_restore_forgets_verified_ramps_so_reenable_rewrites_outputs(monkeypatch):
+    original, current, _calls = _install_fake_gamma(monkeypatch)
+    service = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=lambda: AdvancedColorStatus(False, False, True, "sdr_ready"),
+        identity_resolver=_identity,
+    )
+    assert service.enable(4500) is True
+    assert service.disable() is True
+    assert all(bytes(current[key]) == bytes(original[key]) for key in original)
+
+    writes = []
+    underlying_set = filter_module.SetDeviceGammaRamp
+
+    def tracked_set(dc, pointer):
+        writes.append(int(dc))
+        return underlying_set(dc, pointer)
+
+    monkeypatch.setattr(filter_module, "SetDeviceGammaRamp", tracked_set)
+    assert service.enable(4500) is True
+    assert writes == [1, 2]
+
+
+def test_per_output_temperatures_write_distinct_ramps_and_skip_unchanged(
+    monkeypatch,
+):
+    _original, current, target_calls = _install_fake_gamma(monkeypatch)
+    service = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=lambda: AdvancedColorStatus(False, False, True, "sdr_ready"),
+        identity_resolver=_identity,
+    )
+    assert service.enable(4500) is True
+    target_calls.clear()
+
+    assert service.set_output_temperatures({"DISPLAY2": 3000}) is True
+    assert target_calls == [2]
+    table = service.ramp_table
+    assert bytes(current[1]) == bytes(table.ramp(4500))
+    assert bytes(current[2]) == bytes(table.ramp(3000))
+
+    target_calls.clear()
+    assert service.set_output_temperatures({"display2": 3000}) is True
+    assert service.set_temperature(4500) is True
+    assert target_calls == []
+
+    assert service.set_temperature(4000) is True
+    assert target_calls == [1]
+    assert bytes(current[2]) == bytes(table.ramp(3000))
+
+    target_calls.clear()
+    assert service.set_output_temperatures(
+        {"monitor-interface:display1": 5000}
+    ) is True
+    assert sorted(target_calls) == [1, 2]
+    assert bytes(current[1]) == bytes(table.ramp(5000))
+    assert bytes(current[2]) == bytes(table.ramp(4000))
+    assert service.current_temperature == 4000
+
+
+def test_output_temperatures_wait_for_enable_when_filter_is_off(monkeypatch):
+    _original, current, target_calls = _install_fake_gamma(monkeypatch)
+    service = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=lambda: AdvancedColorStatus(False, False, True, "sdr_ready"),
+        identity_resolver=_identity,
+    )
+
+    assert service.set_output_temperatures({"DISPLAY1": 3000}) is True
+    assert target_calls == []
+    assert service.output_temperatures == {"display1": 3000}
+
+    assert service.enable(5000) is True
+    assert bytes(current[1]) == bytes(service.ramp_table.ramp(3000))
+    assert bytes(current[2]) == bytes(service.ramp_table.ramp(5000))
+
+
+def test_output_pool_reuses_identities_and_dcs_until_refresh(monkeypatch):
+    _install_fake_gamma(monkeypatch)
+    opened = []
+    deleted = []
+    resolved = []
+    names = {"DISPLAY1": 1, "DISPLAY2": 2}
+
+    def create_dc(_kind, name, *_args):
+        opened.append(name)
+        return names[name]
+
+    def resolve(name):
+        resolved.append(name)
+        return _identity(name)
+
+    monkeypatch.setattr(filter_module, "CreateDCW", create_dc)
+    monkeypatch.setattr(filter_module, "DeleteDC", lambda dc: deleted.append(dc))
+    monitors = _Monitors()
+    service = BlueLightFilter(
+        monitors,
+        hdr_probe=lambda: AdvancedColorStatus(False, False, True, "sdr_ready"),
+        identity_resolver=resolve,
+    )
+    pool = filter_module.DisplayOutputPool()
+    service.attach_output_pool(pool)
+
+    assert service.enable(4500) is True
+    for kelvin in (4400, 4300, 4200):
+        assert service.set_temperature(kelvin) is True
+
+    assert opened == ["DISPLAY1", "DISPLAY2"]
+    assert resolved == ["DISPLAY1", "DISPLAY2"]
+    assert deleted == []
+    assert pool.open_count == 2
+
+    assert service.refresh_screens() is True
+    assert sorted(deleted) == [1, 2]
+    assert opened == ["DISPLAY1", "DISPLAY2"] * 2
+    assert monitors.invalidate_count == 1
+
+    pool.invalidate()
+    assert pool.open_count == 0
+    assert pool.outputs is None
+
+
+def test_output_pool_is_dropped_after_native_failure(monkeypatch):
+    _install_fake_gamma(monkeypatch, fail_device=2)
+    deleted = []
+    monkeypatch.setattr(filter_module, "DeleteDC", lambda dc: deleted.append(dc))
+    service = BlueLightFilter(
+        _Monitors(),
+        hdr_probe=lambda: AdvancedColorStatus(False, False, True, "sdr_ready"),
+        identity_resolver=_identity,
+    )
+    pool = filter_module.DisplayOutputPool()
+    service.attach_output_pool(pool)
+
+    assert service.enable(4200) is False
+    assert 1 in deleted and 2 in deleted
+    assert service.last_error_code == "gamma_apply_failed"
+
+
+def _monitor(handle: int, name: str, right: int = 1920) -> MonitorInfo:
+    return MonitorInfo(
+        handle=handle,
+        name=name,
+        geometry=(0, 0, right, 1080),
+        work_area=(0, 0, right, 1040),
+        is_primary=handle == 1,
+    )
+
+
+def test_monitor_manager_enumerates_once_until_invalidated():
+    topology = [(_monitor(1, "DISPLAY1"),)]
+    calls = []
+
+    def enumerate_monitors():
+        calls.append(1)
+        return topology[0]
+
+    manager = MonitorManager(enumerator=enumerate_monitors)
+
+    first = manager.get_monitors()
+    for _ in range(10):
+        assert manager.get_monitors() is first
+    assert manager.get_monitor_count() == 1
+    assert len(calls) == 1
+    generation = manager.generation
+
+    manager.invalidate()
+    assert manager.get_monitors() == first
+    assert len(calls) == 2
+    assert manager.generation == generation
+
+    topology[0] = (_monitor(1, "DISPLAY1"), _monitor(2, "DISPLAY2", 2560))
+    manager.invalidate()
+    assert [monitor["name"] for monitor in manager.get_monitors()] == [
+        "DISPLAY1",
+        "DISPLAY2",
+    ]
+    assert manager.generation == generation + 1
+    assert len(calls) == 3
+
+
+def test_monitor_records_are_immutable_and_keep_legacy_keys():
+    record = _monitor(1, "DISPLAY1")
+
+    assert record["name"] == "DISPLAY1"
+    assert record["is_primary"] is True
+    with pytest.raises(KeyError):
+        record["missing"]
+    with pytest.raises(AttributeError):
+        record.name = "DISPLAY2"
+    assert not hasattr(record, "__dict__")
+
+
+def test_monitor_manager_retries_after_failed_enumeration():
+    results = [OSError("enumeration failed"), (_monitor(1, "DISPLAY1"),)]
+
+    def enumerate_monitors():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    manager = MonitorManager(enumerator=enumerate_monitors)
+
+    assert manager.get_monitors() == ()
+    assert manager.stale is True
+    assert [monitor.name for monitor in manager.get_monitors()] == ["DISPLAY1"]
+    assert manager.stale is False
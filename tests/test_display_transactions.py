@@ -8,6 +8,7 @@ from PySide6.QtTest import QSignalSpy
 from opencareyes.application.context_coordinator import ContextCoordinator
 from opencareyes.application.effect_coordinator import EffectCoordinator
 from opencareyes.config.settings import Settings
+from opencareyes.constants import SCHEDULE_TRANSITION_MS
 from opencareyes.controller import AppController
 from opencareyes.core.break_reminder import BreakReminder
 from opencareyes.core.display_worker import GammaRequestToken, GammaResult
@@ -432,6 +433,40 @@ def test_preview_does_not_persist_and_commit_has_own_barrier(qtbot):
     assert settings.current_preset == "custom"
 
 
+def test_scheduled_ramp_steps_preview_without_persisting(qtbot):
+    from opencareyes.core.scheduler import Scheduler, ScheduleRampStep
+
+    store = CountingStore()
+    settings = Settings(store)
+    settings.filter_enabled = True
+    settings.dimmer_enabled = True
+    gamma = ManualGamma()
+    gamma.enabled = True
+    dimmer = FakeDimmer()
+    dimmer.enabled = True
+    scheduler = Scheduler(settings=settings)
+    AppController(
+        settings,
+        blue_filter=gamma,
+        dimmer=dimmer,
+        break_reminder=BreakReminder(),
+        scheduler=scheduler,
+    )
+    baseline_syncs = store.sync_count
+
+    scheduler._request_ramp(ScheduleRampStep("night", 4200, 20))
+    first = gamma.requests[-1]
+    scheduler._request_ramp(ScheduleRampStep("night", 4150, 22))
+    second = gamma.requests[-1]
+
+    assert (first.purpose, first.requested_value) == ("preview", 4200)
+    assert (second.purpose, second.requested_value) == ("preview", 4150)
+    assert dimmer.dim_level == 22
+    assert settings.color_temperature == 6500
+    assert store.sync_count == baseline_syncs
+    scheduler.stop()
+
+
 def test_profile_failure_compensates_dimmer_and_keeps_preferences(qtbot):
     controller, settings, _store, gamma, dimmer, _reminder, _focus = _controller()
     failures = QSignalSpy(controller.operation_failed)
@@ -1490,3 +1525,99 @@ def test_new_context_result_cannot_commit_until_older_request_finishes(qtbot):
     assert controller.state.effective_policy.filter.suppressed_by == (
         "app_rule",
     )
+
+
+class FadingGamma(ManualGamma):
+    def request_transition(
+        self,
+        temperature,
+        duration_ms,
+        *,
+        start=None,
+        revision=0,
+        purpose="commit",
+    ):
+        del start
+        token = self._reserve("temperature", temperature, revision, purpose)
+        self.transitions = getattr(self, "transitions", []) + [duration_ms]
+        return token
+
+
+def test_scheduled_profile_fades_but_manual_profile_applies_directly(qtbot):
+    store = CountingStore()
+    settings = Settings(store)
+    settings.filter_enabled = True
+    gamma = FadingGamma()
+    gamma.enabled = True
+    scheduler = FakeScheduler()
+    controller = AppController(
+        settings,
+        blue_filter=gamma,
+        dimmer=FakeDimmer(),
+        break_reminder=BreakReminder(),
+        scheduler=scheduler,
+    )
+
+    scheduler.callback("night")
+    fade = gamma.requests[-1]
+    assert getattr(gamma, "transitions", []) == [SCHEDULE_TRANSITION_MS]
+    gamma.complete(fade, success=True)
+    qtbot.waitUntil(lambda: settings.current_preset == "night")
+
+    assert controller.apply_display_profile("reading") is True
+    assert gamma.transitions == [SCHEDULE_TRANSITION_MS]
+    assert gamma.requests[-1].kind == "temperature"
+
+
+class MonitorTargetGamma(ManualGamma):
+    def __init__(self):
+        super().__init__()
+        self.output_requests = []
+
+    def request_output_temperatures(self, targets, *, revision=0, purpose="system"):
+        self.output_requests.append(dict(targets))
+        return self._reserve("outputs", None, revision, purpose)
+
+
+class MonitorTargetDimmer(FakeDimmer):
+    def __init__(self):
+        super().__init__()
+        self.level_requests = []
+
+    def set_screen_levels(self, levels):
+        self.level_requests.append(dict(levels))
+        return True
+
+
+def test_monitor_targets_are_persisted_compactly_and_pushed_once(qtbot):
+    store = CountingStore()
+    settings = Settings(store)
+    gamma = MonitorTargetGamma()
+    dimmer = MonitorTargetDimmer()
+    controller = AppController(settings, blue_filter=gamma, dimmer=dimmer)
+
+    assert controller.set_monitor_target(
+        r"\\.\DISPLAY2",
+        temperature=3000,
+        dim_level=40,
+    ) is True
+    assert controller.set_monitor_target(r"\\.\DISPLAY1", dim_level=500) is True
+
+    assert store.values["display/monitor_targets_json"] == (
+        r'{"\\\\.\\display2":[3000,40],"\\\\.\\display1":[null,200]}'
+    )
+    assert settings.monitor_targets == {
+        r"\\.\display2": (3000, 40),
+        r"\\.\display1": (None, 200),
+    }
+    assert gamma.output_requests == [{r"\\.\display2": 3000}]
+    assert dimmer.level_requests == [
+        {r"\\.\display2": 40},
+        {r"\\.\display2": 40, r"\\.\display1": 200},
+    ]
+
+    assert controller.set_monitor_target(r"\\.\DISPLAY2") is True
+    assert settings.monitor_targets == {r"\\.\display1": (None, 200)}
+    assert gamma.output_requests[-1] == {}
+    assert dimmer.level_requests[-1] == {r"\\.\display1": 200}
+    assert len(gamma.output_requests) == 2
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import threading
+import time
+
 from PySide6.QtTest import QSignalSpy
 
 from opencareyes.core.display_worker import QueuedBlueLightFilter
@@ -125,3 +128,271 @@ def test_worker_exception_exposes_only_fixed_localized_message(qtbot):
         assert "C:\\Users" not in failures.at(0)[1]
     finally:
         service.shutdown()
+
+
+class PooledBackend(FakeBackend):
+    def __init__(self):
+        super().__init__()
+        self.pool = None
+
+    def attach_output_pool(self, pool):
+        self.pool = pool
+
+
+def test_worker_owns_display_output_pool_until_shutdown(qtbot, monkeypatch):
+    backend = PooledBackend()
+    service = QueuedBlueLightFilter(backend)
+    pool = backend.pool
+    invalidated = []
+    monkeypatch.setattr(pool, "invalidate", lambda: invalidated.append(True))
+    try:
+        assert pool is not None
+        service.enable(4200)
+        qtbot.waitUntil(lambda: not service.pending)
+        assert invalidated == []
+    finally:
+        assert service.shutdown() is True
+    assert invalidated == [True]
+
+
+def test_transition_fades_on_worker_and_finishes_at_target(qtbot):
+    backend = FakeBackend()
+    backend.enabled = True
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    try:
+        token = service.request_transition(3400, 300, start=6500)
+        assert service.pending_target is True
+        qtbot.waitUntil(lambda: not service.pending, timeout=3000)
+
+        frames = [value for kind, value in backend.calls if kind == "temperature"]
+        assert len(frames) >= 2
+        assert frames[-1] == 3400
+        assert frames == sorted(frames, reverse=True)
+        assert results.count() == 1
+        assert results.at(0)[0].request_id == token.request_id
+        assert results.at(0)[0].success is True
+        assert service.current_temperature == 3400
+    finally:
+        service.shutdown()
+
+
+def test_transition_drops_frames_when_the_worker_falls_behind(qtbot):
+    class SlowBackend(FakeBackend):
+        def set_temperature(self, temperature):
+            time.sleep(0.12)
+            return super().set_temperature(temperature)
+
+    backend = SlowBackend()
+    backend.enabled = True
+    service = QueuedBlueLightFilter(backend)
+    try:
+        service.request_transition(3000, 400, start=6000)
+        qtbot.waitUntil(lambda: not service.pending, timeout=3000)
+
+        frames = [value for kind, value in backend.calls if kind == "temperature"]
+        assert frames[-1] == 3000
+        assert len(frames) <= 5
+    finally:
+        service.shutdown()
+
+
+def test_newer_request_supersedes_running_transition(qtbot):
+    backend = FakeBackend()
+    backend.enabled = True
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    failures = QSignalSpy(service.operation_failed)
+    try:
+        fade = service.request_transition(3400, 10_000, start=6500)
+        qtbot.waitUntil(lambda: bool(backend.calls))
+        commit = service.request_temperature(5000)
+        qtbot.waitUntil(lambda: not service.pending, timeout=3000)
+
+        outcomes = {
+            results.at(index)[0].request_id: results.at(index)[0]
+            for index in range(results.count())
+        }
+        assert outcomes[fade.request_id].superseded is True
+        assert outcomes[fade.request_id].code == "transition_superseded"
+        assert outcomes[commit.request_id].success is True
+        assert backend.calls[-1] == ("temperature", 5000)
+        assert service.current_temperature == 5000
+        assert failures.count() == 0
+    finally:
+        service.shutdown()
+
+
+def test_display_refresh_lets_a_running_transition_finish(qtbot):
+    backend = FakeBackend()
+    backend.enabled = True
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    failures = QSignalSpy(service.operation_failed)
+    try:
+        fade = service.request_transition(3400, 400, start=6500)
+        qtbot.waitUntil(lambda: bool(backend.calls))
+        refresh = service.request_refresh()
+        qtbot.waitUntil(lambda: not service.pending, timeout=3000)
+
+        outcomes = {
+            results.at(index)[0].request_id: results.at(index)[0]
+            for index in range(results.count())
+        }
+        assert outcomes[refresh.request_id].success is True
+        assert outcomes[fade.request_id].success is True
+        assert outcomes[fade.request_id].superseded is False
+        assert ("refresh", None) in backend.calls
+        assert backend.calls[-1] == ("temperature", 3400)
+        assert service.current_temperature == 3400
+        assert failures.count() == 0
+    finally:
+        service.shutdown()
+
+
+class BlockingBackend(FakeBackend):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def set_temperature(self, temperature):
+        if not self.calls:
+            self.calls.append(("blocked", temperature))
+            self.release.wait(5)
+            self.current_temperature = temperature
+            return True
+        return super().set_temperature(temperature)
+
+
+def test_queued_burst_is_collapsed_into_one_native_apply(qtbot):
+    backend = BlockingBackend()
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    failures = QSignalSpy(service.operation_failed)
+    try:
+        service.request_temperature(6000)
+        qtbot.waitUntil(lambda: bool(backend.calls))
+        burst = [
+            service.request_enable(4500),
+            service.request_temperature(4300),
+            service.request_refresh(),
+            service.request_refresh(),
+            service.request_temperature(4100),
+        ]
+        backend.release.set()
+        qtbot.waitUntil(lambda: not service.pending)
+
+        assert backend.calls == [
+            ("blocked", 6000),
+            ("refresh", None),
+            ("enable", 4100),
+        ]
+        outcomes = {
+            results.at(index)[0].request_id: results.at(index)[0]
+            for index in range(results.count())
+        }
+        assert results.count() == 6
+        assert all(outcomes[token.request_id].success for token in burst)
+        assert not any(outcomes[token.request_id].superseded for token in burst)
+        assert service.enabled is True
+        assert service.current_temperature == 4100
+        assert failures.count() == 0
+    finally:
+        backend.release.set()
+        service.shutdown()
+
+
+def test_reversed_toggle_in_a_burst_completes_as_superseded(qtbot):
+    backend = BlockingBackend()
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    try:
+        service.request_temperature(6000)
+        qtbot.waitUntil(lambda: bool(backend.calls))
+        enable = service.request_enable(4200)
+        disable = service.request_disable()
+        backend.release.set()
+        qtbot.waitUntil(lambda: not service.pending)
+
+        assert backend.calls == [("blocked", 6000), ("disable", None)]
+        outcomes = {
+            results.at(index)[0].request_id: results.at(index)[0]
+            for index in range(results.count())
+        }
+        assert outcomes[enable.request_id].superseded is True
+        assert outcomes[enable.request_id].code == "request_superseded"
+        assert outcomes[disable.request_id].success is True
+        assert service.enabled is False
+    finally:
+        backend.release.set()
+        service.shutdown()
+
+
+def test_failed_fade_start_reports_covered_requests_with_its_failure(qtbot):
+    class EnableFailsBackend(BlockingBackend):
+        def enable(self, temperature):
+            raise OSError("gamma unavailable")
+
+    backend = EnableFailsBackend()
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    try:
+        service.request_temperature(6000)
+        qtbot.waitUntil(lambda: bool(backend.calls))
+        covered = service.request_temperature(5000)
+        fade = service.request_transition(3400, 10_000, start=6500)
+        backend.release.set()
+        qtbot.waitUntil(lambda: not service.pending)
+
+        finished = [results.at(index)[0] for index in range(results.count())]
+        assert [result.request_id for result in finished[1:]] == [
+            covered.request_id,
+            fade.request_id,
+        ]
+        for result in finished[1:]:
+            assert result.success is False
+            assert result.superseded is False
+            assert result.code == "gamma_worker_exception"
+    finally:
+        backend.release.set()
+        service.shutdown()
+
+
+class OutputTargetBackend(BlockingBackend):
+    def set_output_temperatures(self, targets, *, apply=True):
+        self.calls.append(("outputs", dict(targets), apply))
+        return True
+
+
+def test_output_targets_ride_along_with_a_queued_state_change(qtbot):
+    backend = OutputTargetBackend()
+    service = QueuedBlueLightFilter(backend)
+    results = QSignalSpy(service.request_finished)
+    try:
+        service.request_temperature(6000)
+        qtbot.waitUntil(lambda: bool(backend.calls))
+        first = service.request_output_temperatures({"display1": 3000})
+        latest = service.request_output_temperatures({"display2": 3500})
+        service.request_temperature(4200)
+        backend.release.set()
+        qtbot.waitUntil(lambda: not service.pending)
+
+        assert backend.calls == [
+            ("blocked", 6000),
+            ("outputs", {"display2": 3500}, False),
+            ("temperature", 4200),
+        ]
+        outcomes = {
+            results.at(index)[0].request_id: results.at(index)[0]
+            for index in range(results.count())
+        }
+        assert outcomes[first.request_id].success is True
+        assert outcomes[latest.request_id].success is True
+
+        backend.calls.clear()
+        service.request_output_temperatures({})
+        qtbot.waitUntil(lambda: not service.pending)
+        assert backend.calls == [("outputs", {}, True)]
+    finally:
+        backend.release.set()
+        service.shutdown()
@@ -5,7 +5,7 @@ from types import SimpleNamespace
 
 os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
 
-from PySide6.QtCore import QObject, Signal  # noqa: E402
+from PySide6.QtCore import QEvent, QObject, Signal  # noqa: E402
 from PySide6.QtWidgets import QApplication, QWidget  # noqa: E402
 
 import opencareyes.ui.main_panel as main_panel_module  # noqa: E402
@@ -86,3 +86,75 @@ def test_deferred_main_panel_is_created_on_first_show(monkeypatch):
     panel.show_page("设置")
     assert created == [controller]
     assert panel.widget.page == "设置"
+
+
+def test_hidden_views_render_state_changes_once_when_shown():
+    from dataclasses import replace
+
+    from opencareyes.application.state_subscriptions import StateSubscriptions
+    from opencareyes.state import AppState, GeneralState
+    from opencareyes.ui.widgets import bind_state
+
+    app = QApplication.instance() or QApplication([])
+
+    class SubscribingController(QObject):
+        state_changed = Signal(object)
+
+        def __init__(self):
+            super().__init__()
+            self.state = AppState()
+            self.subscriptions = StateSubscriptions()
+
+        def subscribe_state(self, slices, callback, *, is_active=None):
+            return self.subscriptions.subscribe(
+                slices, callback, is_active=is_active, state=self.state
+            )
+
+        def publish(self, **changes):
+            self.state = replace(self.state, **changes)
+            self.subscriptions.publish(self.state)
+
+    controller = SubscribingController()
+    widget = QWidget()
+    rendered = []
+    bind_state(controller, ("general",), rendered.append, widget=widget)
+
+    controller.publish(general=GeneralState(theme="dark"))
+    controller.publish(general=GeneralState(theme="light"))
+    controller.publish(notices=())
+    assert rendered == []
+
+    widget.show()
+    app.processEvents()
+    assert [state.general.theme for state in rendered] == ["light"]
+
+    widget.hide()
+    widget.show()
+    app.processEvents()
+    assert len(rendered) == 1
+    widget.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    assert len(controller.subscriptions) == 0
+
+
+def test_rendered_state_reports_only_sections_changed_since_last_render():
+    from dataclasses import replace
+
+    from opencareyes.state import AppState, BreakState
+    from opencareyes.ui.widgets import RenderedState
+
+    rendered = RenderedState()
+    first = AppState()
+    assert rendered.advance(first).touched("display")
+
+    ticked = replace(first, breaks=BreakState(remaining=41))
+    changes = rendered.advance(ticked)
+    assert set(changes) == {"breaks.remaining"}
+    assert changes.touched("breaks")
+    assert changes.touched("breaks.remaining")
+    assert not changes.touched("breaks.phase", "display", "effective_policy.breaks")
+
+    # A forced refresh re-delivers the same snapshot and repaints everything.
+    assert rendered.advance(ticked).touched("display")
+    rendered.reset()
+    assert rendered.advance(ticked).touched("general.theme")
@@ -26,3 +26,146 @@ def test_focus_overlay_creation_failure_is_reported(monkeypatch, qtbot):
     assert focus.enabled is False
     assert spy.count() == 1
     assert spy.at(0)[0] == "focus_overlay_failed"
+
+
+class _CountingOverlay:
+    def __init__(self, key):
+        self.screen_key = key
+        self.levels = []
+
+    def set_dim_level(self, level):
+        self.levels.append(level)
+
+
+def test_dimmer_screen_levels_only_touch_changed_overlays(qtbot):
+    dimmer = ScreenDimmer(watch_screen_events=False)
+    first = _CountingOverlay(r"\\.\display1")
+    second = _CountingOverlay(r"\\.\display2")
+    dimmer._pool._overlays = {"display1": first, "display2": second}
+    dimmer._enabled = True
+    dimmer._dim_level = 60
+
+    assert dimmer.set_screen_levels({r"\\.\DISPLAY2": 20}) is True
+    assert first.levels == [60]
+    assert second.levels == [20]
+
+    assert dimmer.set_screen_levels({r"\\.\display2": 20}) is True
+    assert first.levels == [60]
+    assert second.levels == [20]
+
+    assert dimmer.set_brightness(90) is True
+    assert first.levels[-1] == 90
+    assert second.levels[-1] == 20
+    dimmer._pool._overlays = {}
+
+
+def _shown_overlay(qtbot, *, window_opacity):
+    from PySide6.QtGui import QGuiApplication
+
+    from opencareyes.core.screen_dimmer import DimOverlay
+
+    overlay = DimOverlay(
+        QGuiApplication.primaryScreen(),
+        window_opacity=window_opacity,
+    )
+    qtbot.addWidget(overlay)
+    overlay.set_dim_level(40)
+    overlay.show()
+    qtbot.waitExposed(overlay)
+    qtbot.waitUntil(lambda: overlay.paint_count > 0)
+    return overlay
+
+
+def test_dim_slider_changes_window_opacity_without_repainting(qtbot):
+    overlay = _shown_overlay(qtbot, window_opacity=True)
+    painted = overlay.paint_count
+
+    for level in range(41, 201, 8):
+        overlay.set_dim_level(level)
+    qtbot.wait(50)
+
+    assert overlay.uses_window_opacity is True
+    assert overlay.paint_count == painted
+    assert abs(overlay.windowOpacity() - overlay.dim_level / 255.0) < 0.01
+
+
+def test_painted_fallback_repaints_for_each_dim_level(qtbot):
+    overlay = _shown_overlay(qtbot, window_opacity=False)
+    painted = overlay.paint_count
+
+    overlay.set_dim_level(120)
+    qtbot.waitUntil(lambda: overlay.paint_count > painted)
+
+    assert overlay.uses_window_opacity is False
+    assert overlay.windowOpacity() == 1.0
+
+
+class _FakeScreen:
+    def __init__(self, name, rect):
+        self._name = name
+        self.rect = rect
+
+    def name(self):
+        return self._name
+
+    def geometry(self):
+        return self.rect
+
+
+def test_overlay_pool_diffs_topology_instead_of_recreating(qtbot):
+    from PySide6.QtCore import QRect
+    from PySide6.QtWidgets import QWidget
+
+    from opencareyes.core.overlay_pool import OverlayPool
+
+    created = []
+
+    def factory(screen):
+        overlay = QWidget()
+        qtbot.addWidget(overlay)
+        created.append(overlay)
+        return overlay
+
+    pool = OverlayPool(factory)
+    laptop = _FakeScreen(r"\\.\DISPLAY1", QRect(0, 0, 1920, 1080))
+    external = _FakeScreen(r"\\.\DISPLAY2", QRect(1920, 0, 2560, 1440))
+
+    assert len(pool.sync([laptop, external])) == 2
+    first, second = pool.overlays
+    for _ in range(10):
+        assert pool.sync([laptop, external]) == ()
+    assert len(created) == 2
+
+    external.rect = QRect(-2560, 0, 2560, 1440)
+    assert pool.sync([laptop, external]) == ()
+    assert pool.overlays == (first, second)
+    assert second.geometry() == QRect(-2560, 0, 2560, 1440)
+
+    assert pool.sync([external]) == ()
+    assert pool.overlays == (second,)
+    assert len(created) == 2
+
+    assert pool.clear() is True
+    assert len(pool) == 0
+
+
+def test_dimmer_and_focus_refresh_keep_existing_overlays(qtbot):
+    dimmer = ScreenDimmer(watch_screen_events=False)
+    focus = FocusMode(watch_screen_events=False)
+    try:
+        assert dimmer.enable(80) is True
+        assert focus.enable() is True
+        dim_overlays = dimmer._pool.overlays
+        focus_overlays = focus._pool.overlays
+
+        for _ in range(5):
+            assert dimmer.refresh_screens() is True
+            assert focus.refresh_screens() is True
+
+        assert dimmer._pool.overlays == dim_overlays
+        assert focus._pool.overlays == focus_overlays
+        assert all(overlay.isVisible() for overlay in dim_overlays)
+        assert all(overlay.isVisible() for overlay in focus_overlays)
+    finally:
+        dimmer.disable()
+        focus.disable()
@@ -1,6 +1,6 @@
 """Tests for immediate and reschedulable display automation."""
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time, timedelta, timezone
 from types import SimpleNamespace
 import sys
 
@@ -236,3 +236,378 @@ def test_sun_schedule_respects_days_and_offsets(qapp):
         2026, 7, 14, 5, 45, tzinfo=timezone.utc
     )
     scheduler.stop()
+
+
+def _counting_sun(calls):
+    def fake_sun(_observer, *, date, tzinfo):
+        calls.append(date)
+        midnight = datetime.combine(date, datetime.min.time(), tzinfo=tzinfo)
+        return {
+            "sunrise": midnight + timedelta(hours=6),
+            "sunset": midnight + timedelta(hours=18),
+        }
+
+    return fake_sun
+
+
+def _sun_settings():
+    return SimpleNamespace(
+        schedule_mode="sun",
+        schedule_days=tuple(range(7)),
+        location_configured=True,
+        latitude=31.2,
+        longitude=121.5,
+    )
+
+
+def test_sun_reschedules_reuse_one_yearly_calendar_batch(qapp):
+    current = [datetime(2026, 7, 12, 12, 0, tzinfo=timezone.utc)]
+    calls = []
+    scheduler = Scheduler(
+        None,
+        _sun_settings(),
+        now_provider=lambda: current[0],
+        sun_calculator=_counting_sun(calls),
+    )
+
+    scheduler.start()
+    computed = len(calls)
+    for hour in range(0, 24 * 20, 7):
+        current[0] = datetime(2026, 7, 12, tzinfo=timezone.utc) + timedelta(hours=hour)
+        scheduler.reschedule()
+    current[0] = datetime(2026, 8, 1, 12, 0, tzinfo=timezone.utc)
+    scheduler.reschedule()
+
+    assert computed == 365
+    assert len(calls) == computed
+    assert scheduler.next_event == "sunset"
+    assert scheduler.next_event_at == datetime(2026, 8, 1, 18, 0, tzinfo=timezone.utc)
+    scheduler.stop()
+
+
+def test_sun_schedule_crosses_year_boundary(qapp):
+    scheduler = Scheduler(
+        None,
+        _sun_settings(),
+        now_provider=lambda: datetime(2027, 1, 1, 3, 0, tzinfo=timezone.utc),
+        sun_calculator=_counting_sun([]),
+    )
+
+    scheduler.start()
+
+    assert scheduler.current_profile == "night"
+    assert scheduler.next_event_at == datetime(2027, 1, 1, 6, 0, tzinfo=timezone.utc)
+    scheduler.stop()
+
+
+def test_solar_calendar_is_persisted_and_reused_after_restart(qapp, tmp_path):
+    from opencareyes.core.solar_calendar import SolarCalendar
+
+    path = tmp_path / "solar_calendar.json"
+    now = datetime(2026, 7, 12, 20, 0, tzinfo=timezone.utc)
+    calls = []
+    first = Scheduler(
+        None,
+        _sun_settings(),
+        now_provider=lambda: now,
+        solar_calendar=SolarCalendar(path, sun_calculator=_counting_sun(calls)),
+    )
+    first.reschedule()
+    assert path.exists()
+
+    calls.clear()
+    calendar = SolarCalendar(path, sun_calculator=_counting_sun(calls))
+    restarted = Scheduler(None, _sun_settings(), now_provider=lambda: now, solar_calendar=calendar)
+    restarted.reschedule()
+
+    assert calls == []
+    assert calendar.compute_count == 0
+    assert restarted.next_event_at == first.next_event_at
+
+    moved = _sun_settings()
+    moved.latitude = 48.85
+    Scheduler(None, moved, now_provider=lambda: now, solar_calendar=calendar).reschedule()
+    assert calendar.compute_count == 1
+
+
+def test_unresolvable_polar_days_only_fail_when_needed(qapp):
+    from opencareyes.core.solar_calendar import SolarCalendar
+
+    regular = _counting_sun([])
+
+    def polar_sun(observer, *, date, tzinfo):
+        if date.month == 12:
+            raise ValueError("Sun never reaches the horizon")
+        return regular(observer, date=date, tzinfo=tzinfo)
+
+    calendar = SolarCalendar(sun_calculator=polar_sun)
+    failures = []
+    current = [datetime(2026, 7, 12, 20, 0, tzinfo=timezone.utc)]
+    scheduler = Scheduler(
+        None,
+        _sun_settings(),
+        now_provider=lambda: current[0],
+        solar_calendar=calendar,
+    )
+    scheduler.error.connect(lambda code, _message: failures.append(code))
+
+    scheduler.reschedule()
+    assert scheduler.next_event == "sunrise"
+
+    current[0] = datetime(2026, 12, 15, 12, 0, tzinfo=timezone.utc)
+    scheduler.reschedule()
+    assert failures == ["schedule_calculation"]
+
+
+def _evening_rules():
+    from opencareyes.core.scheduler import ScheduleRule, ScheduleTime
+
+    return (
+        ScheduleRule(ScheduleTime.sunset(), ScheduleTime.clock(time(6, 0)), "warm"),
+        ScheduleRule(ScheduleTime.clock(time(23, 0)), ScheduleTime.clock(time(6, 0)), "warmer"),
+        ScheduleRule(ScheduleTime.clock(time(0, 30)), ScheduleTime.clock(time(6, 0)), "dim"),
+    )
+
+
+def _fixed_sun_events(day):
+    midnight = datetime.combine(day, time(), tzinfo=timezone.utc)
+    return midnight + timedelta(hours=6), midnight + timedelta(hours=18)
+
+
+def test_schedule_engine_merges_multi_stage_evening():
+    from opencareyes.core.scheduler import compile_schedule
+
+    index = compile_schedule(
+        _evening_rules(),
+        date(2026, 7, 13),
+        2,
+        zone=timezone.utc,
+        sun_events=_fixed_sun_events,
+    )
+    at = lambda hour, minute=0: datetime(2026, 7, 13, tzinfo=timezone.utc) + timedelta(  # noqa: E731
+        hours=hour, minutes=minute
+    )
+
+    assert index.profile_at(at(0, 10)) == "warmer"
+    assert index.profile_at(at(12)) is None
+    assert index.profile_at(at(18)) == "warm"
+    assert index.profile_at(at(23, 30)) == "warmer"
+    assert index.profile_at(at(24, 45)) == "dim"
+    assert [
+        (boundary.at.hour, boundary.at.minute, boundary.event, boundary.profile)
+        for boundary in (
+            index.next_boundary(at(12)),
+            index.next_boundary(at(18)),
+            index.next_boundary(at(23)),
+            index.next_boundary(at(24, 30)),
+        )
+    ] == [
+        (18, 0, "sunset", "warm"),
+        (23, 0, "on", "warmer"),
+        (0, 30, "on", "dim"),
+        (6, 0, "off", None),
+    ]
+    assert index.next_boundary(at(47)) is None
+
+
+def test_schedule_engine_merges_adjacent_days_and_skips_weekdays():
+    from opencareyes.core.scheduler import ScheduleRule, ScheduleTime, compile_schedule
+
+    index = compile_schedule(
+        (
+            ScheduleRule(
+                ScheduleTime.clock(time(19, 0)),
+                ScheduleTime.clock(time(19, 0)),
+                "night",
+                frozenset({0, 1}),
+            ),
+        ),
+        date(2026, 7, 13),  # Monday
+        7,
+        zone=timezone.utc,
+    )
+
+    assert len(index) == 2
+    assert index.next_boundary(datetime(2026, 7, 14, 8, tzinfo=timezone.utc)) == (
+        index.next_boundary(datetime(2026, 7, 13, 20, tzinfo=timezone.utc))
+    )
+    assert index.next_boundary(datetime(2026, 7, 13, 20, tzinfo=timezone.utc)).at == (
+        datetime(2026, 7, 15, 19, tzinfo=timezone.utc)
+    )
+
+
+def test_schedule_engine_year_of_rules_bisects_instead_of_scanning():
+    """A year of three-stage evenings answers by binary search."""
+
+    from opencareyes.core.scheduler import compile_schedule
+
+    index = compile_schedule(
+        _evening_rules(),
+        date(2026, 1, 1),
+        365,
+        zone=timezone.utc,
+        sun_events=_fixed_sun_events,
+    )
+    moments = [
+        datetime(2026, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=(step * 7919) % 524_160)
+        for step in range(2000)
+    ]
+    boundaries = [index.next_boundary(datetime(2025, 12, 31, tzinfo=timezone.utc))]
+    while (following := index.next_boundary(boundaries[-1].at)) is not None:
+        boundaries.append(following)
+    scanned = [next((b for b in boundaries if b.at > moment), None) for moment in moments]
+
+    probes = []
+    index.probe = probes.append
+    indexed = [index.next_boundary(moment) for moment in moments]
+
+    assert len(boundaries) >= 4 * 365
+    assert indexed == scanned
+    assert 0 < len(probes) <= len(moments) * len(boundaries).bit_length()
+
+
+def test_scheduler_reuses_compiled_index_between_timer_fires(qapp, monkeypatch):
+    from opencareyes.core import scheduler as scheduler_module
+
+    compiled = []
+    original = scheduler_module.compile_schedule
+
+    def counting(*args, **kwargs):
+        compiled.append(args[1])
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(scheduler_module, "compile_schedule", counting)
+    current = [datetime(2026, 7, 13, 20, 0, tzinfo=timezone.utc)]
+    settings = fixed_settings()
+    scheduler = Scheduler(None, settings, now_provider=lambda: current[0])
+    scheduler.start()
+    for _ in range(6):
+        current[0] = scheduler.next_event_at
+        scheduler._on_timer()
+
+    assert compiled == [date(2026, 7, 13)]
+    settings.schedule_on_time = "21:00"
+    scheduler.reschedule()
+    assert len(compiled) == 2
+    scheduler.stop()
+
+
+def test_configured_stages_compile_into_one_index_with_the_night_rule(qapp, monkeypatch):
+    from opencareyes.core import scheduler as scheduler_module
+
+    compiled = []
+    original = scheduler_module.compile_schedule
+
+    def counting(rules, *args, **kwargs):
+        compiled.append(rules)
+        return original(rules, *args, **kwargs)
+
+    monkeypatch.setattr(scheduler_module, "compile_schedule", counting)
+    current = [datetime(2026, 7, 13, 20, 0, tzinfo=timezone.utc)]
+    settings = fixed_settings()
+    settings.schedule_stages = (
+        {"start": "23:00", "end": "06:00", "profile": "movie"},
+        {"start": "00:30", "end": "06:00", "profile": "reading"},
+    )
+    scheduler = Scheduler(None, settings, now_provider=lambda: current[0])
+    profiles = []
+    scheduler.set_profile_callback(profiles.append)
+
+    scheduler.start()
+    seen = [(scheduler.next_event_at.hour, scheduler.next_event_at.minute, scheduler.next_profile)]
+    for _ in range(3):
+        current[0] = scheduler.next_event_at
+        scheduler._on_timer()
+        seen.append(
+            (scheduler.next_event_at.hour, scheduler.next_event_at.minute, scheduler.next_profile)
+        )
+
+    assert profiles == ["night", "movie", "reading", "night"]
+    assert seen == [(23, 0, "movie"), (0, 30, "reading"), (6, 0, "night"), (7, 0, "office")]
+    assert len(compiled) == 1 and len(compiled[0]) == 3
+    scheduler.stop()
+
+
+def test_sun_relative_stage_in_fixed_mode_uses_the_configured_location(qapp):
+    now = datetime(2026, 7, 13, 12, 0, tzinfo=timezone.utc)
+    settings = fixed_settings()
+    settings.schedule_on_time = "22:00"
+    settings.schedule_stages = ({"start": "sunset", "end": "22:00", "profile": "reading"},)
+    settings.location_configured = True
+    settings.latitude = 0.0
+    settings.longitude = 0.0
+    scheduler = Scheduler(None, settings, now_provider=lambda: now)
+
+    scheduler.reschedule()
+
+    assert scheduler.next_profile == "reading"
+    assert scheduler.next_event == "sunset"
+    assert 17 <= scheduler.next_event_at.hour <= 19
+
+    settings.location_configured = False
+    errors = []
+    scheduler.error.connect(lambda code, _message: errors.append(code))
+    scheduler.reschedule()
+    assert errors == ["schedule_calculation"]
+
+
+def test_ramp_wakes_only_when_quantized_values_change(qapp):
+    from opencareyes.core.scheduler import ramp_values
+
+    current = [datetime(2026, 7, 13, 19, 0, tzinfo=timezone.utc)]
+    settings = fixed_settings()
+    settings.schedule_on_time = "21:00"
+    settings.schedule_ramp_minutes = 90
+    profiles = []
+    steps = []
+    scheduler = Scheduler(None, settings, now_provider=lambda: current[0])
+    scheduler.set_profile_callback(profiles.append)
+    scheduler.set_ramp_callback(steps.append)
+    scheduler.start()
+
+    assert profiles == ["office"]
+    assert scheduler._timer.interval() == 30 * 60 * 1000
+    wakes = 0
+    while scheduler.snapshot_runtime().timer_purpose == "ramp" or not wakes:
+        current[0] += timedelta(milliseconds=scheduler._timer.interval())
+        scheduler._on_timer()
+        wakes += 1
+    assert profiles == ["office"]
+    current[0] += timedelta(milliseconds=scheduler._timer.interval())
+    scheduler._on_timer()
+
+    assert current[0] == datetime(2026, 7, 13, 21, 0, tzinfo=timezone.utc)
+    assert profiles == ["office", "night"]
+    assert len(steps) == wakes - 1
+    assert len(set(steps)) == len(steps)
+    temperatures = [step.color_temperature for step in steps]
+    dims = [step.dim_level for step in steps]
+    assert temperatures == sorted(temperatures, reverse=True)
+    assert dims == sorted(dims)
+    assert all(step.profile == "night" for step in steps)
+    assert ramp_values((5500, 0), (3400, 50), 1.0) == (3400, 50)
+    assert len(steps) <= (5500 - 3400) // 50 + 50 // 2
+    scheduler.stop()
+
+
+def test_ramp_is_suspended_by_manual_override(qapp):
+    current = [datetime(2026, 7, 13, 20, 0, tzinfo=timezone.utc)]
+    settings = fixed_settings()
+    settings.schedule_on_time = "21:00"
+    settings.schedule_ramp_minutes = 90
+    steps = []
+    scheduler = Scheduler(None, settings, now_provider=lambda: current[0])
+    scheduler.set_profile_callback(lambda _profile: None)
+    scheduler.set_ramp_callback(steps.append)
+    scheduler.start()
+    assert len(steps) == 1
+
+    scheduler.set_manual_override(True)
+    scheduler.reschedule()
+    scheduler.set_manual_override(True)
+    current[0] += timedelta(minutes=20)
+    scheduler._on_timer()
+
+    assert len(steps) == 1
+    assert scheduler.snapshot_runtime().timer_purpose == "boundary"
+    scheduler.stop()
@@ -64,6 +64,18 @@ class MemoryStore:
         return self.status_value
 
 
+class CountingStore(MemoryStore):
+    """Memory store that records every key read through ``value``."""
+
+    def __init__(self, values=None, **kwargs):
+        super().__init__(values, **kwargs)
+        self.reads = []
+
+    def value(self, key, default=None, type=None):
+        self.reads.append(key)
+        return super().value(key, default, type)
+
+
 @pytest.fixture
 def mock_qsettings():
     """Patch QSettings so tests don't touch the real registry."""
@@ -437,6 +449,26 @@ def test_v4_to_v5_migration_preserves_previous_pet_visibility(
     assert settings.companion_sound_enabled is False
 
 
+def test_monitor_targets_drop_malformed_entries_and_clamp_values():
+    from opencareyes.config.settings import Settings
+
+    store = MemoryStore({
+        'display/monitor_targets_json': (
+            '{"DISPLAY1":[900,250],"display2":[null,null],'
+            '"display3":"warm","":[4000,10],"display4":[5000]}'
+        ),
+    })
+    settings = Settings(store)
+
+    assert settings.monitor_targets == {'display1': (1000, 200)}
+    with pytest.raises(ValueError):
+        settings.monitor_targets = {'display1': (4000,)}
+    with pytest.raises(ValueError):
+        settings.monitor_targets = {
+            f'display{index}': (4000, None) for index in range(17)
+        }
+
+
 def test_v5_companion_accessors_validate_and_round_trip():
     from opencareyes.config.settings import Settings
 
@@ -707,6 +739,33 @@ def test_v4_accessors_reject_invalid_values():
         settings.sunset_offset = 121
     with pytest.raises(ValueError, match="positive"):
         settings.cadence_long_duration = 0
+    with pytest.raises(ValueError, match="schedule stage time"):
+        settings.schedule_stages = [{"start": "24:00", "end": "06:00", "profile": "night"}]
+    with pytest.raises(ValueError, match="between -120 and 120"):
+        settings.schedule_stages = [{"start": "sunset+150", "end": "06:00", "profile": "night"}]
+
+
+def test_schedule_stages_round_trip_and_skip_invalid_stored_entries():
+    from opencareyes.config.settings import Settings
+
+    store = MemoryStore()
+    settings = Settings(store)
+    assert settings.schedule_stages == ()
+
+    settings.schedule_stages = [
+        {"start": "Sunset+30", "end": "06:00", "profile": "Reading"},
+        {"start": "23:00", "end": "sunrise", "profile": "night"},
+    ]
+
+    assert [dict(stage) for stage in settings.schedule_stages] == [
+        {"start": "sunset+30", "end": "06:00", "profile": "reading"},
+        {"start": "23:00", "end": "sunrise", "profile": "night"},
+    ]
+    store.values["automation/stages_json"] = (
+        '[{"start":"23:00","end":"06:00","profile":"movie"},'
+        '{"start":"noon","end":"06:00","profile":"night"},"junk"]'
+    )
+    assert [stage["profile"] for stage in Settings(store).schedule_stages] == ["movie"]
 
 
 def test_repository_transaction_rolls_back_after_checked_sync_failure():
@@ -728,18 +787,79 @@ def test_transaction_persists_snapshot_marker_before_user_writes():
 
     store = MemoryStore({"meta/schema_version": 6, "general/theme": "dark"})
     repository = PreferencesRepository(store)
+    store.events.clear()
+    store.sync_calls = 0
 
     with repository.transaction():
         repository.theme = "light"
 
+    journal_write = store.events.index(
+        ("set", "meta/pending_settings_journal", '{"general/theme":[true,"dark"]}')
+    )
     first_sync = store.events.index(("sync", 1))
     theme_write = store.events.index(("set", "general/theme", "light"))
-    assert first_sync < theme_write
+    assert journal_write < first_sync < theme_write
+    assert store.sync_calls == 2
     assert "meta/pending_settings" not in store.values
-    assert "meta/pending_settings_snapshot" not in store.values
+    assert "meta/pending_settings_journal" not in store.values
     assert "meta/pending_settings_operation" not in store.values
 
 
+def test_transaction_rollback_restores_only_touched_keys():
+    from opencareyes.config.settings import PreferencesRepository
+
+    store = MemoryStore(
+        {"meta/schema_version": 6, "general/theme": "dark", "ui/extra": "kept"}
+    )
+    repository = PreferencesRepository(store)
+    store.writes.clear()
+
+    with pytest.raises(RuntimeError):
+        with repository.transaction():
+            repository.theme = "light"
+            repository.hotkey_focus = "Ctrl+Alt+F"
+            raise RuntimeError("command failed")
+
+    restored = {key for key, _value in store.writes} - {
+        "meta/pending_settings",
+        "meta/pending_settings_journal",
+        "meta/pending_settings_operation",
+    }
+    assert restored == {"general/theme", "hotkeys/focus"}
+    assert store.values == {
+        "meta/schema_version": 6,
+        "general/theme": "dark",
+        "ui/extra": "kept",
+    }
+
+
+def test_startup_rolls_back_an_interrupted_write_set():
+    from opencareyes.config.settings import Settings
+
+    store = MemoryStore(
+        {
+            "meta/schema_version": 6,
+            "general/theme": "light",
+            "hotkeys/focus": "Ctrl+Alt+F",
+            "ui/extra": "kept",
+            "meta/pending_settings": True,
+            "meta/pending_settings_operation": "transaction",
+            "meta/pending_settings_journal": (
+                '{"general/theme":[true,"dark"],"hotkeys/focus":[false,null]}'
+            ),
+        }
+    )
+
+    settings = Settings(store)
+
+    assert settings.read_only is False
+    assert store.values == {
+        "meta/schema_version": 6,
+        "general/theme": "dark",
+        "ui/extra": "kept",
+    }
+
+
 def test_startup_recovers_pending_transaction_snapshot():
     from opencareyes.config.settings import Settings
 
@@ -838,3 +958,137 @@ def test_sync_checks_backend_status():
     )
     with pytest.raises(OSError, match="sync failed"):
         repository.sync()
+
+
+def test_decoded_values_are_cached_until_a_write_or_restore():
+    from opencareyes.config.settings import Settings
+
+    store = CountingStore({"meta/schema_version": 6})
+    settings = Settings(store)
+    settings.pet_preferences = {"snow_ferret": {"neckwear": "red_scarf"}}
+    snapshot = settings.snapshot()
+    store.reads.clear()
+
+    for _ in range(3):
+        preferences = settings.pet_preferences
+        assert settings.filter_enabled is DEFAULT_PREFERENCES.filter_enabled
+    assert store.reads.count("companion/pet_preferences_json") == 1
+    assert store.reads.count("filter/enabled") == 1
+
+    assert settings.pet_preferences is preferences
+    with pytest.raises(TypeError):
+        preferences["snow_ferret"]["neckwear"] = "changed"
+    assert settings.pet_preferences["snow_ferret"]["neckwear"] == "red_scarf"
+
+    settings.filter_enabled = True
+    assert settings.filter_enabled is True
+    settings.pet_preferences = {}
+    assert settings.pet_preferences == {}
+
+    settings.restore_snapshot(snapshot)
+    assert settings.filter_enabled is DEFAULT_PREFERENCES.filter_enabled
+    assert settings.pet_preferences["snow_ferret"]["neckwear"] == "red_scarf"
+
+
+def test_writes_only_drop_decoded_values_that_read_the_written_key():
+    from opencareyes.config.settings import Settings
+
+    store = CountingStore({"meta/schema_version": 6})
+    settings = Settings(store)
+    rules = settings.app_rules
+    assert settings.cadence_mode == settings.break_mode
+    store.reads.clear()
+
+    settings.pet_x = 40
+    assert settings.app_rules is rules
+    assert settings.pet_x == 40
+    settings.break_mode = "micro"
+    assert settings.cadence_mode == "micro"
+    assert store.reads == ["ui/pet_x", "break/mode", "break/cadence_mode"]
+
+
+def test_write_ahead_log_coalesces_commits_into_one_backend_sync(tmp_path):
+    from opencareyes.config.settings import PreferencesRepository
+
+    wal = tmp_path / "settings.wal"
+    store = MemoryStore({"meta/schema_version": 6})
+    repository = PreferencesRepository(store, write_ahead_log=wal)
+
+    for position in range(20):
+        with repository.transaction():
+            repository.pet_x = position
+            repository.pet_y = position * 2
+
+    assert store.sync_calls == 0
+    assert store.writes == []
+    assert repository.pet_x == 19
+    assert repository.flush_pending is True
+    assert len(wal.read_text(encoding="utf-8").splitlines()) == 20
+
+    assert repository.flush() is True
+    assert store.sync_calls == 1
+    assert not wal.exists()
+    assert repository.flush() is False
+
+
+def test_write_ahead_log_keeps_commits_out_of_a_real_ini_file_until_flush(qtbot, tmp_path):
+    from PySide6.QtCore import QSettings
+
+    from opencareyes.config.settings import PreferencesRepository
+
+    path = str(tmp_path / "settings.ini")
+    backend = QSettings(path, QSettings.IniFormat)
+    repository = PreferencesRepository(
+        backend,
+        write_ahead_log=tmp_path / "settings.wal",
+        flush_delay_ms=60_000,
+    )
+
+    def on_disk(key):
+        return QSettings(path, QSettings.IniFormat).value(key)
+
+    for position in range(20):
+        with repository.transaction():
+            repository.pet_x = position
+    repository.theme = "light"
+    backend.setValue("test/direct", 1)
+    # QSettings writes its own pending changes back from the event loop.
+    qtbot.waitUntil(lambda: on_disk("test/direct") is not None)
+
+    assert on_disk("ui/pet_x") is None
+    assert on_disk("general/theme") is None
+    assert (repository.pet_x, repository.theme) == (19, "light")
+
+    with pytest.raises(RuntimeError):
+        with repository.transaction():
+            repository.pet_x = 99
+            raise RuntimeError("command failed")
+    assert repository.pet_x == 19
+
+    assert repository.flush() is True
+    assert int(on_disk("ui/pet_x")) == 19
+    assert on_disk("general/theme") == "light"
+    assert on_disk("meta/pending_settings_journal") is None
+
+
+def test_startup_replays_logged_commits_the_backend_never_synced(tmp_path):
+    from opencareyes.config.settings import PreferencesRepository
+
+    wal = tmp_path / "settings.wal"
+    on_disk = {"meta/schema_version": 6, "general/theme": "dark"}
+    repository = PreferencesRepository(MemoryStore(on_disk), write_ahead_log=wal)
+    with repository.transaction():
+        repository.theme = "light"
+        repository.pet_x = 40
+    with repository.transaction():
+        repository.pet_x = 80
+    with wal.open("a", encoding="utf-8") as handle:
+        handle.write('{"v":1,"set":{"general/theme":"da')
+
+    store = MemoryStore(on_disk)
+    restarted = PreferencesRepository(store, write_ahead_log=wal)
+
+    assert restarted.theme == "light"
+    assert restarted.pet_x == 80
+    assert store.sync_calls == 1
+    assert not wal.exists()
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
 from pathlib import Path
 
 from PySide6.QtCore import QAbstractAnimation, QObject, QPoint, QTimer, Signal
@@ -16,6 +17,9 @@ from opencareyes.config.settings import Settings
 from opencareyes.controller import AppController
 from opencareyes.core.break_reminder import BreakReminder
 from opencareyes.ui.pet_surface import PetSurface
+from opencareyes.ui import widgets as widgets_module
+from opencareyes.ui.widgets import first_state_value, state_accessor, state_value
+from scripts.benchmark_state_render import run as run_state_render_benchmark
 
 
 FIXTURE_ROOT = Path(__file__).parent / 'fixtures' / 'pets'
@@ -231,3 +235,116 @@ def test_hidden_or_reduced_companion_has_no_active_activity_clock(qtbot):
     assert not surface.animator.is_running
     runtime.shutdown()
     surface.close()
+
+
+_MISSING = object()
+
+
+def _walk_dotted_path(state, path, default=None):
+    # The per-call string walk that compiled accessors replaced.
+    value = state
+    for name in path.split('.'):
+        if value is None:
+            return default
+        if isinstance(value, Mapping):
+            value = value.get(name, default)
+        else:
+            value = getattr(value, name, default)
+    return default if value is None else value
+
+
+def test_compiled_state_paths_match_the_string_walk_and_skip_it_for_dataclasses(
+    qtbot,
+    monkeypatch,
+):
+    monkeypatch.setattr(widgets_module, '_ACCESSORS', {})
+    reminder = BreakReminder()
+    controller = AppController(Settings(MemoryStore()), break_reminder=reminder)
+    state = controller.state
+    paths = (
+        'general.motion_mode',
+        'breaks.enabled',
+        'breaks.phase',
+        'breaks.paused',
+        'breaks.remaining',
+        'breaks.force_break',
+        'breaks.countdown_display',
+        'break_cadence.short_remaining',
+        'breaks.cadence.short_remaining',
+        'break_prompt.stage',
+        'effective_policy.breaks.suppressed_by',
+        'effective_policy.breaks.resume_condition',
+        'global_pause.active',
+        'global_pause.until',
+        'display_health.status',
+        'automation.smart_pause.app_rules',
+    )
+    mapping_state = {'breaks': {'phase': 'resting', 'items': 3}, 'general': None}
+
+    for path in paths:
+        assert state_value(state, path, 'missing') == _walk_dotted_path(
+            state, path, 'missing'
+        )
+    for path in ('breaks.phase', 'breaks.items', 'general.theme', 'display.x'):
+        assert state_value(mapping_state, path, 'missing') == _walk_dotted_path(
+            mapping_state, path, 'missing'
+        )
+    assert first_state_value(
+        state, 'breaks.cadence.short_remaining', 'breaks.remaining', default=-1
+    ) == state.breaks.remaining
+
+    walked = []
+    walk_state = widgets_module._walk_state
+
+    def counting_walk(value, names):
+        walked.append('.'.join(names))
+        return walk_state(value, names)
+
+    monkeypatch.setattr(widgets_module, '_walk_state', counting_walk)
+    # The mapping reads above switched paths such as ``breaks.phase`` to the walk.
+    monkeypatch.setattr(widgets_module, '_ACCESSORS', {})
+    direct = [
+        path for path in paths
+        if _walk_dotted_path(state, path, _MISSING) is not _MISSING
+        and _walk_dotted_path(state, path.rsplit('.', 1)[0]) is not None
+    ]
+    assert len(direct) >= 10
+    for path in direct:
+        assert state_accessor(path) is state_accessor(path)
+        state_value(state, path)
+    assert walked == []
+    state_value(mapping_state, 'breaks.phase')
+    assert walked == ['breaks.phase']
+    reminder.stop()
+
+
+def test_a_path_that_misses_once_keeps_the_walk_reader(qtbot, monkeypatch):
+    monkeypatch.setattr(widgets_module, '_ACCESSORS', {})
+    reminder = BreakReminder()
+    controller = AppController(Settings(MemoryStore()), break_reminder=reminder)
+    state = controller.state
+    walked = []
+    walk_state = widgets_module._walk_state
+
+    def counting_walk(value, names):
+        walked.append('.'.join(names))
+        return walk_state(value, names)
+
+    monkeypatch.setattr(widgets_module, '_walk_state', counting_walk)
+    compiled = state_accessor('breaks.phase')
+    state_value(state, 'breaks.phase')
+    assert walked == []
+
+    assert state_value({'breaks': {'phase': 'resting'}}, 'breaks.phase') == 'resting'
+    assert state_accessor('breaks.phase') is not compiled
+    assert state_value(state, 'breaks.phase') == state.breaks.phase
+    assert state_value(state, 'breaks.phase') == state.breaks.phase
+    assert walked == ['breaks.phase'] * 3
+    reminder.stop()
+
+
+def test_state_render_benchmark_times_both_readers(qtbot):
+    compiled, walked = run_state_render_benchmark(rounds=1, repeat=1)
+
+    assert compiled > 0
+    assert walked > 0
@@ -798,6 +798,55 @@ def test_ignored_own_window_cannot_drive_avoidance_or_monitor_migration(monkeypa
     assert not snapshot.geometry_available
 
 
+def test_win32_geometry_reuses_cached_topology_between_samples():
+    from opencareyes.core.monitor_manager import MonitorInfo, MonitorManager
+
+    calls = []
+    topology = [
+        (
+            MonitorInfo(
+                handle=0x10,
+                name=r"\\.\DISPLAY1",
+                geometry=(0, 0, 1920, 1080),
+                work_area=(0, 0, 1920, 1040),
+                is_primary=True,
+            ),
+        )
+    ]
+
+    def enumerate_monitors():
+        calls.append(1)
+        return topology[0]
+
+    manager = MonitorManager(enumerator=enumerate_monitors)
+    backend = Win32WindowGeometryBackend(monitor_manager=manager)
+
+    first = backend._monitors()
+    for _ in range(20):
+        assert backend._monitors() is first
+    assert first == (
+        MonitorGeometry(
+            "monitor-10",
+            ScreenRect(0, 0, 1920, 1040),
+            r"\\.\DISPLAY1",
+        ),
+    )
+    assert len(calls) == 1
+
+    topology[0] = (
+        MonitorInfo(
+            handle=0x10,
+            name=r"\\.\DISPLAY1",
+            geometry=(0, 0, 1920, 1080),
+            work_area=(0, 0, 1920, 1000),
+            is_primary=True,
+        ),
+    )
+    manager.invalidate()
+    assert backend._monitors()[0].work_area == ScreenRect(0, 0, 1920, 1000)
+    assert len(calls) == 2
+
+
 def test_own_window_foreground_preserves_existing_temporary_displacement():
     clock = FakeClock()
     monitor = _monitor("main", 0, 0, 1000, 800)